@@ -0,0 +1,514 @@
+"""
+Entry point ASGI: uvicorn -w 1 -b 0.0.0.0:$PORT src.asgi:app
+(o: uvicorn src.asgi:app --host 0.0.0.0 --port $PORT)
+
+Las rutas calientes (envío / verificación de OTP, login, resend y user-info)
+se sirven con handlers async (motor + httpx), así un solo worker sostiene
+cientos de envíos de OTP en vuelo. El resto de rutas (registro, TOTP, SMS
+login, password recovery, health...) siguen en la app Flask, montada detrás
+vía WSGI. Mismas URLs, mismos JSON y la misma cookie de sesión de Flask.
+"""
+import contextlib
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route, Mount
+from a2wsgi import WSGIMiddleware
+
+# La app Flask completa (create_app: blueprints y CORS; dependencias perezosas)
+import main as flask_main
+from shared.database.async_mongo_connection import AsyncMongoDB
+from shared.models.async_user_repository import AsyncUserRepository
+from shared.security.password_hasher import PasswordHasherBusyError
+from sms_otp.application.async_sms_otp_usecases import AsyncSMSOTPUseCases
+from sms_otp.infrastructure.async_twilio_sms_adapter import AsyncTwilioSMSAdapter
+from email_otp.application.async_email_otp_usecases import AsyncEmailOTPUseCases
+from email_otp.infrastructure.async_brevo_email_adapter import AsyncBrevoEmailAdapter
+from email_otp.infrastructure.email_template_renderer import negotiate_locale
+from email_otp.infrastructure.outbox_email_adapter import AsyncOutboxEmailAdapter
+from sms_otp.infrastructure.outbox_sms_adapter import AsyncOutboxSMSAdapter
+from shared.outbox.notification_outbox import outbox_enabled
+from shared.resilience.circuit_breaker import ProviderUnavailableError, circuit_breaker_enabled
+from sms_otp.infrastructure.circuit_breaker_sms_adapter import AsyncCircuitBreakerSMSAdapter
+from email_otp.infrastructure.circuit_breaker_email_adapter import AsyncCircuitBreakerEmailAdapter
+
+flask_app = flask_main.app
+pending_verifications = flask_main.pending_verifications
+
+user_repo = AsyncUserRepository()
+
+
+def _with_breaker(service, wrapper):
+    return wrapper(service) if circuit_breaker_enabled() else service
+
+
+sms_service = AsyncOutboxSMSAdapter() if outbox_enabled() else _with_breaker(
+    AsyncTwilioSMSAdapter(), AsyncCircuitBreakerSMSAdapter
+)
+sms_otp_usecases = AsyncSMSOTPUseCases(sms_service)
+email_service = None
+if flask_main.EMAIL_OTP_AVAILABLE:
+    email_service = AsyncOutboxEmailAdapter() if outbox_enabled() else _with_breaker(
+        AsyncBrevoEmailAdapter(), AsyncCircuitBreakerEmailAdapter
+    )
+email_otp_usecases = AsyncEmailOTPUseCases(email_service) if email_service else None
+
+
+# ---------- sesión y CORS compatibles con Flask ----------
+
+class FlaskSession(dict):
+    """
+    Lee y firma la misma cookie que SecureCookieSessionInterface de Flask
+    (SECRET_KEY compartida), para que las rutas async y las de Flask vean
+    la misma sesión.
+    """
+
+    def __init__(self, request: Request):
+        self.interface = flask_app.session_interface
+        self.serializer = self.interface.get_signing_serializer(flask_app)
+        self.cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+        self.modified = False
+        data = {}
+        value = request.cookies.get(self.cookie_name)
+        if value:
+            try:
+                max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+                data = self.serializer.loads(value, max_age=max_age)
+            except Exception:
+                data = {}
+        super().__init__(data)
+
+    def __setitem__(self, key, value):
+        self.modified = True
+        super().__setitem__(key, value)
+
+    def save(self, response):
+        if not self.modified:
+            return
+        config = flask_app.config
+        response.set_cookie(
+            self.cookie_name,
+            self.serializer.dumps(dict(self)),
+            path=config['SESSION_COOKIE_PATH'] or config['APPLICATION_ROOT'] or '/',
+            domain=config['SESSION_COOKIE_DOMAIN'],
+            secure=config['SESSION_COOKIE_SECURE'],
+            httponly=config['SESSION_COOKIE_HTTPONLY'],
+            samesite=config['SESSION_COOKIE_SAMESITE'] or 'lax'
+        )
+
+
+ALLOWED_ORIGINS = [
+    'http://localhost:3000',
+    'http://127.0.0.1:3000',
+    'http://localhost:5173',
+    'https://metodos-two.vercel.app'
+]
+
+
+def respond(request: Request, payload, status_code=200, session=None, headers=None):
+    """JSONResponse con los mismos headers CORS que after_request de main.py"""
+    response = JSONResponse(payload, status_code=status_code, headers=headers)
+    origin = request.headers.get('origin')
+    if origin and (origin in ALLOWED_ORIGINS or origin.endswith('.vercel.app')):
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
+        response.headers['Access-Control-Max-Age'] = '3600'
+    if session is not None:
+        session.save(response)
+    return response
+
+
+async def read_json(request: Request):
+    try:
+        return await request.json()
+    except Exception:
+        return {}
+
+
+# ---------- SMS OTP ----------
+
+async def sms_send_otp(request: Request):
+    try:
+        data = await read_json(request)
+        phone = data.get('phone')
+
+        if not phone:
+            return respond(request, {'error': 'Phone number is required'}, 400)
+
+        if await sms_otp_usecases.send_otp(phone):
+            return respond(request, {
+                'success': True,
+                'message': 'OTP sent successfully'
+            })
+        return respond(request, {'error': 'Failed to send OTP'}, 500)
+
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def sms_verify_otp(request: Request):
+    try:
+        data = await read_json(request)
+        phone = data.get('phone')
+        code = data.get('code')
+
+        if not phone or not code:
+            return respond(request, {'error': 'Phone and code are required'}, 400)
+
+        if await sms_otp_usecases.verify_otp(phone, code):
+            return respond(request, {
+                'valid': True,
+                'message': 'OTP verified successfully'
+            })
+        return respond(request, {
+            'valid': False,
+            'error': 'Invalid or expired OTP'
+        }, 400)
+
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def sms_user_info(request: Request):
+    try:
+        email = request.query_params.get('email')
+
+        if not email:
+            return respond(request, {'error': 'Email parameter is required'}, 400)
+
+        user = await user_repo.find_profile(email)
+
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        if user.get('auth_method') != 'sms':
+            return respond(request, {'error': 'User is not registered with SMS method'}, 400)
+
+        return respond(request, {
+            'email': user['email'],
+            'first_name': user.get('first_name', ''),
+            'phone_number': user.get('phone_number'),
+            'auth_method': user.get('auth_method', 'sms')
+        })
+
+    except Exception as e:
+        print(f"❌ Error in sms_user_info: {e}")
+        return respond(request, {'error': str(e)}, 500)
+
+
+# ---------- Email OTP ----------
+
+async def email_send_otp(request: Request):
+    try:
+        data = await read_json(request)
+        email = data.get('email')
+
+        if not email:
+            return respond(request, {'error': 'Email is required'}, 400)
+
+        user = await user_repo.find_auth_routing(email)
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        if user.get('auth_method') != 'email':
+            return respond(request, {'error': 'User is not registered with email method'}, 400)
+
+        result = await email_otp_usecases.send_otp(
+            email, purpose='login', locale=negotiate_locale(request.headers.get('accept-language'))
+        )
+
+        if result['success']:
+            return respond(request, {
+                'success': True,
+                'message': 'OTP sent successfully',
+                'email': email
+            })
+        return respond(request, {
+            'success': False,
+            'error': result['message']
+        }, 500)
+
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def email_verify_otp(request: Request):
+    try:
+        data = await read_json(request)
+        email = data.get('email')
+        otp = data.get('otp')
+
+        if not email or not otp:
+            return respond(request, {'error': 'Email and OTP are required'}, 400)
+
+        user = await user_repo.find_auth_routing(email)
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        if user.get('auth_method') != 'email':
+            return respond(request, {'error': 'User is not registered with email method'}, 400)
+
+        result = await email_otp_usecases.verify_otp(email, otp)
+
+        if result['success']:
+            # ✅ ESTABLECER LA SESIÓN SOLO DESPUÉS DE VERIFICAR OTP CORRECTAMENTE
+            session = FlaskSession(request)
+            session['email'] = email
+            print(f"✅ Sesión establecida para: {email} después de verificación OTP")
+
+            await user_repo.mark_verified(email)
+
+            return respond(request, {
+                'success': True,
+                'message': 'OTP verified successfully',
+                'email': email
+            }, session=session)
+        return respond(request, {
+            'success': False,
+            'error': result['message']
+        }, 400)
+
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def email_user_info(request: Request):
+    try:
+        email = request.query_params.get('email')
+
+        if not email:
+            return respond(request, {'error': 'Email parameter is required'}, 400)
+
+        user = await user_repo.find_profile(email)
+
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        if user.get('auth_method') != 'email':
+            return respond(request, {'error': 'User is not registered with email method'}, 400)
+
+        return respond(request, {
+            'email': user['email'],
+            'first_name': user.get('first_name', ''),
+            'auth_method': user.get('auth_method', 'email'),
+            'verified': user.get('verified', False)
+        })
+
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+# ---------- Auth unificado ----------
+
+async def login(request: Request):
+    try:
+        data = await read_json(request)
+        email = data.get('email')
+        password = data.get('password')
+        print(f"🔐 LOGIN (async) - Email: {email}")
+
+        if not email or not password:
+            return respond(request, {'error': 'Email and password are required'}, 400)
+
+        user = await user_repo.find_by_email(email)
+
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        if not await user_repo.verify_password_for_login(email, password):
+            return respond(request, {'error': 'Invalid password'}, 401)
+
+        auth_method = user.get('auth_method', 'sms')
+        session = FlaskSession(request)
+
+        print(f"✅ Credenciales válidas para: {email}, método: {auth_method}")
+
+        if auth_method == 'email':
+            if email_otp_usecases is None:
+                return respond(request, {'error': 'Email OTP service is not available'}, 500)
+
+            email_result = await email_otp_usecases.send_otp(
+                email, purpose='login', locale=negotiate_locale(request.headers.get('accept-language'))
+            )
+
+            if email_result['success']:
+                pending_verifications.set(email, email)
+                return respond(request, {
+                    'success': True,
+                    'requires_otp': True,
+                    'auth_method': 'email',
+                    'message': 'OTP sent to your email',
+                    'email': email
+                })
+            print("❌ Falló el envío de OTP por email")
+            return respond(request, {'error': 'Failed to send OTP email'}, 500)
+
+        elif auth_method == 'sms':
+            phone_number = user.get('phone_number')
+            if not phone_number:
+                return respond(request, {'error': 'No phone number found for SMS user'}, 400)
+
+            session['phone_number'] = phone_number
+
+            if await sms_otp_usecases.send_otp(phone_number):
+                pending_verifications.set(email, phone_number)
+                return respond(request, {
+                    'success': True,
+                    'requires_otp': True,
+                    'auth_method': 'sms',
+                    'message': 'OTP sent to your phone',
+                    'email': email
+                }, session=session)
+            print("❌ Falló el envío de OTP")
+            return respond(request, {'error': 'Failed to send OTP'}, 500, session=session)
+
+        else:  # TOTP
+            # El secreto no viaja en find_by_email (no se cachea): se consulta aparte
+            requires_otp = await user_repo.has_totp_secret(email)
+
+            if not requires_otp:
+                session['email'] = email
+
+            return respond(request, {
+                'success': True,
+                'requires_otp': requires_otp,
+                'auth_method': 'totp',
+                'email': email
+            }, session=session)
+
+    except PasswordHasherBusyError:
+        print("🚨 Login rechazado: pool de bcrypt saturado")
+        return respond(request, {'error': 'Service busy, please retry'}, 503, headers={'Retry-After': '1'})
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
+    except Exception as e:
+        print(f"❌ Error in login: {e}")
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def resend_otp(request: Request):
+    try:
+        data = await read_json(request)
+        email = data.get('email') or FlaskSession(request).get('email')
+
+        if not email:
+            return respond(request, {'error': 'Email is required'}, 400)
+
+        user = await user_repo.find_auth_routing(email)
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        auth_method = user.get('auth_method', 'sms')
+
+        if auth_method == 'email':
+            if email_otp_usecases is None:
+                return respond(request, {'error': 'Email OTP service is not available'}, 500)
+
+            email_result = await email_otp_usecases.send_otp(
+                email, purpose='login', locale=negotiate_locale(request.headers.get('accept-language'))
+            )
+
+            if email_result['success']:
+                return respond(request, {'message': 'OTP resent successfully to email'})
+            return respond(request, {'error': 'Failed to resend OTP email'}, 500)
+
+        elif auth_method == 'sms':
+            phone_number = pending_verifications.get(email)
+            if not phone_number:
+                if user.get('phone_number'):
+                    phone_number = user['phone_number']
+                    pending_verifications.set(email, phone_number)
+                else:
+                    return respond(request, {'error': 'No pending verification found for this email'}, 400)
+
+            if await sms_otp_usecases.send_otp(phone_number):
+                return respond(request, {'message': 'OTP resent successfully'})
+            return respond(request, {'error': 'Failed to resend OTP'}, 500)
+        else:
+            return respond(request, {'error': 'Unsupported authentication method'}, 400)
+
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
+    except Exception as e:
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def get_user_info(request: Request):
+    try:
+        email = request.query_params.get('email')
+
+        if not email:
+            return respond(request, {'error': 'Email parameter is required'}, 400)
+
+        user = await user_repo.find_profile(email)
+
+        if not user:
+            return respond(request, {'error': 'User not found'}, 404)
+
+        return respond(request, {
+            'success': True,
+            'email': user['email'],
+            'first_name': user.get('first_name', ''),
+            'phone_number': user.get('phone_number'),
+            'auth_method': user.get('auth_method', 'sms')
+        })
+
+    except Exception as e:
+        print(f"❌ Error in get_user_info: {e}")
+        return respond(request, {'error': str(e)}, 500)
+
+
+async def provider_unavailable(request: Request, exc: ProviderUnavailableError):
+    """Circuito abierto en cualquier ruta async: 503 con Retry-After (igual que main.py)"""
+    print(f"🔴 {exc}")
+    return respond(request, {'success': False, 'error': 'Notification provider unavailable, please retry'}, 503,
+                   headers={'Retry-After': str(exc.retry_after)})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    await sms_service.aclose()
+    if email_service is not None:
+        await email_service.aclose()
+    AsyncMongoDB.close()
+
+
+# Solo se listan los métodos de cada ruta: el preflight OPTIONS no coincide
+# del todo y cae en la app Flask (flask-cors)
+routes = [
+    Route('/api/auth/sms/send-otp', sms_send_otp, methods=['POST']),
+    Route('/api/auth/sms/verify-otp', sms_verify_otp, methods=['POST']),
+    Route('/api/auth/sms/user-info', sms_user_info, methods=['GET']),
+    Route('/api/auth/login', login, methods=['POST']),
+    Route('/api/auth/resend-otp', resend_otp, methods=['POST']),
+    Route('/api/auth/user-info', get_user_info, methods=['GET']),
+]
+
+if email_otp_usecases is not None:
+    routes += [
+        Route('/api/auth/email/send-otp', email_send_otp, methods=['POST']),
+        Route('/api/auth/email/verify-otp', email_verify_otp, methods=['POST']),
+        Route('/api/auth/email/user-info', email_user_info, methods=['GET']),
+    ]
+
+# Todo lo demás lo atiende Flask
+routes.append(Mount('/', app=WSGIMiddleware(flask_app)))
+
+app = Starlette(
+    routes=routes,
+    lifespan=lifespan,
+    exception_handlers={ProviderUnavailableError: provider_unavailable}
+)
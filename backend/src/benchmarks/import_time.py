@@ -0,0 +1,140 @@
+"""
+Reporte de tiempo de importación de la app (arranque en frío de un worker).
+
+Corre `python -X importtime -c "import main"` en un proceso limpio y muestra:
+- el tiempo total de `import main` (incluye create_app)
+- los módulos más caros (tiempo acumulado)
+- el tiempo propio sumado por paquete de primer nivel (flask, pymongo, ...)
+y lo compara con el presupuesto de import_budget.json: tope total, tope por
+paquete y módulos que no deben cargarse al arrancar (se cargan en el primer uso).
+
+Uso (desde backend/src):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --json > import-report.json   # para comparar entre releases
+    python -m benchmarks.import_time --check                       # exit 1 si se excede el presupuesto
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+BUDGET_FILE = os.path.join(current_dir, 'import_budget.json')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# El reporte no necesita credenciales reales ni Mongo: create_app no se conecta a nada
+_DUMMY_ENV = {
+    'ENSURE_INDEXES_ON_STARTUP': 'false',
+    'APP_EAGER_INIT': 'false'
+}
+
+
+def measure(runs=3):
+    """Mejor de `runs` ejecuciones (la primera paga la caché de disco del .pyc)"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import main'],
+            cwd=src_dir,
+            env={**os.environ, **_DUMMY_ENV},
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import main falló:\n{result.stderr[-2000:]}")
+
+        modules = []
+        for line in result.stderr.splitlines():
+            match = _LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules.append({
+                    'module': name,
+                    'self_ms': int(self_us) / 1000,
+                    'cumulative_ms': int(cumulative_us) / 1000,
+                    'depth': len(indent) // 2
+                })
+
+        total = next((m['cumulative_ms'] for m in modules if m['module'] == 'main'), 0.0)
+        if best is None or total < best['total_ms']:
+            best = {'total_ms': total, 'modules': modules}
+    return best
+
+
+def summarize(measurement, top):
+    packages = defaultdict(float)
+    for module in measurement['modules']:
+        packages[module['module'].split('.')[0]] += module['self_ms']
+
+    loaded = {module['module'] for module in measurement['modules']}
+    return {
+        'python': sys.version.split()[0],
+        'total_ms': round(measurement['total_ms'], 1),
+        'top_modules': [
+            {'module': m['module'], 'cumulative_ms': round(m['cumulative_ms'], 1), 'self_ms': round(m['self_ms'], 1)}
+            for m in sorted(measurement['modules'], key=lambda m: -m['cumulative_ms'])[:top]
+        ],
+        'packages': {
+            name: round(ms, 1) for name, ms in sorted(packages.items(), key=lambda item: -item[1])
+        },
+        'loaded_modules': sorted(loaded)
+    }
+
+
+def check_budget(report, budget):
+    """Lista de violaciones del presupuesto (vacía si todo está dentro)"""
+    violations = []
+    if report['total_ms'] > budget.get('total_ms', float('inf')):
+        violations.append(f"import main: {report['total_ms']} ms > {budget['total_ms']} ms")
+    for package, limit in budget.get('packages_ms', {}).items():
+        spent = report['packages'].get(package, 0.0)
+        if spent > limit:
+            violations.append(f"{package}: {spent} ms > {limit} ms")
+    loaded = set(report['loaded_modules'])
+    for module in budget.get('lazy_modules', []):
+        if module in loaded:
+            violations.append(f"{module} se importa al arrancar (debe cargarse en el primer uso)")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de importación de main.py por módulo')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--budget', default=BUDGET_FILE)
+    parser.add_argument('--json', action='store_true', help='Reporte completo en JSON')
+    parser.add_argument('--check', action='store_true', help='Exit 1 si se excede el presupuesto')
+    args = parser.parse_args()
+
+    report = summarize(measure(args.runs), args.top)
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+    violations = check_budget(report, budget)
+
+    if args.json:
+        print(json.dumps({**report, 'budget': budget, 'violations': violations}, indent=2))
+    else:
+        print(f"⏱️ import main: {report['total_ms']} ms (presupuesto {budget.get('total_ms')} ms)")
+        print(f"\n{'módulo':<55}{'acum. ms':>10}{'propio ms':>11}")
+        for row in report['top_modules']:
+            print(f"{row['module']:<55}{row['cumulative_ms']:>10}{row['self_ms']:>11}")
+        print(f"\n{'paquete':<30}{'propio ms':>10}")
+        for name, ms in list(report['packages'].items())[:args.top]:
+            print(f"{name:<30}{ms:>10}")
+        print()
+        for violation in violations:
+            print(f"❌ {violation}")
+        if not violations:
+            print("✅ Dentro del presupuesto")
+
+    if args.check and violations:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
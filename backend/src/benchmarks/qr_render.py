@@ -0,0 +1,74 @@
+"""
+Benchmark de los modos de render del QR TOTP (png, png-1bit, svg):
+tiempo por imagen y tamaño en bytes (también comprimido con gzip, como viajaría
+el SVG con compresión HTTP).
+
+Uso (desde backend/src):
+    python -m benchmarks.qr_render --iterations 300
+    python -m benchmarks.qr_render --mask-pattern 0      # máscara fija en png-1bit / svg
+    QR_PNG_BOX_SIZE=6 python -m benchmarks.qr_render
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES - Path absoluto desde src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+import pyotp
+from totp.adapters.http.qr_generator_adapter import QRGeneratorAdapter
+from totp.ports.qr_service_port import QR_MIMETYPES
+
+
+def run(iterations, issuer, mask_pattern=None):
+    adapter = QRGeneratorAdapter(mask_pattern=mask_pattern)
+    # URIs distintas en cada iteración, como usuarios distintos (sin ayuda de caches)
+    uris = [
+        pyotp.TOTP(pyotp.random_base32()).provisioning_uri(f'user{i}@example.com', issuer)
+        for i in range(iterations)
+    ]
+
+    results = []
+    for fmt in QR_MIMETYPES:
+        adapter.generate(uris[0], fmt)  # calentamiento
+        timings = []
+        for uri in uris:
+            started = time.perf_counter()
+            image = adapter.generate(uri, fmt)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        results.append({
+            'format': fmt,
+            'mean_ms': statistics.mean(timings) * 1000,
+            'p95_ms': timings[min(len(timings) - 1, int(0.95 * len(timings)))] * 1000,
+            'bytes': len(image),
+            'gzip_bytes': len(gzip.compress(image))
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara tiempo y tamaño de los modos de QR')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--issuer', default='Auth System')
+    parser.add_argument('--mask-pattern', type=int, choices=range(8), default=None)
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.issuer, args.mask_pattern)
+    baseline = results[0]
+    print(f"{'formato':<10}{'media ms':>10}{'p95 ms':>10}{'bytes':>9}{'gzip':>8}{'vs png':>9}")
+    for row in results:
+        speedup = baseline['mean_ms'] / row['mean_ms'] if row['mean_ms'] else 0
+        print(
+            f"{row['format']:<10}{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+            f"{row['bytes']:>9}{row['gzip_bytes']:>8}{speedup:>8.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
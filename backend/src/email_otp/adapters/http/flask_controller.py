@@ -1,11 +1,12 @@
 from flask import Blueprint, request, jsonify, session
-from ...application.email_otp_usecases import EmailOTPUseCases
-from shared.models.user_model import UserRepository
+from ...infrastructure.email_template_renderer import negotiate_locale
+from shared.bootstrap.dependencies import container
+from shared.resilience.circuit_breaker import ProviderUnavailableError
 
 # Crear blueprint
 email_otp_blueprint = Blueprint('email_otp', __name__)
-email_otp_usecases = EmailOTPUseCases()
-user_repo = UserRepository()
+email_otp_usecases = container.provider('email_otp_usecases')
+user_repo = container.provider('user_repository')
 
 @email_otp_blueprint.route('/send-otp', methods=['POST'])
 def send_otp():
@@ -17,7 +18,7 @@ def send_otp():
             return jsonify({'error': 'Email is required'}), 400
         
         # Verificar que el usuario existe
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_auth_routing(email)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -25,7 +26,7 @@ def send_otp():
         if user.get('auth_method') != 'email':
             return jsonify({'error': 'User is not registered with email method'}), 400
         
-        result = email_otp_usecases.send_otp(email)
+        result = email_otp_usecases.send_otp(email, purpose='login', locale=negotiate_locale(request.headers.get('Accept-Language')))
         
         if result['success']:
             return jsonify({
@@ -39,6 +40,8 @@ def send_otp():
                 'error': result['message']
             }), 500
             
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -53,7 +56,7 @@ def verify_otp():
             return jsonify({'error': 'Email and OTP are required'}), 400
         
         # Verificar que el usuario existe
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_auth_routing(email)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -93,7 +96,7 @@ def user_info():
         if not email:
             return jsonify({'error': 'Email parameter is required'}), 400
         
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_profile(email)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -0,0 +1,81 @@
+import os
+import random
+import string
+from datetime import datetime, timedelta
+from shared.otp_store.async_otp_store import get_async_otp_store
+from shared.resilience.circuit_breaker import ProviderUnavailableError
+from ..ports.async_email_service_port import AsyncEmailServicePort
+from ..ports.email_service_port import EMAIL_OTP_EXPIRY_MINUTES
+
+
+class AsyncEmailOTPUseCases:
+    """
+    Versión asíncrona de EmailOTPUseCases (mismo store email_otps y mismos
+    diccionarios de resultado)
+    """
+
+    def __init__(self, email_service: AsyncEmailServicePort):
+        self.email_service = email_service
+        self.collection = get_async_otp_store('email_otps', key_field='email', expires_field='expires_at')
+        self.max_attempts = int(os.getenv('EMAIL_OTP_MAX_ATTEMPTS', '5'))
+
+    async def _generate_otp(self, email: str) -> str:
+        otp = ''.join(random.choices(string.digits, k=6))
+        expires_at = datetime.utcnow() + timedelta(minutes=EMAIL_OTP_EXPIRY_MINUTES)
+        await self.collection.put(
+            email,
+            {
+                'otp': otp,
+                'created_at': datetime.utcnow(),
+                'attempts': 0
+            },
+            expires_at
+        )
+        return otp
+
+    async def send_otp(self, email: str, purpose: str = None, locale: str = None) -> dict:
+        """Envía un código OTP por email"""
+        try:
+            otp_code = await self._generate_otp(email)
+            print(f"📧 Generado OTP para {email}: {otp_code}")
+
+            success = await self.email_service.send_otp_email(email, otp_code, purpose, locale)
+
+            return {
+                'success': success,
+                'message': 'OTP sent successfully' if success else 'Failed to send OTP email',
+                'email': email
+            }
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            print(f"❌ Error in send_otp: {e}")
+            return {
+                'success': False,
+                'message': f'Error: {str(e)}',
+                'email': email
+            }
+
+    async def verify_otp(self, email: str, otp: str) -> dict:
+        """Verifica y consume el OTP en una sola operación atómica"""
+        try:
+            record = await self.collection.find_one_and_delete(
+                email,
+                {'otp': otp},
+                max_attempts=self.max_attempts
+            )
+            if not record:
+                await self.collection.increment(email, 'attempts')
+
+            return {
+                'success': bool(record),
+                'message': 'OTP verified successfully' if record else 'Invalid or expired OTP',
+                'email': email
+            }
+        except Exception as e:
+            print(f"❌ Error in verify_otp: {e}")
+            return {
+                'success': False,
+                'message': f'Error: {str(e)}',
+                'email': email
+            }
@@ -1,20 +1,21 @@
 from ..infrastructure.email_otp_repository import EmailOTPRepository
-from ..infrastructure.brevo_email_adapter import BrevoEmailAdapter
+from ..infrastructure.email_service_factory import default_email_service
+from shared.resilience.circuit_breaker import ProviderUnavailableError
 
 class EmailOTPUseCases:
-    def __init__(self):
-        self.otp_repository = EmailOTPRepository()
-        self.email_service = BrevoEmailAdapter()
+    def __init__(self, otp_repository: EmailOTPRepository = None, email_service=None):
+        self.otp_repository = otp_repository or EmailOTPRepository()
+        self.email_service = email_service or default_email_service()
     
-    def send_otp(self, email: str) -> dict:
-        """Envía un código OTP por email"""
+    def send_otp(self, email: str, purpose: str = None, locale: str = None) -> dict:
+        """Envía un código OTP por email (purpose / locale eligen la plantilla)"""
         try:
             # Generar OTP
             otp_code = self.otp_repository.generate_otp(email)
             print(f"📧 Generado OTP para {email}: {otp_code}")
             
             # Enviar email
-            success = self.email_service.send_otp_email(email, otp_code)
+            success = self.email_service.send_otp_email(email, otp_code, purpose, locale)
             
             if success:
                 return {
@@ -29,6 +30,8 @@ class EmailOTPUseCases:
                     'email': email
                 }
                 
+        except ProviderUnavailableError:
+            raise
         except Exception as e:
             print(f"❌ Error in send_otp: {e}")
             return {
@@ -11,9 +11,9 @@ class EmailOTPGenerator:
     @staticmethod
     def get_expiration_time(minutes: int = 10) -> datetime:
         """Obtiene la fecha de expiración"""
-        return datetime.now() + timedelta(minutes=minutes)
+        return datetime.utcnow() + timedelta(minutes=minutes)
     
     @staticmethod
     def is_otp_expired(expires_at: datetime) -> bool:
         """Verifica si un OTP ha expirado"""
-        return datetime.now() > expires_at
\ No newline at end of file
+        return datetime.utcnow() > expires_at
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import httpx
+from ..ports.async_email_service_port import AsyncEmailServicePort
+from .brevo_email_adapter import BrevoEmailAdapter
+from shared.resilience.circuit_breaker import RecipientRejected, is_recipient_error
+
+class AsyncBrevoEmailAdapter(AsyncEmailServicePort):
+    """
+    Envío por Brevo con httpx.AsyncClient (keep-alive, un cliente por adaptador).
+    El payload y los headers se construyen igual que en BrevoEmailAdapter.
+    """
+    def __init__(self, client: httpx.AsyncClient = None):
+        self.builder = BrevoEmailAdapter.get_instance()
+        self.base_url = self.builder.base_url
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                float(os.getenv('BREVO_READ_TIMEOUT', '10')),
+                connect=float(os.getenv('BREVO_CONNECT_TIMEOUT', '3'))
+            )
+        )
+    
+    async def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        try:
+            print(f"📧 Enviando email (async) a: {to_email}")
+            response = await self.client.post(
+                self.base_url,
+                json=self.builder.build_payload(to_email, otp_code, purpose, locale),
+                headers=self.builder.build_headers()
+            )
+            
+            print(f"📡 Respuesta Brevo - Status: {response.status_code}")
+            if response.status_code != 201:
+                print(f"❌ Error Brevo: {response.text}")
+                if is_recipient_error(response.status_code):
+                    return RecipientRejected(f"brevo {response.status_code}")
+            
+            return response.status_code == 201
+            
+        except Exception as e:
+            print(f"🚨 Error enviando email: {e}")
+            return False
+    
+    async def aclose(self):
+        await self.client.aclose()
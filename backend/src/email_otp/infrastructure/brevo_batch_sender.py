@@ -0,0 +1,161 @@
+import os
+import threading
+from shared.resilience.circuit_breaker import is_recipient_error
+from ..ports.email_service_port import EmailServicePort
+from .brevo_email_adapter import BrevoEmailAdapter
+
+# En el lote, el HTML va una sola vez y cada destinatario lleva solo su código
+OTP_PARAM_PLACEHOLDER = '{{params.otp_code}}'
+
+
+class _PendingEmail:
+    __slots__ = ('to_email', 'otp_code', 'done', 'success')
+
+    def __init__(self, to_email, otp_code):
+        self.to_email = to_email
+        self.otp_code = otp_code
+        self.done = threading.Event()
+        self.success = False
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []
+        self.full = threading.Event()
+
+
+class BrevoBatchSender(EmailServicePort):
+    """
+    Agrupa los emails OTP que llegan en una ventana de pocos ms (por propósito
+    e idioma) y los manda en una sola llamada a Brevo con messageVersions.
+
+    Esquema líder/seguidor, sin hilos propios: el primero que llega a un lote
+    espera la ventana (o a que se llene), lo cierra y hace el POST; el resto
+    solo espera su resultado. Cada llamador recibe su propio True/False.
+    Si Brevo rechaza el lote completo por el payload (400/404/422), se reenvía uno por uno para no
+    hacer fallar a todos por una sola dirección inválida.
+
+    Solo agrupa donde hay envíos concurrentes en el mismo proceso (el pool de
+    notification_worker, workers con hilos o ASGI). Con workers sync de
+    gunicorn cada proceso atiende un request a la vez y nunca hay con quién
+    juntarse: mientras el proceso no haya visto dos envíos a la vez, el líder
+    no espera la ventana y el email sale sin latencia extra.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, adapter: BrevoEmailAdapter = None, window_ms=None, max_batch_size=None):
+        self.adapter = adapter or BrevoEmailAdapter.get_instance()
+        self.window = (window_ms if window_ms is not None else float(os.getenv('BREVO_BATCH_WINDOW_MS', '10'))) / 1000
+        self.max_batch_size = max_batch_size or int(os.getenv('BREVO_BATCH_MAX_SIZE', '50'))
+        # Tope de espera de un seguidor: ventana + todos los reintentos del líder
+        connect_timeout, read_timeout = self.adapter.timeout
+        self.result_timeout = self.window + (self.adapter.max_retries + 1) * (
+            connect_timeout + read_timeout + self.adapter.backoff_max
+        )
+        self._lock = threading.Lock()
+        self._open = {}
+        # Envíos en curso y si alguna vez coincidieron dos (solo entonces vale la ventana)
+        self._in_flight = 0
+        self._concurrent = False
+        self._metrics_lock = threading.Lock()
+        self._metrics = {'batches': 0, 'batched_emails': 0, 'max_batch': 0, 'fallbacks': 0}
+
+    @staticmethod
+    def get_instance():
+        if BrevoBatchSender._instance is None:
+            with BrevoBatchSender._instance_lock:
+                if BrevoBatchSender._instance is None:
+                    BrevoBatchSender._instance = BrevoBatchSender()
+        return BrevoBatchSender._instance
+
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        with self._lock:
+            self._in_flight += 1
+            if self._in_flight > 1:
+                self._concurrent = True
+        try:
+            return self._send(to_email, otp_code, purpose, locale)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _send(self, to_email, otp_code, purpose, locale):
+        item = _PendingEmail(to_email, otp_code)
+        key = (purpose, locale)
+
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                # Lleno: se cierra ya para que los siguientes abran otro
+                del self._open[key]
+                batch.full.set()
+
+        if not leader:
+            if not item.done.wait(self.result_timeout):
+                print(f"⏱️ Sin resultado del lote para {to_email}")
+            return item.success
+
+        if self._concurrent:
+            batch.full.wait(self.window)
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+
+        try:
+            self._send_batch(batch.items, purpose, locale)
+        finally:
+            for pending in batch.items:
+                pending.done.set()
+        return item.success
+
+    def build_batch_payload(self, items, purpose=None, locale=None):
+        # Mismo remitente / asunto / HTML que el envío individual, con el código como parámetro
+        payload = self.adapter.build_payload(items[0].to_email, OTP_PARAM_PLACEHOLDER, purpose, locale)
+        del payload['to']
+        payload['messageVersions'] = [
+            {
+                'to': [{'email': pending.to_email, 'name': pending.to_email.split('@')[0]}],
+                'params': {'otp_code': pending.otp_code}
+            }
+            for pending in items
+        ]
+        return payload
+
+    def _send_batch(self, items, purpose, locale):
+        with self._metrics_lock:
+            self._metrics['batches'] += 1
+            self._metrics['batched_emails'] += len(items)
+            self._metrics['max_batch'] = max(self._metrics['max_batch'], len(items))
+
+        if len(items) == 1:
+            pending = items[0]
+            pending.success = self.adapter.send_otp_email(pending.to_email, pending.otp_code, purpose, locale)
+            return
+
+        print(f"📦 Enviando lote de {len(items)} emails a Brevo")
+        response = self.adapter.post_payload(self.build_batch_payload(items, purpose, locale))
+
+        if response is not None and response.status_code == 201:
+            for pending in items:
+                pending.success = True
+        elif response is not None and is_recipient_error(response.status_code):
+            # Un destinatario inválido tumba el lote: se aísla reenviando individualmente
+            with self._metrics_lock:
+                self._metrics['fallbacks'] += 1
+            for pending in items:
+                pending.success = self.adapter.send_otp_email(pending.to_email, pending.otp_code, purpose, locale)
+        # Sin respuesta / 5xx / 429 / 401-403 (credencial) tras los reintentos: todos quedan en False
+
+    def stats(self):
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['avg_batch'] = round(metrics['batched_emails'] / metrics['batches'], 2) if metrics['batches'] else 0.0
+        metrics['window_ms'] = self.window * 1000
+        metrics['max_batch_size'] = self.max_batch_size
+        metrics['concurrent'] = self._concurrent
+        return {'batching': metrics, **self.adapter.stats()}
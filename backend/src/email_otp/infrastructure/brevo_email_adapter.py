@@ -1,19 +1,73 @@
 import os
+import random
+import threading
+import time
+from collections import deque
 import requests
+from requests.adapters import HTTPAdapter
 from ..ports.email_service_port import EmailServicePort
+from .email_template_renderer import EmailTemplateRenderer
+from shared.resilience.circuit_breaker import RecipientRejected, is_recipient_error
+
+# Respuestas de Brevo que vale la pena reintentar
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
 
 class BrevoEmailAdapter(EmailServicePort):
-    def __init__(self):
+    """
+    Cliente de Brevo de larga vida: una requests.Session con pool keep-alive
+    (sin TCP+TLS nuevo por email), timeouts de conexión/lectura, reintentos
+    acotados con backoff + jitter y métricas de latencia por llamada.
+    Usar get_instance() para compartirlo en todo el proceso.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, session: requests.Session = None):
         self.api_key = os.getenv('BREVO_API_KEY')
         self.sender_email = os.getenv('BREVO_SENDER_EMAIL')
         self.sender_name = os.getenv('BREVO_SENDER_NAME')
-        self.base_url = "https://api.brevo.com/v3/smtp/email"
-    
-    def send_otp_email(self, to_email: str, otp_code: str) -> bool:
+        # BREVO_BASE_URL permite apuntar al simulador local (simulators/brevo_simulator.py)
+        self.base_url = os.getenv('BREVO_BASE_URL', 'https://api.brevo.com').rstrip('/') + '/v3/smtp/email'
+        self.timeout = (
+            float(os.getenv('BREVO_CONNECT_TIMEOUT', '3')),
+            float(os.getenv('BREVO_READ_TIMEOUT', '10'))
+        )
+        self.max_retries = int(os.getenv('BREVO_MAX_RETRIES', '2'))
+        self.backoff_base = float(os.getenv('BREVO_BACKOFF_BASE_SECONDS', '0.25'))
+        self.backoff_max = float(os.getenv('BREVO_BACKOFF_MAX_SECONDS', '2'))
+        self.session = session or self._build_session()
+        self.templates = EmailTemplateRenderer.get_instance()
+
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=512)
+        self._metrics = {'calls': 0, 'sent': 0, 'failed': 0, 'retries': 0, 'timeouts': 0}
+
+    @staticmethod
+    def get_instance():
+        if BrevoEmailAdapter._instance is None:
+            with BrevoEmailAdapter._instance_lock:
+                if BrevoEmailAdapter._instance is None:
+                    BrevoEmailAdapter._instance = BrevoEmailAdapter()
+        return BrevoEmailAdapter._instance
+
+    @staticmethod
+    def _build_session():
+        pool_size = int(os.getenv('BREVO_POOL_SIZE', '10'))
+        session = requests.Session()
+        # Los reintentos los maneja send_otp_email (con jitter y métricas)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def build_payload(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> dict:
         """
-        Envía un código OTP por email usando Brevo API
+        Cuerpo de la petición a Brevo (compartido con la versión async).
+        El HTML sale de la plantilla precompilada del propósito / idioma.
         """
-        payload = {
+        subject, html_content = self.templates.render(otp_code, purpose, locale)
+        return {
             "sender": {
                 "name": self.sender_name,
                 "email": self.sender_email
@@ -24,72 +78,107 @@ class BrevoEmailAdapter(EmailServicePort):
                     "name": to_email.split('@')[0]
                 }
             ],
-            "subject": "Tu código de verificación SecureAuth",
-            "htmlContent": self._generate_html_content(otp_code)
+            "subject": subject,
+            "htmlContent": html_content
         }
-        
-        headers = {
+    
+    def build_headers(self) -> dict:
+        return {
             "accept": "application/json",
             "api-key": self.api_key,
             "content-type": "application/json"
         }
-        
-        try:
-            print(f"📧 Enviando email a: {to_email}")
-            print(f"🔑 Usando API Key: {self.api_key[:6]}...")
-            print(f"👤 Remitente: {self.sender_name} <{self.sender_email}>")
-            
-            response = requests.post(self.base_url, json=payload, headers=headers)
-            
-            print(f"📡 Respuesta Brevo - Status: {response.status_code}")
-            if response.status_code != 201:
-                print(f"❌ Error Brevo: {response.text}")
-            
-            return response.status_code == 201
-            
-        except Exception as e:
-            print(f"🚨 Error enviando email: {e}")
-            return False
     
-    def _generate_html_content(self, otp_code: str) -> str:
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def _record(self, metric, latency=None):
+        with self._metrics_lock:
+            self._metrics[metric] += 1
+            if latency is not None:
+                self._latencies.append(latency)
+
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
         """
-        Genera el contenido HTML del email
+        Envía un código OTP por email usando Brevo API
         """
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: #2563eb; color: white; padding: 20px; text-align: center; }}
-                .code {{ background: #f3f4f6; padding: 20px; text-align: center; font-size: 32px; 
-                        font-weight: bold; letter-spacing: 8px; margin: 30px 0; border-radius: 8px; }}
-                .footer {{ margin-top: 30px; padding: 20px; background: #f9fafb; text-align: center; 
-                         color: #6b7280; font-size: 14px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🔐 SecureAuth</h1>
-                    <p>Verificación de Seguridad</p>
-                </div>
-                
-                <h2>Hola,</h2>
-                <p>Tu código de verificación para acceder a SecureAuth es:</p>
-                
-                <div class="code">{otp_code}</div>
-                
-                <p>Este código es válido por <strong>tiempo limitado</strong>.</p>
-                <p>Si no solicitaste este código, por favor ignora este mensaje.</p>
-                
-                <div class="footer">
-                    <p>© 2024 SecureAuth. Todos los derechos reservados.</p>
-                    <p>Este es un email automático, por favor no respondas.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
\ No newline at end of file
+        print(f"📧 Enviando email a: {to_email}")
+        response = self.post_payload(self.build_payload(to_email, otp_code, purpose, locale))
+        if response is None:
+            return False
+        if is_recipient_error(response.status_code):
+            # Email inválido / bloqueado: Brevo respondió, no cuenta para el breaker
+            return RecipientRejected(f"brevo {response.status_code}")
+        return response.status_code == 201
+
+    def post_payload(self, payload: dict):
+        """
+        POST a Brevo con timeouts y reintentos; devuelve la última respuesta
+        (o None si no hubo respuesta). También lo usa BrevoBatchSender.
+        """
+        headers = self.build_headers()
+        self._record('calls')
+        response = None
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = self.session.post(self.base_url, json=payload, headers=headers, timeout=self.timeout)
+                latency = time.monotonic() - started
+
+                print(f"📡 Respuesta Brevo - Status: {response.status_code} ({latency * 1000:.0f} ms)")
+                if response.status_code == 201:
+                    self._record('sent', latency)
+                    return response
+
+                print(f"❌ Error Brevo: {response.text}")
+                self._record_latency(latency)
+                if response.status_code not in RETRYABLE_STATUS:
+                    break
+                retry_after = response.headers.get('Retry-After')
+
+            except requests.Timeout as e:
+                response = None
+                self._record('timeouts', time.monotonic() - started)
+                print(f"⏱️ Timeout llamando a Brevo: {e}")
+            except requests.ConnectionError as e:
+                response = None
+                print(f"🚨 Error de conexión con Brevo: {e}")
+            except Exception as e:
+                print(f"🚨 Error enviando email: {e}")
+                break
+
+            if attempt < self.max_retries:
+                self._record('retries')
+                time.sleep(self._backoff(attempt, retry_after))
+
+        self._record('failed')
+        return response
+
+    def _record_latency(self, latency):
+        with self._metrics_lock:
+            self._latencies.append(latency)
+
+    def stats(self):
+        with self._metrics_lock:
+            latencies = sorted(self._latencies)
+            metrics = dict(self._metrics)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            **metrics,
+            'latency_ms': {'p50': percentile(0.50), 'p95': percentile(0.95), 'max': percentile(1.0)},
+            'timeout': {'connect': self.timeout[0], 'read': self.timeout[1]},
+            'max_retries': self.max_retries
+        }
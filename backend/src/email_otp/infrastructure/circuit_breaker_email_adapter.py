@@ -0,0 +1,32 @@
+from shared.resilience.circuit_breaker import CircuitBreaker
+from ..ports.email_service_port import EmailServicePort
+from ..ports.async_email_service_port import AsyncEmailServicePort
+
+
+class CircuitBreakerEmailAdapter(EmailServicePort):
+    """
+    Envuelve al proveedor de email con el breaker 'email'. Con el circuito
+    abierto lanza ProviderUnavailableError sin esperar al timeout de Brevo.
+    """
+    def __init__(self, inner: EmailServicePort, breaker: CircuitBreaker = None):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker.get('email')
+
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        return self.breaker.call(self.inner.send_otp_email, to_email, otp_code, purpose, locale)
+
+    def stats(self):
+        return self.inner.stats()
+
+
+class AsyncCircuitBreakerEmailAdapter(AsyncEmailServicePort):
+    """Misma protección para el adaptador async (comparte el breaker 'email' del proceso)"""
+    def __init__(self, inner: AsyncEmailServicePort, breaker: CircuitBreaker = None):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker.get('email')
+
+    async def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        return await self.breaker.call_async(self.inner.send_otp_email, to_email, otp_code, purpose, locale)
+
+    async def aclose(self):
+        await self.inner.aclose()
@@ -1,62 +1,57 @@
+import os
 import random
 import string
 from datetime import datetime, timedelta
-from shared.database.mongo_connection import MongoDB  # ✅ IMPORTAR LA CLASE
+from shared.otp_store.factory import get_otp_store
+from ..ports.email_service_port import EMAIL_OTP_EXPIRY_MINUTES
 
 class EmailOTPRepository:
-    def __init__(self):
-        self.db = MongoDB.get_db()  # ✅ USAR EL MÉTODO ESTÁTICO
-        self.collection = self.db.email_otps
+    def __init__(self, store=None):
+        # Backend configurable (OTP_STORE_BACKEND): MongoDB (email_otps) o memoria
+        self.collection = store or get_otp_store('email_otps', key_field='email', expires_field='expires_at')
+        self.max_attempts = int(os.getenv('EMAIL_OTP_MAX_ATTEMPTS', '5'))
     
     def generate_otp(self, email: str) -> str:
         """Genera un código OTP de 6 dígitos"""
         otp = ''.join(random.choices(string.digits, k=6))
-        expires_at = datetime.now() + timedelta(minutes=10)
+        expires_at = datetime.utcnow() + timedelta(minutes=EMAIL_OTP_EXPIRY_MINUTES)
         
-        # Guardar OTP en la base de datos
-        self.collection.update_one(
-            {'email': email},
+        # Guardar OTP en el store
+        self.collection.put(
+            email,
             {
-                '$set': {
-                    'otp': otp,
-                    'expires_at': expires_at,
-                    'created_at': datetime.now(),
-                    'attempts': 0
-                }
+                'otp': otp,
+                'created_at': datetime.utcnow(),
+                'attempts': 0
             },
-            upsert=True
+            expires_at
         )
         
         return otp
     
     def verify_otp(self, email: str, otp: str) -> bool:
-        """Verifica un código OTP"""
-        record = self.collection.find_one({'email': email})
-        
-        if not record:
-            return False
-        
-        # Verificar si el OTP ha expirado
-        if datetime.now() > record['expires_at']:
-            self.collection.delete_one({'email': email})
-            return False
+        """
+        Verifica y consume el OTP en una sola operación atómica del store.
+        Código, expiración y límite de intentos van en el filtro, así que ante
+        envíos concurrentes solo una petición puede consumirlo.
+        """
+        record = self.collection.find_one_and_delete(
+            email,
+            {'otp': otp},
+            max_attempts=self.max_attempts
+        )
         
-        # Verificar si el OTP coincide
-        if record['otp'] == otp:
-            self.collection.delete_one({'email': email})
+        if record:
             return True
         
-        # Incrementar intentos fallidos
-        self.collection.update_one(
-            {'email': email},
-            {'$inc': {'attempts': 1}}
-        )
+        # Incrementar intentos fallidos (los expirados los limpia el TTL / timer wheel)
+        self.collection.increment(email, 'attempts')
         
         return False
     
     def get_otp_info(self, email: str) -> dict:
         """Obtiene información del OTP actual"""
-        record = self.collection.find_one({'email': email})
+        record = self.collection.find(email)
         if record:
             return {
                 'email': record['email'],
@@ -0,0 +1,68 @@
+import os
+from shared.bootstrap.lazy import Lazy
+from shared.outbox.notification_outbox import outbox_enabled
+from shared.resilience.circuit_breaker import circuit_breaker_enabled
+from shared.resilience.hedged_router import HedgedRouter, parse_provider_weights
+from .circuit_breaker_email_adapter import CircuitBreakerEmailAdapter
+from .multi_provider_email_adapter import MultiProviderEmailAdapter
+from .outbox_email_adapter import OutboxEmailAdapter
+
+
+def batching_enabled():
+    return os.getenv('BREVO_BATCHING', 'false').lower() == 'true'
+
+
+def brevo_email_service():
+    """Lotes con messageVersions (BREVO_BATCHING) o envío individual"""
+    # requests se importa recién aquí, cuando el proceso envía su primer email
+    from .brevo_batch_sender import BrevoBatchSender
+    from .brevo_email_adapter import BrevoEmailAdapter
+    # Instancias nuevas (no get_instance): se llama una vez por worker desde _provider
+    adapter = BrevoEmailAdapter()
+    return BrevoBatchSender(adapter) if batching_enabled() else adapter
+
+
+def _smtp():
+    from .smtp_email_adapter import SMTPEmailAdapter
+    return SMTPEmailAdapter()
+
+
+PROVIDER_FACTORIES = {
+    'brevo': brevo_email_service,
+    'smtp': _smtp
+}
+
+
+def _build_provider():
+    providers = parse_provider_weights(os.getenv('EMAIL_PROVIDERS'), 'brevo')
+    if len(providers) > 1:
+        return MultiProviderEmailAdapter(HedgedRouter.build('email', providers, PROVIDER_FACTORIES))
+    service = PROVIDER_FACTORIES[providers[0][0]]()
+    return CircuitBreakerEmailAdapter(service) if circuit_breaker_enabled() else service
+
+
+# Uno por proceso worker: la sesión HTTP creada antes del fork no se hereda
+_provider = Lazy(_build_provider, 'email_provider', per_worker=True)
+
+
+def provider_email_service():
+    """
+    Quien entrega los emails (una instancia por proceso worker). Un solo
+    proveedor (EMAIL_PROVIDERS=brevo, por defecto): detrás del circuit breaker
+    'email'. Varios ("brevo:3,smtp:1"): router con peso, cobertura y failover,
+    con un breaker por proveedor.
+    """
+    return _provider.get()
+
+
+def provider_email_stats():
+    """Métricas del proveedor (None si este worker aún no lo creó: /health no lo construye)"""
+    if not _provider.built:
+        return None
+    stats = getattr(_provider.get(), 'stats', None)
+    return stats() if stats else None
+
+
+def default_email_service():
+    """Para los casos de uso: outbox (lo entrega el worker) o directo al proveedor"""
+    return OutboxEmailAdapter() if outbox_enabled() else provider_email_service()
@@ -0,0 +1,119 @@
+import html
+import json
+import os
+import re
+import threading
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates')
+LAYOUT_FILE = 'otp_email.html'
+MESSAGES_FILE = 'messages.json'
+
+PURPOSES = ('login', 'register', 'recovery')
+DEFAULT_PURPOSE = 'login'
+
+_SLOT = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+def minify_html(markup):
+    """Minificado conservador: sin comentarios, sin espacios entre tags y CSS compacto"""
+    markup = re.sub(r'<!--.*?-->', '', markup, flags=re.S)
+
+    def minify_css(match):
+        css = re.sub(r'\s+', ' ', match.group(2))
+        css = re.sub(r'\s*([{}:;,])\s*', r'\1', css).replace(';}', '}')
+        return f"{match.group(1)}{css.strip()}{match.group(3)}"
+
+    markup = re.sub(r'(<style[^>]*>)(.*?)(</style>)', minify_css, markup, flags=re.S | re.I)
+    markup = re.sub(r'>\s+<', '><', markup)
+    markup = re.sub(r'\s{2,}', ' ', markup)
+    return markup.strip()
+
+
+class CompiledTemplate:
+    """
+    Plantilla ya minificada y partida en fragmentos estáticos + slots.
+    fragments alterna texto fijo y nombres de slot: [txt, slot, txt, slot, txt]
+    """
+    __slots__ = ('subject', 'fragments', 'slots', '_positions')
+
+    def __init__(self, subject, markup):
+        self.subject = subject
+        self.fragments = _SLOT.split(markup)
+        self.slots = tuple(self.fragments[1::2])
+        self._positions = tuple(range(1, len(self.fragments), 2))
+
+    def render(self, values):
+        parts = self.fragments[:]
+        for index in self._positions:
+            value = str(values[parts[index]])
+            # Los códigos OTP son alfanuméricos: no hace falta escaparlos
+            parts[index] = value if value.isalnum() else html.escape(value)
+        return ''.join(parts)
+
+
+class EmailTemplateRenderer:
+    """
+    Plantillas de email precompiladas al arrancar, una por (locale, propósito).
+    Los textos de messages.json se hornean en el layout al cargar; al enviar
+    solo quedan los slots dinámicos ({{otp_code}}), así que renderizar es un join.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, templates_dir=None, default_locale=None):
+        self.templates_dir = templates_dir or TEMPLATES_DIR
+        self.default_locale = default_locale or os.getenv('EMAIL_DEFAULT_LOCALE', 'es')
+        self.templates = {}
+        self._load()
+
+    @staticmethod
+    def get_instance():
+        if EmailTemplateRenderer._instance is None:
+            with EmailTemplateRenderer._instance_lock:
+                if EmailTemplateRenderer._instance is None:
+                    EmailTemplateRenderer._instance = EmailTemplateRenderer()
+        return EmailTemplateRenderer._instance
+
+    def _load(self):
+        with open(os.path.join(self.templates_dir, LAYOUT_FILE), encoding='utf-8') as f:
+            layout = minify_html(f.read())
+        with open(os.path.join(self.templates_dir, MESSAGES_FILE), encoding='utf-8') as f:
+            messages = json.load(f)
+
+        for locale, sections in messages.items():
+            common = sections.get('common', {})
+            for purpose in PURPOSES:
+                texts = {**common, **sections[purpose], 'lang': locale}
+                # Los textos son HTML de confianza; los slots que no están aquí quedan dinámicos
+                markup = _SLOT.sub(lambda m: texts.get(m.group(1), m.group(0)), layout)
+                self.templates[(locale, purpose)] = CompiledTemplate(texts['subject'], markup)
+
+        if (self.default_locale, DEFAULT_PURPOSE) not in self.templates:
+            raise ValueError(f"Locale por defecto sin plantillas: {self.default_locale}")
+
+    @property
+    def locales(self):
+        return sorted({locale for locale, _ in self.templates})
+
+    def negotiate_locale(self, accept_language):
+        """Primer idioma de Accept-Language que tenga plantillas (o el por defecto)"""
+        for part in (accept_language or '').split(','):
+            language = part.split(';')[0].strip().lower().split('-')[0]
+            if language and (language, DEFAULT_PURPOSE) in self.templates:
+                return language
+        return self.default_locale
+
+    def get(self, purpose=None, locale=None):
+        template = self.templates.get((locale or self.default_locale, purpose or DEFAULT_PURPOSE))
+        if template is None:
+            template = self.templates.get((self.default_locale, purpose or DEFAULT_PURPOSE))
+        return template or self.templates[(self.default_locale, DEFAULT_PURPOSE)]
+
+    def render(self, otp_code, purpose=None, locale=None):
+        """Devuelve (asunto, html) para el OTP"""
+        template = self.get(purpose, locale)
+        return template.subject, template.render({'otp_code': otp_code})
+
+
+def negotiate_locale(accept_language):
+    return EmailTemplateRenderer.get_instance().negotiate_locale(accept_language)
@@ -0,0 +1,14 @@
+from shared.resilience.hedged_router import HedgedRouter
+from ..ports.email_service_port import EmailServicePort
+
+
+class MultiProviderEmailAdapter(EmailServicePort):
+    """Email por varios proveedores (EMAIL_PROVIDERS) con ruteo por peso, cobertura y failover"""
+    def __init__(self, router: HedgedRouter):
+        self.router = router
+
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        return self.router.send(to_email, otp_code, purpose, locale)
+
+    def stats(self):
+        return self.router.stats()
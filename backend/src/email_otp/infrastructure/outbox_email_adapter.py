@@ -0,0 +1,40 @@
+from shared.database.async_mongo_connection import AsyncMongoDB
+from shared.outbox.notification_outbox import NotificationOutbox, COLLECTION_NAME, build_message
+from ..ports.email_service_port import EmailServicePort, EMAIL_OTP_EXPIRY_MINUTES
+from ..ports.async_email_service_port import AsyncEmailServicePort
+
+# El worker no entrega un código ya vencido
+OTP_MAX_AGE_SECONDS = EMAIL_OTP_EXPIRY_MINUTES * 60
+
+
+class OutboxEmailAdapter(EmailServicePort):
+    """
+    Encola el email en notification_outbox en lugar de llamar a Brevo; lo
+    entrega notification_worker.py. True = quedó guardado en el outbox.
+    """
+    def __init__(self, outbox: NotificationOutbox = None):
+        self.outbox = outbox or NotificationOutbox.get_instance()
+
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        try:
+            self.outbox.enqueue('email', to_email, otp_code, max_age_seconds=OTP_MAX_AGE_SECONDS,
+                               purpose=purpose, locale=locale)
+            return True
+        except Exception as e:
+            print(f"❌ Error encolando email: {e}")
+            return False
+
+
+class AsyncOutboxEmailAdapter(AsyncEmailServicePort):
+    async def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        try:
+            message = build_message('email', to_email, otp_code, max_age_seconds=OTP_MAX_AGE_SECONDS,
+                                    purpose=purpose, locale=locale)
+            await AsyncMongoDB.get_db()[COLLECTION_NAME].insert_one(message)
+            return True
+        except Exception as e:
+            print(f"❌ Error encolando email: {e}")
+            return False
+
+    async def aclose(self):
+        pass
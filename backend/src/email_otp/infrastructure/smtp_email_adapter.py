@@ -0,0 +1,68 @@
+import os
+import smtplib
+import threading
+from email.message import EmailMessage
+from ..ports.email_service_port import EmailServicePort
+from .email_template_renderer import EmailTemplateRenderer
+from shared.resilience.circuit_breaker import RecipientRejected
+
+class SMTPEmailAdapter(EmailServicePort):
+    """
+    Envío por SMTP con las mismas plantillas que Brevo; segundo proveedor
+    para el router multi-proveedor. Una conexión por envío (sin estado compartido
+    entre hilos).
+    """
+    def __init__(self):
+        self.host = os.getenv('SMTP_HOST')
+        self.port = int(os.getenv('SMTP_PORT', '587'))
+        self.username = os.getenv('SMTP_USERNAME')
+        self.password = os.getenv('SMTP_PASSWORD')
+        self.sender_email = os.getenv('SMTP_SENDER_EMAIL') or os.getenv('BREVO_SENDER_EMAIL')
+        self.sender_name = os.getenv('SMTP_SENDER_NAME') or os.getenv('BREVO_SENDER_NAME')
+        self.use_tls = os.getenv('SMTP_STARTTLS', 'true').lower() == 'true'
+        self.timeout = float(os.getenv('SMTP_TIMEOUT', '10'))
+        
+        if not all([self.host, self.sender_email]):
+            raise ValueError("Missing SMTP configuration")
+        
+        self.templates = EmailTemplateRenderer.get_instance()
+        self._lock = threading.Lock()
+        self._metrics = {'sent': 0, 'failed': 0}
+    
+    def build_message(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> EmailMessage:
+        subject, html_content = self.templates.render(otp_code, purpose, locale)
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = f"{self.sender_name} <{self.sender_email}>" if self.sender_name else self.sender_email
+        message['To'] = to_email
+        message.set_content(f"{subject}: {otp_code}")
+        message.add_alternative(html_content, subtype='html')
+        return message
+    
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.use_tls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password)
+                smtp.send_message(self.build_message(to_email, otp_code, purpose, locale))
+            print(f"✅ Email (SMTP) enviado a {to_email}")
+            self._record('sent')
+            return True
+        except smtplib.SMTPRecipientsRefused as e:
+            print(f"🚨 Destinatario rechazado (SMTP): {e}")
+            self._record('failed')
+            return RecipientRejected('smtp recipient refused')
+        except Exception as e:
+            print(f"🚨 Error enviando email (SMTP): {e}")
+            self._record('failed')
+            return False
+    
+    def _record(self, outcome):
+        with self._lock:
+            self._metrics[outcome] += 1
+    
+    def stats(self):
+        with self._lock:
+            return {'provider': 'smtp', 'host': self.host, **self._metrics}
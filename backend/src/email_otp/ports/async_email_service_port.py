@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+class AsyncEmailServicePort(ABC):
+    @abstractmethod
+    async def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        """Envía un código OTP por email sin bloquear el event loop"""
+        pass
\ No newline at end of file
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 
+# Vida de un código por email (login, registro y recuperación): pasado este
+# tiempo el outbox ya no lo entrega
+EMAIL_OTP_EXPIRY_MINUTES = 10
+
 class EmailServicePort(ABC):
     @abstractmethod
-    def send_otp_email(self, to_email: str, otp_code: str) -> bool:
-        """Envía un código OTP por email"""
+    def send_otp_email(self, to_email: str, otp_code: str, purpose: str = None, locale: str = None) -> bool:
+        """Envía un código OTP por email (purpose: login | register | recovery)"""
         pass
\ No newline at end of file
@@ -1,8 +1,9 @@
-from flask import Flask, jsonify, request, session
+from flask import Flask, Blueprint, jsonify, request, session
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 import sys
+import threading
 from datetime import datetime
 
 # 🔧 SOLUCIÓN DE IMPORTACIONES
@@ -37,85 +38,40 @@ except ImportError as e:
     traceback.print_exc()
     
 # Importar casos de uso existentes
-from sms_otp.application.sms_otp_usecases import SendOTPUseCase, VerifyOTPUseCase
-from sms_otp.infrastructure.twilio_sms_adapter import TwilioSMSAdapter
-from shared.models.user_model import UserRepository
-from totp.application.register_user_usecase import RegisterUserUseCase
-from totp.infrastructure.totp_repository import TOTPRepository
+from sms_otp.infrastructure.sms_service_factory import provider_sms_stats
+from email_otp.infrastructure.email_service_factory import provider_email_stats
+from email_otp.infrastructure.email_template_renderer import negotiate_locale
+from shared.database.index_manager import ensure_indexes, print_report
+from shared.database.mongo_connection import MongoDB
+from shared.database.user_cache import UserCache
+from shared.database.shared_ttl_store import SharedTTLStore
+from shared.bootstrap.dependencies import container
+from shared.otp_store.factory import otp_store_stats
+from shared.outbox.notification_outbox import NotificationOutbox, outbox_enabled
+from shared.security.password_hasher import PasswordHasher, PasswordHasherBusyError
+from shared.resilience.circuit_breaker import CircuitBreaker, ProviderUnavailableError
 
-app = Flask(__name__)
+# Rutas propias de main (registro / login unificados, health, etc.)
+auth_bp = Blueprint('auth', __name__)
 
-# 🚨 CORS CRÍTICO - CONFIGURACIÓN COMPLETA PARA VERCEL + RENDER
-CORS(app, 
-    resources={
-        r"/api/*": {
-            "origins": [
-                "http://localhost:*",
-                "http://127.0.0.1:*",
-                "http://localhost:3000",
-                "http://127.0.0.1:3000",
-                "http://localhost:5173",
-                "https://metodos-two.vercel.app",
-                "https://*.vercel.app"
-            ],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-            "supports_credentials": True,
-            "max_age": 3600
-        }
-    }
-)
-
-app.secret_key = os.getenv('SECRET_KEY', 'default-secret-key')
-
-# 🔧 MIDDLEWARE ADICIONAL PARA CORS (por si acaso)
-@app.after_request
-def after_request(response):
-    origin = request.headers.get('Origin')
-    
-    allowed_origins = [
-        'http://localhost:3000',
-        'http://127.0.0.1:3000',
-        'http://localhost:5173',
-        'https://metodos-two.vercel.app'
-    ]
-    
-    # Permitir cualquier subdominio de vercel.app
-    if origin and (origin in allowed_origins or origin.endswith('.vercel.app')):
-        response.headers['Access-Control-Allow-Origin'] = origin
-        response.headers['Access-Control-Allow-Credentials'] = 'true'
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
-        response.headers['Access-Control-Max-Age'] = '3600'
-    
-    return response
-
-# Registrar servicios existentes
-app.register_blueprint(sms_bp, url_prefix='/api/auth/sms')
-app.register_blueprint(totp_bp, url_prefix='/api/auth/totp')
-
-# ✅ Registrar blueprint de Email OTP si está disponible
-if EMAIL_OTP_AVAILABLE:
-    app.register_blueprint(email_otp_blueprint, url_prefix='/api/auth/email')
-    print("✅ Blueprint de Email OTP registrado")
-
-# ✅ Registrar blueprint de Password Recovery
-if PASSWORD_RECOVERY_AVAILABLE:
-    app.register_blueprint(password_recovery_bp)
-    print("✅ Blueprint de Password Recovery registrado en /api/auth/password-recovery/*")
-
-# Inicializar servicios existentes
-user_repo = UserRepository()
-sms_service = TwilioSMSAdapter()
-send_otp_use_case = SendOTPUseCase(sms_service)
-verify_otp_use_case = VerifyOTPUseCase()
-totp_register_usecase = RegisterUserUseCase(TOTPRepository())
+# Servicios del contenedor (las mismas instancias que usan los blueprints), creados en el primer request
+user_repo = container.provider('user_repository')
+# ✅ NOTIFICATION_DELIVERY=outbox: la API solo encola y responde (ver notification_worker.py)
+send_otp_use_case = container.provider('send_otp_use_case')
+verify_otp_use_case = container.provider('verify_otp_use_case')
+totp_register_usecase = container.provider('totp_register_usecase')
+# Adaptador de email con pool keep-alive: uno por worker, no uno por request
+email_otp_usecases = container.provider('email_otp_usecases')
 
-# Solo pending_verifications en memoria (sesiones activas)
-pending_verifications = {}
+# ✅ pending_verifications: TTL + tamaño acotado, compartido entre workers (SQLite)
+pending_verifications = SharedTTLStore(
+    'pending_verifications',
+    ttl_seconds=int(os.getenv('PENDING_VERIFICATION_TTL_SECONDS', '900')),
+    max_entries=int(os.getenv('PENDING_VERIFICATION_MAX_ENTRIES', '10000'))
+)
 
 # ✅ REGISTRO UNIFICADO (existente - SIN CAMBIOS)
-@app.route('/api/auth/register', methods=['POST'])
+@auth_bp.route('/api/auth/register', methods=['POST'])
 def register():
     try:
         data = request.get_json()
@@ -158,12 +114,12 @@ def register():
             user_repo.create_user(user_data)
             print(f"✅ Usuario Email OTP guardado en MongoDB: {email}")
             
-            from email_otp.application.email_otp_usecases import EmailOTPUseCases
-            email_otp_usecases = EmailOTPUseCases()
-            email_result = email_otp_usecases.send_otp(email)
+            email_result = email_otp_usecases.send_otp(
+                email, purpose='register', locale=negotiate_locale(request.headers.get('Accept-Language'))
+            )
             
             if email_result['success']:
-                pending_verifications[email] = email
+                pending_verifications.set(email, email)
                 print(f"✅ OTP enviado exitosamente por email a {email}")
                 
                 return jsonify({
@@ -201,7 +157,7 @@ def register():
             otp_sent = send_otp_use_case.execute(phone_number)
             
             if otp_sent:
-                pending_verifications[email] = phone_number
+                pending_verifications.set(email, phone_number)
                 session['email'] = email
                 session['phone_number'] = phone_number
                 
@@ -230,16 +186,23 @@ def register():
                     'totp_uri': uri,
                     'email': email
                 }), 200
+            except PasswordHasherBusyError:
+                raise
             except Exception as e:
                 print(f"❌ Error en registro TOTP: {e}")
                 return jsonify({'error': 'Failed to register TOTP user'}), 500
         
+    except PasswordHasherBusyError:
+        print("🚨 Registro rechazado: pool de bcrypt saturado")
+        return jsonify({'error': 'Service busy, please retry'}), 503, {'Retry-After': '1'}
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         print(f"❌ Error in register: {e}")
         return jsonify({'error': str(e)}), 500
 
 # ✅ LOGIN UNIFICADO - CORREGIDO PARA CIFRADO
-@app.route('/api/auth/login', methods=['POST'])
+@auth_bp.route('/api/auth/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
@@ -273,12 +236,12 @@ def login():
                 
             print(f"📤 ENVIANDO OTP por email a: {email}")
             
-            from email_otp.application.email_otp_usecases import EmailOTPUseCases
-            email_otp_usecases = EmailOTPUseCases()
-            email_result = email_otp_usecases.send_otp(email)
+            email_result = email_otp_usecases.send_otp(
+                email, purpose='login', locale=negotiate_locale(request.headers.get('Accept-Language'))
+            )
             
             if email_result['success']:
-                pending_verifications[email] = email
+                pending_verifications.set(email, email)
                 print(f"✅ OTP enviado exitosamente por email")
                 
                 return jsonify({
@@ -303,7 +266,7 @@ def login():
             success = send_otp_use_case.execute(phone_number)
             
             if success:
-                pending_verifications[email] = phone_number
+                pending_verifications.set(email, phone_number)
                 print(f"✅ OTP enviado exitosamente")
                 
                 return jsonify({
@@ -318,7 +281,8 @@ def login():
                 return jsonify({'error': 'Failed to send OTP'}), 500
         
         else:  # TOTP
-            requires_otp = bool(user.get('secret'))
+            # El secreto no viaja en find_by_email (no se cachea): se consulta aparte
+            requires_otp = user_repo.has_totp_secret(email)
             
             if not requires_otp:
                 session['email'] = email
@@ -330,12 +294,17 @@ def login():
                 'email': email
             }), 200
         
+    except PasswordHasherBusyError:
+        print("🚨 Login rechazado: pool de bcrypt saturado")
+        return jsonify({'error': 'Service busy, please retry'}), 503, {'Retry-After': '1'}
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         print(f"❌ Error in login: {e}")
         return jsonify({'error': str(e)}), 500
 
 # ✅ RESEND OTP (existente - SIN CAMBIOS)
-@app.route('/api/auth/resend-otp', methods=['POST'])
+@auth_bp.route('/api/auth/resend-otp', methods=['POST'])
 def resend_otp():
     try:
         data = request.get_json()
@@ -344,7 +313,7 @@ def resend_otp():
         if not email:
             return jsonify({'error': 'Email is required'}), 400
         
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_auth_routing(email)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -354,9 +323,9 @@ def resend_otp():
             if not EMAIL_OTP_AVAILABLE:
                 return jsonify({'error': 'Email OTP service is not available'}), 500
                 
-            from email_otp.application.email_otp_usecases import EmailOTPUseCases
-            email_otp_usecases = EmailOTPUseCases()
-            email_result = email_otp_usecases.send_otp(email)
+            email_result = email_otp_usecases.send_otp(
+                email, purpose='login', locale=negotiate_locale(request.headers.get('Accept-Language'))
+            )
             
             if email_result['success']:
                 return jsonify({'message': 'OTP resent successfully to email'}), 200
@@ -364,14 +333,11 @@ def resend_otp():
                 return jsonify({'error': 'Failed to resend OTP email'}), 500
         
         elif auth_method == 'sms':
-            phone_number = None
-            
-            if email in pending_verifications:
-                phone_number = pending_verifications[email]
-            else:
+            phone_number = pending_verifications.get(email)
+            if not phone_number:
                 if user and user.get('phone_number'):
                     phone_number = user['phone_number']
-                    pending_verifications[email] = phone_number
+                    pending_verifications.set(email, phone_number)
                 else:
                     return jsonify({'error': 'No pending verification found for this email'}), 400
             
@@ -384,11 +350,13 @@ def resend_otp():
         else:
             return jsonify({'error': 'Unsupported authentication method'}), 400
             
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # ✅ SMS LOGIN (existente - SIN CAMBIOS)
-@app.route('/api/auth/sms-login', methods=['POST'])
+@auth_bp.route('/api/auth/sms-login', methods=['POST'])
 def sms_login():
     try:
         data = request.get_json()
@@ -397,7 +365,7 @@ def sms_login():
         if not phone_number:
             return jsonify({'error': 'Phone number is required'}), 400
         
-        user = user_repo.find_by_phone(phone_number)
+        user = user_repo.find_by_phone(phone_number, {"_id": 0, "email": 1})
         
         if not user:
             return jsonify({
@@ -410,7 +378,7 @@ def sms_login():
         session.clear()
         session['email'] = email
         session['phone_number'] = phone_number
-        pending_verifications[email] = phone_number
+        pending_verifications.set(email, phone_number)
         
         success = send_otp_use_case.execute(phone_number)
         
@@ -426,11 +394,13 @@ def sms_login():
         else:
             return jsonify({'error': 'Failed to send OTP'}), 500
             
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # ✅ SMS USER INFO (existente - SIN CAMBIOS)
-@app.route('/api/auth/sms/user-info', methods=['GET'])
+@auth_bp.route('/api/auth/sms/user-info', methods=['GET'])
 def sms_user_info():
     try:
         email = request.args.get('email')
@@ -438,7 +408,7 @@ def sms_user_info():
         if not email:
             return jsonify({'error': 'Email parameter is required'}), 400
         
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_profile(email)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -458,7 +428,7 @@ def sms_user_info():
         return jsonify({'error': str(e)}), 500
 
 # ✅ LOGOUT (existente - SIN CAMBIOS)
-@app.route('/api/auth/logout', methods=['POST'])
+@auth_bp.route('/api/auth/logout', methods=['POST'])
 def logout():
     try:
         session.clear()
@@ -469,7 +439,7 @@ def logout():
         return jsonify({'error': str(e)}), 500
 
 # ✅ HOME - ACTUALIZADO con Password Recovery
-@app.route('/')
+@auth_bp.route('/')
 def home():
     endpoints = {
         "sms": {
@@ -481,6 +451,7 @@ def home():
             "setup": "POST /api/auth/totp/setup",
             "qr": "GET /api/auth/totp/qr?email=user@example.com",
             "verify": "POST /api/auth/totp/verify",
+            "verify_batch": "POST /api/auth/totp/verify-batch",
             "user_info": "GET /api/auth/totp/user-info?email=user@example.com"
         },
         "auth": {
@@ -519,7 +490,7 @@ def home():
     })
 
 # ✅ HEALTH CHECK - ACTUALIZADO
-@app.route('/health', methods=['GET'])
+@auth_bp.route('/health', methods=['GET'])
 def health():
     services = ["sms_otp", "totp"]
     if EMAIL_OTP_AVAILABLE:
@@ -527,16 +498,41 @@ def health():
     if PASSWORD_RECOVERY_AVAILABLE:
         services.append("password_recovery")
     
+    # Con un proveedor caído (circuito abierto) el estado pasa a "degraded";
+    # ?strict=true además responde 503 para que el balanceador lo saque de rotación.
+    # En modo outbox los proveedores se llaman desde notification_worker: sus
+    # breakers llegan por el latido que publica en notification_workers
+    circuit_breakers = CircuitBreaker.all_stats()
+    if outbox_enabled():
+        try:
+            circuit_breakers.update(NotificationOutbox.get_instance().worker_circuit_breakers())
+        except Exception as e:
+            print(f"⚠️ No se pudo leer el estado de los workers: {e}")
+    degraded = any(breaker['state'] != 'closed' for breaker in circuit_breakers.values())
+    status_code = 503 if degraded and request.args.get('strict', '').lower() == 'true' else 200
+    
     return jsonify({
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "services": services,
         "port": int(os.environ.get('PORT', 5000)),
         "mongodb": "connected",
-        "cors": "enabled"
-    })
+        "mongodb_pool": MongoDB.pool_stats(),
+        "user_cache": UserCache.get_instance().stats(),
+        "otp_stores": otp_store_stats(),
+        "pending_verifications": pending_verifications.stats(),
+        "notification_outbox": NotificationOutbox.get_instance().stats() if outbox_enabled() else "disabled",
+        "cors": "enabled",
+        "password_hasher": PasswordHasher.get_instance().stats(),
+        "totp_engine": container.resolve('totp_engine').stats(),
+        "qr_cache": container.resolve('qr_image_cache').stats(),
+        "email_provider": (provider_email_stats() or "not initialized") if EMAIL_OTP_AVAILABLE else "disabled",
+        "sms_provider": provider_sms_stats() or "single",
+        "circuit_breakers": circuit_breakers,
+        "dependencies": container.stats()
+    }), status_code
 
 # ✅ USER INFO GENERAL (existente - SIN CAMBIOS)
-@app.route('/api/auth/user-info', methods=['GET'])
+@auth_bp.route('/api/auth/user-info', methods=['GET'])
 def get_user_info():
     try:
         email = request.args.get('email')
@@ -544,7 +540,7 @@ def get_user_info():
         if not email:
             return jsonify({'error': 'Email parameter is required'}), 400
         
-        user = user_repo.find_by_email(email)
+        user = user_repo.find_profile(email)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -561,6 +557,109 @@ def get_user_info():
         print(f"❌ Error in get_user_info: {e}")
         return jsonify({'error': str(e)}), 500
 
+# 🔧 MIDDLEWARE ADICIONAL PARA CORS (por si acaso)
+def after_request(response):
+    origin = request.headers.get('Origin')
+    
+    allowed_origins = [
+        'http://localhost:3000',
+        'http://127.0.0.1:3000',
+        'http://localhost:5173',
+        'https://metodos-two.vercel.app'
+    ]
+    
+    # Permitir cualquier subdominio de vercel.app
+    if origin and (origin in allowed_origins or origin.endswith('.vercel.app')):
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
+        response.headers['Access-Control-Max-Age'] = '3600'
+    
+    return response
+
+# 🔴 CIRCUITO ABIERTO: una sola respuesta para todas las rutas (main y blueprints)
+def provider_unavailable(e):
+    print(f"🔴 {e}")
+    return jsonify({
+        'success': False,
+        'error': 'Notification provider unavailable, please retry'
+    }), 503, {'Retry-After': str(e.retry_after)}
+
+def _ensure_indexes_in_background():
+    """Los índices no bloquean el arranque del worker (idempotente; también disponible como CLI)"""
+    def run():
+        try:
+            print_report(ensure_indexes())
+        except Exception as e:
+            print(f"⚠️ No se pudieron asegurar los índices: {e}")
+    threading.Thread(target=run, name='ensure-indexes', daemon=True).start()
+
+def create_app(eager=None):
+    """
+    Arma la app Flask. Barato a propósito: los repositorios, adaptadores de
+    Twilio / Brevo, el generador de QR y la calibración de bcrypt se crean en
+    el primer request que los usa (ver shared/bootstrap/dependencies.py).
+    APP_EAGER_INIT=true (o eager=True) los construye aquí, p. ej. para calentar
+    un worker antes de recibir tráfico.
+    """
+    app = Flask(__name__)
+    
+    # 🚨 CORS CRÍTICO - CONFIGURACIÓN COMPLETA PARA VERCEL + RENDER
+    CORS(app, 
+        resources={
+            r"/api/*": {
+                "origins": [
+                    "http://localhost:*",
+                    "http://127.0.0.1:*",
+                    "http://localhost:3000",
+                    "http://127.0.0.1:3000",
+                    "http://localhost:5173",
+                    "https://metodos-two.vercel.app",
+                    "https://*.vercel.app"
+                ],
+                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
+                "supports_credentials": True,
+                "max_age": 3600
+            }
+        }
+    )
+    
+    app.secret_key = os.getenv('SECRET_KEY', 'default-secret-key')
+    app.after_request(after_request)
+    app.register_error_handler(ProviderUnavailableError, provider_unavailable)
+    
+    # Registrar servicios existentes
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(sms_bp, url_prefix='/api/auth/sms')
+    app.register_blueprint(totp_bp, url_prefix='/api/auth/totp')
+    
+    # ✅ Registrar blueprint de Email OTP si está disponible
+    if EMAIL_OTP_AVAILABLE:
+        app.register_blueprint(email_otp_blueprint, url_prefix='/api/auth/email')
+        print("✅ Blueprint de Email OTP registrado")
+    
+    # ✅ Registrar blueprint de Password Recovery
+    if PASSWORD_RECOVERY_AVAILABLE:
+        app.register_blueprint(password_recovery_bp)
+        print("✅ Blueprint de Password Recovery registrado en /api/auth/password-recovery/*")
+    
+    # ✅ ÍNDICES
+    if os.getenv('ENSURE_INDEXES_ON_STARTUP', 'true').lower() == 'true':
+        _ensure_indexes_in_background()
+    
+    if eager is None:
+        eager = os.getenv('APP_EAGER_INIT', 'false').lower() == 'true'
+    if eager:
+        container.warm_up()
+        PasswordHasher.get_instance().calibrate()
+    
+    return app
+
+# gunicorn src.main:app (también sirve gunicorn "main:create_app()")
+app = create_app()
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🚀 Servidor de Autenticación Unificado iniciado")
@@ -0,0 +1,146 @@
+"""
+Migración offline de contraseñas en texto plano a bcrypt.
+
+Recorre la colección users en lotes (ordenada por _id), cifra en paralelo con
+todos los núcleos y escribe con bulk_write desordenado. Guarda un checkpoint
+tras cada lote para poder reanudar.
+
+Uso (desde backend/src):
+    python -m migrations.hash_legacy_passwords --batch-size 500 --workers 4
+    python -m migrations.hash_legacy_passwords --resume
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES - Path absoluto desde src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+from dotenv import load_dotenv
+from bson import ObjectId
+from pymongo import UpdateOne
+from shared.database.mongo_connection import MongoDB
+from shared.security.password_hasher import PasswordHasher, _bcrypt_hash
+
+DEFAULT_CHECKPOINT = os.path.join(current_dir, '.hash_legacy_passwords.checkpoint.json')
+
+# Contraseñas que todavía no son hashes bcrypt ($2a$, $2b$, ...)
+LEGACY_FILTER = {'password': {'$type': 'string', '$not': re.compile(r'^\$2')}}
+
+
+def _hash_plaintext(args):
+    password, rounds = args
+    return _bcrypt_hash(password.encode('utf-8'), rounds).decode('utf-8')
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, last_id, totals):
+    with open(path, 'w') as f:
+        json.dump({'last_id': str(last_id), 'totals': totals, 'saved_at': datetime.utcnow().isoformat()}, f)
+
+
+def migrate(batch_size=500, workers=None, checkpoint_path=DEFAULT_CHECKPOINT, resume=False, dry_run=False):
+    users = MongoDB.get_db().users
+    rounds = PasswordHasher.get_instance().rounds
+
+    query = dict(LEGACY_FILTER)
+    totals = {'scanned': 0, 'migrated': 0, 'skipped': 0}
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint:
+        query['_id'] = {'$gt': ObjectId(checkpoint['last_id'])}
+        totals = checkpoint['totals']
+        print(f"⏩ Reanudando desde _id > {checkpoint['last_id']} ({totals['migrated']} ya migradas)")
+
+    print(f"🔄 Migrando contraseñas legacy con bcrypt ({rounds} rounds), lotes de {batch_size}")
+
+    already_migrated = totals['migrated']
+    cursor = users.find(query, projection={'_id': 1, 'password': 1}).sort('_id', 1).batch_size(batch_size)
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batch = []
+        for user in cursor:
+            batch.append(user)
+            if len(batch) >= batch_size:
+                _process_batch(users, executor, batch, rounds, totals, checkpoint_path, dry_run, start)
+                batch = []
+        if batch:
+            _process_batch(users, executor, batch, rounds, totals, checkpoint_path, dry_run, start)
+
+    elapsed = time.perf_counter() - start
+    migrated_now = totals['migrated'] - already_migrated
+    rate = migrated_now / elapsed if elapsed > 0 else 0.0
+    print("=" * 60)
+    print(f"✅ Migración terminada en {elapsed:.1f}s ({migrated_now} en esta corrida)")
+    print(f"   Revisadas: {totals['scanned']}  Migradas: {totals['migrated']}  Omitidas: {totals['skipped']}")
+    print(f"   Throughput: {rate:.1f} contraseñas/s")
+    print("=" * 60)
+    return totals
+
+
+def _process_batch(users, executor, batch, rounds, totals, checkpoint_path, dry_run, start):
+    hashes = list(executor.map(_hash_plaintext, [(user['password'], rounds) for user in batch]))
+    now = datetime.utcnow()
+
+    # El filtro incluye la contraseña original: si el usuario cambió su contraseña
+    # (o la migración perezosa ya corrió) la actualización no pisa nada
+    operations = [
+        UpdateOne(
+            {'_id': user['_id'], 'password': user['password']},
+            {'$set': {'password': hashed, 'updated_at': now}}
+        )
+        for user, hashed in zip(batch, hashes)
+    ]
+
+    modified = 0
+    if not dry_run:
+        result = users.bulk_write(operations, ordered=False)
+        modified = result.modified_count
+
+    totals['scanned'] += len(batch)
+    totals['migrated'] += modified
+    totals['skipped'] += len(batch) - modified
+    if not dry_run:
+        save_checkpoint(checkpoint_path, batch[-1]['_id'], totals)
+
+    elapsed = time.perf_counter() - start
+    rate = totals['scanned'] / elapsed if elapsed > 0 else 0.0
+    print(f"📦 Lote de {len(batch)}: {modified} migradas "
+          f"(total {totals['migrated']}, {rate:.1f} usuarios/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migra contraseñas en texto plano a bcrypt')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--resume', action='store_true', help='Continuar desde el último checkpoint')
+    parser.add_argument('--dry-run', action='store_true', help='Cifrar pero no escribir en MongoDB')
+    args = parser.parse_args()
+
+    load_dotenv()
+    migrate(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        dry_run=args.dry_run
+    )
+
+
+if __name__ == '__main__':
+    main()
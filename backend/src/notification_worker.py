@@ -0,0 +1,196 @@
+"""
+Worker de entrega del outbox de notificaciones (NOTIFICATION_DELIVERY=outbox).
+
+Toma mensajes de notification_outbox con un lease, los entrega en paralelo
+con los adaptadores de siempre (Twilio / Brevo) y marca el resultado:
+enviado, reintento con backoff o dead letter. Se pueden correr varios
+workers a la vez; cada mensaje lo toma uno solo por lease.
+
+Uso (desde backend):
+    python src/notification_worker.py --concurrency 16
+    python src/notification_worker.py --once      # drena lo pendiente y sale
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from dotenv import load_dotenv
+from shared.outbox.notification_outbox import NotificationOutbox, DEAD
+from shared.resilience.circuit_breaker import CircuitBreaker, RecipientRejected
+
+
+class DeliveryMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, status, latency):
+        with self._lock:
+            if status == 'sent':
+                self.sent += 1
+            elif status == DEAD:
+                self.dead += 1
+            else:
+                self.retried += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def snapshot(self):
+        with self._lock:
+            deliveries = self.sent + self.retried + self.dead
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            return {
+                'sent': self.sent,
+                'retried': self.retried,
+                'dead': self.dead,
+                'avg_provider_ms': round(1000 * self.total_latency / deliveries, 1) if deliveries else 0.0,
+                'max_provider_ms': round(1000 * self.max_latency, 1),
+                'sent_per_second': round(self.sent / elapsed, 2)
+            }
+
+
+class NotificationWorker:
+    def __init__(self, outbox=None, concurrency=16, poll_interval=0.5, senders=None, status_interval=None):
+        self.outbox = outbox or NotificationOutbox.get_instance()
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.status_interval = status_interval or float(os.getenv('NOTIFICATION_WORKER_STATUS_SECONDS', '5'))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.metrics = DeliveryMetrics()
+        self._senders = senders or {}
+        self._senders_lock = threading.Lock()
+        self._slots = threading.Semaphore(concurrency)
+        self._stop = threading.Event()
+
+    def _sender(self, channel):
+        """Adaptadores reales, creados al primer uso (un canal sin credenciales no tumba al otro)"""
+        with self._senders_lock:
+            if channel not in self._senders:
+                if channel == 'sms':
+                    from sms_otp.infrastructure.sms_service_factory import provider_sms_service
+                    self._senders[channel] = provider_sms_service().send_otp
+                elif channel == 'email':
+                    # Con BREVO_BATCHING los envíos concurrentes del pool salen en lotes
+                    from email_otp.infrastructure.email_service_factory import provider_email_service
+                    self._senders[channel] = provider_email_service().send_otp_email
+                else:
+                    raise ValueError(f"Canal desconocido: {channel}")
+            return self._senders[channel]
+
+    def deliver(self, message):
+        started = time.monotonic()
+        deliver_before = message.get('deliver_before')
+        if deliver_before and deliver_before <= datetime.utcnow():
+            # Reintento o lease re-tomado cuando el OTP ya venció: no se envía
+            status = self.outbox.mark_failed(message, 'expired before delivery', retryable=False)
+            self.metrics.record(status, time.monotonic() - started)
+            return status
+
+        try:
+            payload = dict(message['payload'])
+            otp = payload.pop('otp')
+            # Email: purpose / locale de la plantilla; SMS no lleva opciones.
+            # Con el circuito abierto (ProviderUnavailableError) se reprograma con backoff
+            delivered = self._sender(message['channel'])(message['recipient'], otp, **payload)
+            error = None if delivered else 'provider rejected the message'
+        except Exception as e:
+            delivered, error = False, str(e)
+
+        if delivered:
+            self.outbox.mark_sent(message)
+            status = 'sent'
+        elif isinstance(delivered, RecipientRejected):
+            # Número / email inválido: reintentar no cambia nada
+            status = self.outbox.mark_failed(message, f"recipient rejected: {delivered.reason}", retryable=False)
+        else:
+            status = self.outbox.mark_failed(message, error)
+        self.metrics.record(status, time.monotonic() - started)
+        return status
+
+    def _run_slot(self, message):
+        try:
+            self.deliver(message)
+        except Exception as e:
+            # Si falla el update, el lease vence y otro ciclo lo re-toma
+            print(f"❌ Error entregando {message.get('_id')}: {e}")
+        finally:
+            self._slots.release()
+
+    def publish_status(self):
+        try:
+            self.outbox.publish_worker_status(self.worker_id, CircuitBreaker.all_stats(), self.metrics.snapshot())
+        except Exception as e:
+            print(f"⚠️ No se pudo publicar el estado del worker: {e}")
+
+    def _publish_status_forever(self):
+        # Hilo propio: el bucle principal puede quedar bloqueado esperando un slot libre
+        while not self._stop.is_set():
+            self.publish_status()
+            self._stop.wait(self.status_interval)
+
+    def run(self, once=False, report_every=30):
+        print(f"🚚 Worker de notificaciones {self.worker_id} (concurrencia {self.concurrency})")
+        last_report = time.monotonic()
+        if not once:
+            threading.Thread(target=self._publish_status_forever, name='outbox-status', daemon=True).start()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='outbox') as pool:
+            while not self._stop.is_set():
+                # Solo se toman tantos mensajes como slots libres (no se retienen leases)
+                self._slots.acquire()
+                message = self.outbox.claim(self.worker_id)
+                if message is None:
+                    self._slots.release()
+                    if once:
+                        break
+                    self._stop.wait(self.poll_interval)
+                else:
+                    pool.submit(self._run_slot, message)
+
+                if time.monotonic() - last_report >= report_every:
+                    print(f"📊 Outbox: {self.metrics.snapshot()}")
+                    last_report = time.monotonic()
+
+        print(f"📊 Outbox (final): {self.metrics.snapshot()}")
+        if not once:
+            try:
+                self.outbox.remove_worker_status(self.worker_id)
+            except Exception as e:
+                print(f"⚠️ No se pudo borrar el estado del worker: {e}")
+
+    def stop(self, *_):
+        print("🛑 Deteniendo worker de notificaciones...")
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Entrega los mensajes de notification_outbox')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('NOTIFICATION_WORKER_CONCURRENCY', '16')))
+    parser.add_argument('--poll-interval', type=float, default=float(os.getenv('NOTIFICATION_WORKER_POLL_SECONDS', '0.5')))
+    parser.add_argument('--once', action='store_true', help='Drenar lo pendiente y salir')
+    args = parser.parse_args()
+
+    load_dotenv()
+    worker = NotificationWorker(concurrency=args.concurrency, poll_interval=args.poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=args.once)
+
+
+if __name__ == '__main__':
+    main()
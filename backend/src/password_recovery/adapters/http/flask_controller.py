@@ -8,31 +8,22 @@ src_dir = os.path.join(current_dir, '..', '..', '..')
 sys.path.insert(0, src_dir)
 
 # Importaciones con paths absolutos desde src
-from shared.database.mongo_connection import MongoDB
-from email_otp.infrastructure.brevo_email_adapter import BrevoEmailAdapter
-from password_recovery.application.password_recovery_usecases import (
-    RequestPasswordRecoveryUseCase,
-    VerifyRecoveryOTPUseCase,
-    ResetPasswordUseCase
-)
-from password_recovery.infrastructure.password_recovery_repository import PasswordRecoveryRepository
-from shared.models.user_model import UserRepository  # ✅ AGREGAR ESTA IMPORTACIÓN
+from email_otp.infrastructure.email_template_renderer import negotiate_locale
+from shared.security.password_hasher import PasswordHasherBusyError
+from shared.resilience.circuit_breaker import ProviderUnavailableError
+from shared.bootstrap.dependencies import container
 
 # Configuración del Blueprint
 password_recovery_bp = Blueprint('password_recovery', __name__)
 
-# Inicializar dependencias
-db = MongoDB.get_db()
-password_recovery_repo = PasswordRecoveryRepository(db)
-email_adapter = BrevoEmailAdapter()
-
-# ✅ INICIALIZAR UserRepository
-user_repo = UserRepository()
+# Dependencias del contenedor (en el primer request que las usa)
+password_recovery_repo = container.provider('password_recovery_repository')
+user_repo = container.provider('user_repository')
 
 # Casos de uso
-request_recovery_uc = RequestPasswordRecoveryUseCase(password_recovery_repo, email_adapter)
-verify_otp_uc = VerifyRecoveryOTPUseCase(password_recovery_repo)
-reset_password_uc = ResetPasswordUseCase(password_recovery_repo, user_repo)  # ✅ AGREGAR user_repo
+request_recovery_uc = container.provider('request_recovery_usecase')
+verify_otp_uc = container.provider('verify_recovery_otp_usecase')
+reset_password_uc = container.provider('reset_password_usecase')
 
 @password_recovery_bp.route('/api/auth/password-recovery/request', methods=['POST'])
 def request_password_recovery():
@@ -52,7 +43,7 @@ def request_password_recovery():
         print(f"🔐 Solicitud de recuperación para: {email}")
         
         # Ejecutar caso de uso
-        result = request_recovery_uc.execute(email)
+        result = request_recovery_uc.execute(email, locale=negotiate_locale(request.headers.get('Accept-Language')))
         
         if result['success']:
             return jsonify({
@@ -66,6 +57,8 @@ def request_password_recovery():
                 'error': result['error']
             }), 400
             
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         print(f"❌ Error en request_password_recovery: {str(e)}")
         import traceback
@@ -182,6 +175,12 @@ def reset_password():
                 'error': result['error']
             }), 400
             
+    except PasswordHasherBusyError:
+        print("🚨 Reset rechazado: pool de bcrypt saturado")
+        return jsonify({
+            'success': False,
+            'error': 'Servicio ocupado, intenta de nuevo'
+        }), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"❌ Error en reset_password: {str(e)}")
         import traceback
@@ -1,13 +1,16 @@
 import random
 import time
 from datetime import datetime, timedelta
+from shared.security.password_hasher import PasswordHasherBusyError
+from shared.resilience.circuit_breaker import ProviderUnavailableError
+from email_otp.ports.email_service_port import EMAIL_OTP_EXPIRY_MINUTES
 
 class RequestPasswordRecoveryUseCase:
     def __init__(self, password_recovery_repository, email_adapter):
         self.password_recovery_repo = password_recovery_repository
         self.email_adapter = email_adapter
     
-    def execute(self, email):
+    def execute(self, email, locale=None):
         """
         Solicita recuperación de contraseña para un email
         """
@@ -25,7 +28,7 @@ class RequestPasswordRecoveryUseCase:
             
             # 2. Generar código OTP de 6 dígitos
             otp = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-            expires_at = datetime.now() + timedelta(minutes=10)  # Expira en 10 minutos
+            expires_at = datetime.utcnow() + timedelta(minutes=EMAIL_OTP_EXPIRY_MINUTES)  # Expira en 10 minutos
             
             print(f"🔐 OTP generado para {email}: {otp}")
             
@@ -35,7 +38,7 @@ class RequestPasswordRecoveryUseCase:
                 'otp': otp,
                 'expires_at': expires_at,
                 'used': False,
-                'created_at': datetime.now()
+                'created_at': datetime.utcnow()
             }
             
             save_result = self.password_recovery_repo.save_recovery_request(recovery_data)
@@ -47,7 +50,7 @@ class RequestPasswordRecoveryUseCase:
             
             # 4. ✅ USAR EL MÉTODO EXISTENTE send_otp_email()
             print(f"📤 Enviando OTP de recuperación por email a: {email}")
-            email_sent = self.email_adapter.send_otp_email(email, otp)
+            email_sent = self.email_adapter.send_otp_email(email, otp, purpose='recovery', locale=locale)
             
             if not email_sent:
                 print(f"❌ Error al enviar email a: {email}")
@@ -63,6 +66,8 @@ class RequestPasswordRecoveryUseCase:
                 'recovery_token': f"temp_token_{int(time.time())}"  # Token temporal
             }
             
+        except ProviderUnavailableError:
+            raise
         except Exception as e:
             print(f"❌ Error en RequestPasswordRecoveryUseCase: {str(e)}")
             import traceback
@@ -92,7 +97,7 @@ class VerifyRecoveryOTPUseCase:
                 }
             
             # 2. Verificar si el código ha expirado
-            if recovery_request['expires_at'] < datetime.now():
+            if recovery_request['expires_at'] < datetime.utcnow():
                 # Marcar como expirado
                 self.password_recovery_repo.mark_recovery_as_used(email, otp)
                 return {
@@ -143,7 +148,7 @@ class ResetPasswordUseCase:
                     }
             
             # 2. Verificar que el código no haya expirado
-            if recovery_request['expires_at'] < datetime.now():
+            if recovery_request['expires_at'] < datetime.utcnow():
                 self.password_recovery_repo.mark_recovery_as_used(email, otp)
                 return {
                     'success': False,
@@ -170,6 +175,9 @@ class ResetPasswordUseCase:
                 'message': 'Contraseña actualizada correctamente'
             }
             
+        except PasswordHasherBusyError:
+            # El controlador responde 503 para que el cliente reintente
+            raise
         except Exception as e:
             print(f"❌ Error en ResetPasswordUseCase: {str(e)}")
             import traceback
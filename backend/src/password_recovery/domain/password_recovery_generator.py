@@ -19,14 +19,14 @@ class PasswordRecoveryGenerator:
         """
         Genera tiempo de expiración
         """
-        return datetime.now() + timedelta(minutes=minutes)
+        return datetime.utcnow() + timedelta(minutes=minutes)
     
     @staticmethod
     def is_otp_expired(expires_at):
         """
         Verifica si un OTP ha expirado
         """
-        return datetime.now() > expires_at
+        return datetime.utcnow() > expires_at
     
     @staticmethod
     def generate_recovery_token():
@@ -9,12 +9,17 @@ src_dir = os.path.join(current_dir, '..', '..')
 sys.path.insert(0, src_dir)
 
 from shared.database.mongo_connection import MongoDB
+from shared.otp_store.factory import get_otp_store
 
 class PasswordRecoveryRepository:
     def __init__(self, db):
         self.db = db
         self.users_collection = self.db['users']
-        self.password_recovery_collection = self.db['password_recovery']
+        # Backend configurable (OTP_STORE_BACKEND): MongoDB (password_recovery) o memoria.
+        # Se guarda una solicitud por email; la nueva reemplaza a la anterior.
+        self.password_recovery_collection = get_otp_store(
+            'password_recovery', key_field='email', expires_field='expires_at', db=db
+        )
     
     def find_user_by_email(self, email):
         """
@@ -37,16 +42,14 @@ class PasswordRecoveryRepository:
         Guarda una solicitud de recuperación de contraseña
         """
         try:
-            # Eliminar solicitudes anteriores del mismo email
-            self.password_recovery_collection.delete_many({
-                'email': recovery_data['email'],
-                'used': False
-            })
-            
-            # Insertar nueva solicitud
-            result = self.password_recovery_collection.insert_one(recovery_data)
+            # Reemplazar la solicitud anterior del mismo email
+            result = self.password_recovery_collection.put(
+                recovery_data['email'],
+                recovery_data,
+                recovery_data['expires_at']
+            )
             
-            if result.inserted_id:
+            if result:
                 print(f"✅ Solicitud de recuperación guardada para: {recovery_data['email']}")
                 return True
             else:
@@ -62,12 +65,10 @@ class PasswordRecoveryRepository:
         Busca una solicitud de recuperación activa y no expirada
         """
         try:
-            recovery_request = self.password_recovery_collection.find_one({
-                'email': email,
-                'otp': otp,
-                'used': False,
-                'expires_at': {'$gt': datetime.now()}
-            })
+            recovery_request = self.password_recovery_collection.find(
+                email,
+                {'otp': otp, 'used': False}
+            )
             
             if recovery_request:
                 print(f"✅ Solicitud de recuperación activa encontrada para: {email}")
@@ -85,12 +86,10 @@ class PasswordRecoveryRepository:
         Busca una solicitud de recuperación verificada
         """
         try:
-            recovery_request = self.password_recovery_collection.find_one({
-                'email': email,
-                'otp': otp,
-                'used': False,
-                'expires_at': {'$gt': datetime.now()}
-            })
+            recovery_request = self.password_recovery_collection.find(
+                email,
+                {'otp': otp, 'used': False}
+            )
             
             return recovery_request
                 
@@ -103,20 +102,16 @@ class PasswordRecoveryRepository:
         Marca una solicitud de recuperación como usada
         """
         try:
-            result = self.password_recovery_collection.update_one(
-                {
-                    'email': email,
-                    'otp': otp
-                },
+            modified = self.password_recovery_collection.update(
+                email,
+                {'otp': otp},
                 {
-                    '$set': {
-                        'used': True,
-                        'used_at': datetime.now()
-                    }
+                    'used': True,
+                    'used_at': datetime.utcnow()
                 }
             )
             
-            if result.modified_count > 0:
+            if modified:
                 print(f"✅ Solicitud de recuperación marcada como usada para: {email}")
                 return True
             else:
@@ -132,20 +127,16 @@ class PasswordRecoveryRepository:
         Marca una solicitud de recuperación como verificada
         """
         try:
-            result = self.password_recovery_collection.update_one(
+            modified = self.password_recovery_collection.update(
+                email,
+                {'otp': otp},
                 {
-                    'email': email,
-                    'otp': otp
-                },
-                {
-                    '$set': {
-                        'verified': True,
-                        'verified_at': datetime.now()
-                    }
+                    'verified': True,
+                    'verified_at': datetime.utcnow()
                 }
             )
             
-            if result.modified_count > 0:
+            if modified:
                 print(f"✅ Solicitud de recuperación verificada para: {email}")
                 return True
             else:
@@ -174,7 +165,7 @@ class PasswordRecoveryRepository:
                 {
                     '$set': {
                         'password': password_to_save,
-                        'updated_at': datetime.now()
+                        'updated_at': datetime.utcnow()
                     }
                 }
             )
@@ -189,19 +180,3 @@ class PasswordRecoveryRepository:
         except Exception as e:
             print(f"❌ Error actualizando contraseña: {str(e)}")
             return False
-    
-    def cleanup_expired_recovery_requests(self):
-        """
-        Limpia solicitudes de recuperación expiradas
-        """
-        try:
-            result = self.password_recovery_collection.delete_many({
-                'expires_at': {'$lt': datetime.now()}
-            })
-            
-            print(f"🧹 Solicitudes de recuperación expiradas eliminadas: {result.deleted_count}")
-            return result.deleted_count
-            
-        except Exception as e:
-            print(f"❌ Error limpiando solicitudes expiradas: {str(e)}")
-            return 0
\ No newline at end of file
@@ -0,0 +1,169 @@
+import threading
+from contextlib import contextmanager
+from .lazy import Lazy
+
+# Ciclos de vida de un componente
+SINGLETON = 'singleton'      # una instancia por proceso (si se crea antes del fork, los workers la heredan)
+PER_WORKER = 'per_worker'    # una por proceso worker: se recrea tras el fork (clientes HTTP, pools, hilos)
+PER_REQUEST = 'per_request'  # una por request Flask (flask.g); fuera de un request, una nueva en cada resolve
+
+LIFETIMES = (SINGLETON, PER_WORKER, PER_REQUEST)
+
+_G_KEY = '_container_instances'
+
+
+class DependencyCycleError(Exception):
+    pass
+
+
+class _Registration:
+    __slots__ = ('name', 'factory', 'lifetime', 'cell')
+
+    def __init__(self, name, factory, lifetime):
+        self.name = name
+        self.factory = factory
+        self.lifetime = lifetime
+        # Singleton / per-worker: la instancia vive en un Lazy; per-request no se cachea aquí
+        self.cell = None
+
+
+class Provided:
+    """
+    Proxy a un componente del contenedor para declararlo a nivel de módulo
+    (send_otp_uc = container.provider('send_otp_use_case')). Cada acceso
+    resuelve según el ciclo de vida, así que respeta overrides y per-request.
+    """
+    __slots__ = ('_container', '_name')
+
+    def __init__(self, container, name):
+        object.__setattr__(self, '_container', container)
+        object.__setattr__(self, '_name', name)
+
+    def get(self):
+        return self._container.resolve(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.get(), attr, value)
+
+    def __repr__(self):
+        return f"<Provided {self._name}>"
+
+
+class Container:
+    """
+    Contenedor de dependencias: dueño de la creación y el ciclo de vida de
+    adaptadores, repositorios y casos de uso. Las fábricas reciben el
+    contenedor para resolver lo que necesitan; nada se construye hasta el
+    primer resolve (o warm_up). Cada componente singleton / per-worker se
+    guarda en un Lazy, que se encarga de construirlo una vez y de medirlo.
+    """
+
+    def __init__(self):
+        self._registrations = {}
+        self._lock = threading.RLock()
+        self._resolving = threading.local()
+
+    def register(self, name, factory, lifetime=SINGLETON):
+        if lifetime not in LIFETIMES:
+            raise ValueError(f"Ciclo de vida desconocido: {lifetime}")
+        with self._lock:
+            self._registrations[name] = self._registration(name, factory, lifetime)
+
+    def _registration(self, name, factory, lifetime):
+        registration = _Registration(name, factory, lifetime)
+        if lifetime != PER_REQUEST:
+            registration.cell = Lazy(lambda: self._build(registration), f"{name} ({lifetime})",
+                                     per_worker=lifetime == PER_WORKER)
+        return registration
+
+    def provider(self, name):
+        return Provided(self, name)
+
+    def _build(self, registration):
+        stack = getattr(self._resolving, 'stack', None)
+        if stack is None:
+            stack = self._resolving.stack = []
+        if registration.name in stack:
+            raise DependencyCycleError(' → '.join(stack + [registration.name]))
+
+        stack.append(registration.name)
+        try:
+            return registration.factory(self)
+        finally:
+            stack.pop()
+
+    def _resolve_per_request(self, registration):
+        from flask import g, has_request_context
+        if not has_request_context():
+            return self._build(registration)
+        instances = g.get(_G_KEY)
+        if instances is None:
+            instances = {}
+            setattr(g, _G_KEY, instances)
+        if registration.name not in instances:
+            instances[registration.name] = self._build(registration)
+        return instances[registration.name]
+
+    def resolve(self, name):
+        registration = self._registrations.get(name)
+        if registration is None:
+            raise KeyError(f"Dependencia no registrada: {name}")
+
+        if registration.lifetime == PER_REQUEST:
+            return self._resolve_per_request(registration)
+
+        return registration.cell.get()
+
+    def reset(self, name=None):
+        """Descarta instancias cacheadas (todas o una); la próxima resolución las recrea"""
+        with self._lock:
+            for registration in self._registrations.values():
+                if registration.cell is not None and (name is None or registration.name == name):
+                    registration.cell.reset()
+
+    @contextmanager
+    def override(self, name, instance=None, factory=None):
+        """
+        Reemplaza un componente por una instancia (o una fábrica que recibe el
+        contenedor), p. ej. un SMS falso en pruebas. Se descartan las instancias
+        cacheadas para que los casos de uso que dependen de él se reconstruyan.
+        """
+        if factory is None:
+            factory = lambda _: instance
+        with self._lock:
+            previous = self._registrations.get(name)
+            lifetime = previous.lifetime if previous else SINGLETON
+            self._registrations[name] = self._registration(name, factory, lifetime)
+            self.reset()
+        try:
+            yield self.resolve(name)
+        finally:
+            with self._lock:
+                if previous is None:
+                    self._registrations.pop(name, None)
+                else:
+                    self._registrations[name] = self._registration(name, previous.factory, previous.lifetime)
+                self.reset()
+
+    def warm_up(self):
+        """Construye todo lo singleton / per-worker (APP_EAGER_INIT); un error no corta el resto"""
+        for name, registration in list(self._registrations.items()):
+            if registration.lifetime == PER_REQUEST:
+                continue
+            try:
+                self.resolve(name)
+            except Exception as e:
+                print(f"⚠️ No se pudo inicializar {name}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: {
+                    'lifetime': registration.lifetime,
+                    'build_ms': registration.cell.build_ms if registration.cell and registration.cell.built else 'pending'
+                }
+                for name, registration in self._registrations.items()
+            }
@@ -0,0 +1,163 @@
+"""
+Raíz de composición: qué implementación usa cada puerto y cuánto vive.
+
+Todos los blueprints resuelven desde el mismo contenedor, así que hay un solo
+UserRepository, un solo SMSOTPGenerator (y su SMSOTPRepository) y un solo
+EmailOTPUseCases por proceso, en lugar de uno por módulo o por request.
+Los imports van dentro de cada fábrica: importar este módulo no carga Twilio,
+Brevo, Mongo ni qrcode (ver benchmarks/import_time.py).
+
+En pruebas se cambia cualquier pieza sin tocar los blueprints:
+
+    with container.override('sms_service', FakeSMS()):
+        client.post('/api/auth/sms/send-otp', json={...})
+"""
+from shared.bootstrap.container import Container, SINGLETON, PER_WORKER
+
+
+# --- Repositorios (sin estado propio más allá de la conexión compartida de MongoDB) ---
+
+def _user_repository(c):
+    from shared.models.user_model import UserRepository
+    return UserRepository()
+
+
+def _totp_repository(c):
+    from totp.infrastructure.totp_repository import TOTPRepository
+    return TOTPRepository()
+
+
+def _sms_otp_repository(c):
+    from sms_otp.infrastructure.sms_otp_repository import SMSOTPRepository
+    return SMSOTPRepository()
+
+
+def _email_otp_repository(c):
+    from email_otp.infrastructure.email_otp_repository import EmailOTPRepository
+    return EmailOTPRepository()
+
+
+def _password_recovery_repository(c):
+    from shared.database.mongo_connection import MongoDB
+    from password_recovery.infrastructure.password_recovery_repository import PasswordRecoveryRepository
+    return PasswordRecoveryRepository(MongoDB.get_db())
+
+
+# --- Adaptadores de salida (clientes HTTP con pool: uno por worker, nunca heredado del fork) ---
+
+def _sms_service(c):
+    from sms_otp.infrastructure.sms_service_factory import default_sms_service
+    return default_sms_service()
+
+
+def _email_service(c):
+    from email_otp.infrastructure.email_service_factory import default_email_service
+    return default_email_service()
+
+
+def _qr_service(c):
+    # qrcode / PIL solo se cargan cuando hace falta generar el primer QR
+    from totp.adapters.http.qr_generator_adapter import QRGeneratorAdapter
+    return QRGeneratorAdapter()
+
+
+def _qr_image_cache(c):
+    from totp.infrastructure.qr_image_cache import QRImageCache
+    return QRImageCache.get_instance()
+
+
+def _totp_engine(c):
+    from totp.domain.totp_verification_engine import TOTPVerificationEngine
+    return TOTPVerificationEngine.get_instance()
+
+
+# --- Dominio y casos de uso ---
+
+def _sms_otp_generator(c):
+    from sms_otp.domain.sms_otp_generator import SMSOTPGenerator
+    return SMSOTPGenerator(otp_repo=c.resolve('sms_otp_repository'))
+
+
+def _send_otp_use_case(c):
+    from sms_otp.application.sms_otp_usecases import SendOTPUseCase
+    return SendOTPUseCase(c.resolve('sms_service'), c.resolve('sms_otp_generator'))
+
+
+def _verify_otp_use_case(c):
+    from sms_otp.application.sms_otp_usecases import VerifyOTPUseCase
+    return VerifyOTPUseCase(c.resolve('sms_otp_generator'))
+
+
+def _email_otp_usecases(c):
+    from email_otp.application.email_otp_usecases import EmailOTPUseCases
+    return EmailOTPUseCases(c.resolve('email_otp_repository'), c.resolve('email_service'))
+
+
+def _totp_register_usecase(c):
+    from totp.application.register_user_usecase import RegisterUserUseCase
+    return RegisterUserUseCase(c.resolve('totp_repository'))
+
+
+def _generate_qr_usecase(c):
+    from totp.application.generate_qr_usecase import GenerateQRUseCase
+    return GenerateQRUseCase(c.resolve('qr_service'), c.resolve('qr_image_cache'))
+
+
+def _validate_totp_usecase(c):
+    from totp.application.validate_totp_usecase import ValidateTOTPUseCase
+    return ValidateTOTPUseCase(c.resolve('totp_engine'))
+
+
+def _verify_totp_batch_usecase(c):
+    from totp.application.verify_totp_batch_usecase import VerifyTOTPBatchUseCase
+    return VerifyTOTPBatchUseCase(c.resolve('totp_repository'), c.resolve('totp_engine'))
+
+
+def _request_recovery_usecase(c):
+    from password_recovery.application.password_recovery_usecases import RequestPasswordRecoveryUseCase
+    return RequestPasswordRecoveryUseCase(c.resolve('password_recovery_repository'), c.resolve('email_service'))
+
+
+def _verify_recovery_otp_usecase(c):
+    from password_recovery.application.password_recovery_usecases import VerifyRecoveryOTPUseCase
+    return VerifyRecoveryOTPUseCase(c.resolve('password_recovery_repository'))
+
+
+def _reset_password_usecase(c):
+    from password_recovery.application.password_recovery_usecases import ResetPasswordUseCase
+    return ResetPasswordUseCase(c.resolve('password_recovery_repository'), c.resolve('user_repository'))
+
+
+DEFAULT_REGISTRATIONS = (
+    ('user_repository', _user_repository, SINGLETON),
+    ('totp_repository', _totp_repository, SINGLETON),
+    ('sms_otp_repository', _sms_otp_repository, SINGLETON),
+    ('email_otp_repository', _email_otp_repository, SINGLETON),
+    ('password_recovery_repository', _password_recovery_repository, SINGLETON),
+    ('sms_service', _sms_service, PER_WORKER),
+    ('email_service', _email_service, PER_WORKER),
+    ('qr_service', _qr_service, SINGLETON),
+    ('qr_image_cache', _qr_image_cache, SINGLETON),
+    ('totp_engine', _totp_engine, SINGLETON),
+    ('sms_otp_generator', _sms_otp_generator, SINGLETON),
+    ('send_otp_use_case', _send_otp_use_case, PER_WORKER),
+    ('verify_otp_use_case', _verify_otp_use_case, SINGLETON),
+    ('email_otp_usecases', _email_otp_usecases, PER_WORKER),
+    ('totp_register_usecase', _totp_register_usecase, SINGLETON),
+    ('generate_qr_usecase', _generate_qr_usecase, SINGLETON),
+    ('validate_totp_usecase', _validate_totp_usecase, SINGLETON),
+    ('verify_totp_batch_usecase', _verify_totp_batch_usecase, SINGLETON),
+    ('request_recovery_usecase', _request_recovery_usecase, PER_WORKER),
+    ('verify_recovery_otp_usecase', _verify_recovery_otp_usecase, SINGLETON),
+    ('reset_password_usecase', _reset_password_usecase, SINGLETON),
+)
+
+
+def register_defaults(target):
+    for name, factory, lifetime in DEFAULT_REGISTRATIONS:
+        target.register(name, factory, lifetime)
+    return target
+
+
+# Contenedor del proceso: lo comparten main.py y todos los blueprints
+container = register_defaults(Container())
@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+
+
+class Lazy:
+    """
+    Dependencia construida en el primer uso: cualquier atributo se delega al
+    objeto real, que se crea una sola vez (thread-safe). Importar el módulo que
+    la declara no toca Twilio, Brevo, Mongo ni bcrypt.
+
+    Con per_worker=True se reconstruye en cada proceso: lo creado antes del
+    fork de gunicorn no se reutiliza en los workers (sesiones HTTP, pools).
+    Es la celda con la que el contenedor guarda sus instancias singleton /
+    per-worker (ver container.py).
+    """
+
+    def __init__(self, factory, name=None, per_worker=False):
+        self._factory = factory
+        self._name = name or getattr(factory, '__qualname__', repr(factory))
+        self._per_worker = per_worker
+        # (instancia, pid) en una sola tupla: un lector sin lock nunca ve una a medias
+        self._cell = None
+        self._build_ms = None
+        # Reentrante: una fábrica que se pide a sí misma llega al detector de ciclos del contenedor
+        self._lock = threading.RLock()
+
+    def _current(self):
+        cell = self._cell
+        if cell is not None and (not self._per_worker or cell[1] == os.getpid()):
+            return cell
+        return None
+
+    def get(self):
+        cell = self._current()
+        if cell is None:
+            with self._lock:
+                cell = self._current()
+                if cell is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    self._build_ms = round((time.perf_counter() - started) * 1000, 2)
+                    cell = self._cell = (instance, os.getpid())
+                    print(f"🧩 {self._name} inicializado ({self._build_ms} ms)")
+        return cell[0]
+
+    def reset(self):
+        """Descarta la instancia; el próximo get la vuelve a crear"""
+        with self._lock:
+            self._cell = None
+
+    @property
+    def built(self):
+        return self._current() is not None
+
+    @property
+    def build_ms(self):
+        return self._build_ms if self.built else None
+
+    def __getattr__(self, attr):
+        # Solo llega aquí lo que no es atributo propio del proxy
+        return getattr(self.get(), attr)
+
+    def __setattr__(self, attr, value):
+        # Los atributos del proxy empiezan con "_"; el resto va al objeto real
+        if attr.startswith('_'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self.get(), attr, value)
+
+    def __repr__(self):
+        return f"<Lazy {self._name} {'built' if self.built else 'pending'}>"
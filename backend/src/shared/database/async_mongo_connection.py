@@ -0,0 +1,38 @@
+import asyncio
+import os
+from motor.motor_asyncio import AsyncIOMotorClient
+from shared.database.mongo_connection import MongoDB, DB_NAME
+
+
+class AsyncMongoDB:
+    """
+    Versión asíncrona (motor) del gestor de conexión para el entry point ASGI.
+    Un cliente por proceso y por event loop, con las mismas opciones de pool
+    y timeouts que MongoDB (variables MONGO_*).
+    """
+    _clients = {}
+
+    @staticmethod
+    def _key():
+        return os.getpid(), id(asyncio.get_running_loop())
+
+    @staticmethod
+    def get_client():
+        key = AsyncMongoDB._key()
+        client = AsyncMongoDB._clients.get(key)
+        if client is None:
+            mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/metodos")
+            print(f"🔗 Conectando a MongoDB (async, pid {os.getpid()}): {mongo_uri}")
+            client = AsyncIOMotorClient(mongo_uri, **MongoDB._client_options())
+            AsyncMongoDB._clients[key] = client
+        return client
+
+    @staticmethod
+    def get_db():
+        return AsyncMongoDB.get_client()[DB_NAME]
+
+    @staticmethod
+    def close():
+        for client in AsyncMongoDB._clients.values():
+            client.close()
+        AsyncMongoDB._clients.clear()
@@ -0,0 +1,45 @@
+from flask import g, has_request_context
+
+_MISSING = object()
+
+
+class UserIdentityMap:
+    """
+    Mapa de identidad por request (unit of work) para documentos de usuario.
+    Dentro de un mismo request cada email se lee de MongoDB una sola vez;
+    fuera de un request (scripts, CLI) no guarda nada.
+    """
+    _G_KEY = '_user_identity_map'
+
+    @staticmethod
+    def _store():
+        if not has_request_context():
+            return None
+        store = g.get(UserIdentityMap._G_KEY)
+        if store is None:
+            store = {}
+            setattr(g, UserIdentityMap._G_KEY, store)
+        return store
+
+    @staticmethod
+    def get(email):
+        """Devuelve (encontrado, documento); el documento puede ser None si no existe el usuario"""
+        store = UserIdentityMap._store()
+        if store is None:
+            return False, None
+        user = store.get(email, _MISSING)
+        if user is _MISSING:
+            return False, None
+        return True, user
+
+    @staticmethod
+    def put(email, user):
+        store = UserIdentityMap._store()
+        if store is not None:
+            store[email] = user
+
+    @staticmethod
+    def evict(email):
+        store = UserIdentityMap._store()
+        if store is not None:
+            store.pop(email, None)
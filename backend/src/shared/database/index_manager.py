@@ -0,0 +1,129 @@
+"""
+Bootstrap idempotente de índices de MongoDB.
+
+Se ejecuta al arrancar la app (ENSURE_INDEXES_ON_STARTUP, por defecto activo)
+o como CLI desde backend/src:
+    python -m shared.database.index_manager           # crea lo que falte
+    python -m shared.database.index_manager --check   # solo reporta
+"""
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES - Path absoluto desde src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..', '..')
+sys.path.insert(0, src_dir)
+
+from shared.database.mongo_connection import MongoDB
+
+# Los TTL usan expireAfterSeconds=0: MongoDB borra el documento en cuanto pasa la
+# fecha guardada en el campo. MongoDB interpreta las fechas sin zona como UTC, así
+# que expires / expires_at se escriben con datetime.utcnow(): con datetime.now()
+# un host con offset negativo vería borrados sus OTP recién creados.
+INDEX_SPECS = {
+    'users': [
+        {'name': 'uniq_email', 'keys': [('email', ASCENDING)], 'unique': True},
+        {'name': 'phone_number', 'keys': [('phone_number', ASCENDING)]},
+    ],
+    'sms_otps': [
+        {'name': 'uniq_phone', 'keys': [('phone', ASCENDING)], 'unique': True},
+        {'name': 'ttl_expires', 'keys': [('expires', ASCENDING)], 'expireAfterSeconds': 0},
+    ],
+    'email_otps': [
+        {'name': 'uniq_email', 'keys': [('email', ASCENDING)], 'unique': True},
+        {'name': 'ttl_expires_at', 'keys': [('expires_at', ASCENDING)], 'expireAfterSeconds': 0},
+    ],
+    'password_recovery': [
+        {
+            'name': 'email_otp_used_expires_at',
+            'keys': [('email', ASCENDING), ('otp', ASCENDING), ('used', ASCENDING), ('expires_at', ASCENDING)]
+        },
+        {'name': 'ttl_expires_at', 'keys': [('expires_at', ASCENDING)], 'expireAfterSeconds': 0},
+    ],
+    'notification_outbox': [
+        {'name': 'status_next_attempt_at', 'keys': [('status', ASCENDING), ('next_attempt_at', ASCENDING)]},
+        {'name': 'status_locked_until', 'keys': [('status', ASCENDING), ('locked_until', ASCENDING)]},
+        {'name': 'status_created_at', 'keys': [('status', ASCENDING), ('created_at', ASCENDING)]},
+        # Solo los enviados tienen purge_at; los dead letter se conservan
+        {'name': 'ttl_purge_at', 'keys': [('purge_at', ASCENDING)], 'expireAfterSeconds': 0},
+    ],
+    'notification_workers': [
+        # Latidos de workers detenidos; /health ya los ignora al vencer expires_at
+        {'name': 'ttl_expires_at', 'keys': [('expires_at', ASCENDING)], 'expireAfterSeconds': 0},
+    ],
+}
+
+
+def _existing_indexes(collection):
+    return {index['name']: index for index in collection.list_indexes()}
+
+
+def ensure_indexes(db=None, check_only=False):
+    """
+    Crea los índices que falten y devuelve el estado de cada uno:
+    'exists', 'created', 'missing' (solo con check_only) o 'error'
+    """
+    db = db if db is not None else MongoDB.get_db()
+    report = []
+
+    for collection_name, specs in INDEX_SPECS.items():
+        collection = db[collection_name]
+        try:
+            existing = _existing_indexes(collection)
+        except OperationFailure:
+            # La colección todavía no existe
+            existing = {}
+
+        for spec in specs:
+            options = {key: value for key, value in spec.items() if key not in ('keys', 'name')}
+            entry = {'collection': collection_name, 'name': spec['name'], 'keys': spec['keys'], **options}
+
+            if spec['name'] in existing:
+                entry['status'] = 'exists'
+            elif check_only:
+                entry['status'] = 'missing'
+            else:
+                try:
+                    collection.create_index(spec['keys'], name=spec['name'], **options)
+                    entry['status'] = 'created'
+                except OperationFailure as e:
+                    # Ej.: duplicados que impiden un índice único u opciones en conflicto
+                    entry['status'] = 'error'
+                    entry['error'] = str(e)
+
+            report.append(entry)
+
+    return report
+
+
+def print_report(report):
+    icons = {'exists': '✅', 'created': '🆕', 'missing': '⚠️', 'error': '❌'}
+    print("=" * 60)
+    print("🗂️ Índices de MongoDB")
+    for entry in report:
+        icon = icons.get(entry['status'], '•')
+        print(f"   {icon} {entry['collection']}.{entry['name']}: {entry['status']}")
+        if entry.get('error'):
+            print(f"      {entry['error']}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crea/verifica los índices de MongoDB')
+    parser.add_argument('--check', action='store_true', help='Solo reportar, no crear')
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    report = ensure_indexes(check_only=args.check)
+    print_report(report)
+    if any(entry['status'] in ('error', 'missing') for entry in report):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,223 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 import os
+import threading
+
+DB_NAME = "metodos"
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Cuenta conexiones abiertas, en uso y en espera (para planear capacidad)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.checkout_failures = 0
+        self.pool_cleared = 0
+
+    def _add(self, field, delta):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + delta)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add('pool_cleared', 1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._add('open', 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add('open', -1)
+
+    def connection_check_out_started(self, event):
+        self._add('waiting', 1)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self._add('checked_out', -1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'open': self.open,
+                'checked_out': self.checked_out,
+                'waiting': self.waiting,
+                'checkout_failures': self.checkout_failures,
+                'pool_cleared': self.pool_cleared
+            }
+
+
+class _ProcessLocalCollection:
+    """
+    Colección que se resuelve contra el cliente del proceso actual.
+    Los repositorios la guardan en __init__ (incluso antes del fork de gunicorn)
+    y cada worker termina usando su propio pool.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._pid = None
+        self._collection = None
+
+    def _resolve(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            self._collection = MongoDB._real_db()[self._name]
+            self._pid = pid
+        return self._collection
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+
+class _ProcessLocalDatabase:
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def _collection(self, name):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.setdefault(name, _ProcessLocalCollection(name))
+        return collection
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._collection(name)
+
+    def __getitem__(self, name):
+        return self._collection(name)
+
 
 class MongoDB:
+    """
+    Gestor de conexión: un MongoClient por proceso, creado perezosamente en el
+    primer uso (después del fork), con pool y timeouts configurables por entorno:
+
+        MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+        MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        MONGO_CONNECT_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS,
+        MONGO_COMPRESSORS (ej. "zstd,snappy,zlib"), MONGO_PING_ON_CONNECT
+    """
     _instance = None
-    
+    _lock = threading.Lock()
+    _db_proxy = _ProcessLocalDatabase()
+
     def __init__(self):
-        if MongoDB._instance is None:
-            # Usar la variable de entorno de Render
-            mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/metodos")
-            print(f"🔗 Conectando a MongoDB: {mongo_uri}")
-            
-            self.client = MongoClient(mongo_uri)
-            self.db = self.client["metodos"]  
-            MongoDB._instance = self
-            
-            # Verificar conexión
+        # Usar la variable de entorno de Render
+        mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/metodos")
+        print(f"🔗 Conectando a MongoDB (pid {os.getpid()}): {mongo_uri}")
+
+        self.pid = os.getpid()
+        self.pool_listener = PoolStatsListener()
+        self.options = MongoDB._client_options()
+
+        self.client = MongoClient(
+            mongo_uri,
+            event_listeners=[self.pool_listener],
+            **self.options
+        )
+        self.db = self.client[DB_NAME]
+
+        # El ping bloquea el arranque; solo si se pide explícitamente
+        if os.getenv("MONGO_PING_ON_CONNECT", "false").lower() == "true":
             try:
                 self.client.admin.command('ping')
                 print("✅ Conexión a MongoDB exitosa")
             except Exception as e:
                 print(f"❌ Error conectando a MongoDB: {e}")
-    
+
+    @staticmethod
+    def _client_options():
+        options = {
+            'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', '20')),
+            'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', '0')),
+            'maxIdleTimeMS': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '60000')),
+            'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000')),
+            'serverSelectionTimeoutMS': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+            'connectTimeoutMS': int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+        }
+        socket_timeout = os.getenv('MONGO_SOCKET_TIMEOUT_MS')
+        if socket_timeout:
+            options['socketTimeoutMS'] = int(socket_timeout)
+        compressors = os.getenv('MONGO_COMPRESSORS')
+        if compressors:
+            options['compressors'] = compressors
+        return options
+
+    @staticmethod
+    def _current():
+        # Si el proceso cambió (fork), se descarta el cliente heredado y se crea uno nuevo
+        instance = MongoDB._instance
+        if instance is None or getattr(instance, 'pid', os.getpid()) != os.getpid():
+            with MongoDB._lock:
+                instance = MongoDB._instance
+                if instance is None or getattr(instance, 'pid', os.getpid()) != os.getpid():
+                    instance = MongoDB()
+                    MongoDB._instance = instance
+        return instance
+
+    @staticmethod
+    def _real_db():
+        return MongoDB._current().db
+
     @staticmethod
     def get_db():
-        if MongoDB._instance is None:
-            MongoDB()
-        return MongoDB._instance.db
\ No newline at end of file
+        """
+        Devuelve la base de datos del proceso actual. Las colecciones obtenidas
+        de aquí siguen siendo válidas después del fork.
+        """
+        return MongoDB._db_proxy
+
+    @staticmethod
+    def get_client():
+        return MongoDB._current().client
+
+    @staticmethod
+    def ping():
+        try:
+            MongoDB.get_client().admin.command('ping')
+            return True
+        except Exception as e:
+            print(f"❌ Error conectando a MongoDB: {e}")
+            return False
+
+    @staticmethod
+    def pool_stats():
+        """Estadísticas del pool del proceso actual (sin abrir conexión si aún no existe)"""
+        instance = MongoDB._instance
+        if instance is None or getattr(instance, 'pid', None) != os.getpid():
+            return {'pid': os.getpid(), 'connected': False}
+        return {
+            'pid': instance.pid,
+            'connected': True,
+            'max_pool_size': instance.options['maxPoolSize'],
+            'wait_queue_timeout_ms': instance.options['waitQueueTimeoutMS'],
+            **instance.pool_listener.snapshot()
+        }
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+class SharedTTLStore:
+    """
+    Diccionario con TTL y tamaño máximo compartido entre los workers de
+    gunicorn de una misma máquina a través de un archivo SQLite (modo WAL).
+
+    - Búsqueda O(1) por clave primaria
+    - Cada entrada expira a los `ttl_seconds`
+    - Al superar `max_entries` se desalojan primero las que vencen antes;
+      la limpieza corre cada `maintenance_every` escrituras, así que el
+      tamaño queda acotado a max_entries + maintenance_every
+    """
+
+    def __init__(self, name, ttl_seconds=900, max_entries=10000, path=None, maintenance_every=64):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.maintenance_every = maintenance_every
+        self.path = path or os.getenv(
+            'SHARED_STORE_PATH',
+            os.path.join(tempfile.gettempdir(), 'auth_shared_store.sqlite3')
+        )
+        self._local = threading.local()
+        self._writes = 0
+        self._metrics_lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'sets': 0, 'expired': 0, 'evicted': 0}
+        self._init_schema()
+
+    def _connection(self):
+        # Una conexión por hilo y por proceso (las conexiones SQLite no sobreviven al fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._connection()
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS "{self.name}" (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.name}_expires_at" ON "{self.name}" (expires_at)')
+
+    def _count(self, metric, amount=1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def get(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            f'SELECT value, expires_at FROM "{self.name}" WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return row[0]
+
+    def set(self, key, value, ttl_seconds=None):
+        expires_at = time.time() + (ttl_seconds or self.ttl_seconds)
+        self._connection().execute(
+            f'INSERT OR REPLACE INTO "{self.name}" (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, value, expires_at)
+        )
+        self._count('sets')
+
+        with self._metrics_lock:
+            self._writes += 1
+            run_maintenance = self._writes % self.maintenance_every == 0
+        if run_maintenance:
+            self.maintenance()
+
+    def delete(self, key):
+        self._connection().execute(f'DELETE FROM "{self.name}" WHERE key = ?', (key,))
+
+    def maintenance(self):
+        """Borra expirados y recorta al tamaño máximo"""
+        conn = self._connection()
+        expired = conn.execute(f'DELETE FROM "{self.name}" WHERE expires_at <= ?', (time.time(),)).rowcount
+        self._count('expired', max(expired, 0))
+
+        size = conn.execute(f'SELECT COUNT(*) FROM "{self.name}"').fetchone()[0]
+        excess = size - self.max_entries
+        if excess > 0:
+            evicted = conn.execute(
+                f'DELETE FROM "{self.name}" WHERE key IN '
+                f'(SELECT key FROM "{self.name}" ORDER BY expires_at LIMIT ?)',
+                (excess,)
+            ).rowcount
+            self._count('evicted', max(evicted, 0))
+
+    def stats(self):
+        size = self._connection().execute(f'SELECT COUNT(*) FROM "{self.name}"').fetchone()[0]
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        return {
+            'backend': 'sqlite',
+            'size': size,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'pid': os.getpid(),
+            **metrics
+        }
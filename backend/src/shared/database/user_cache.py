@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from shared.database.identity_map import UserIdentityMap
+
+FULL_DOCUMENT = 'full'
+
+# Nunca se cachean credenciales: la cache es local a cada worker y forget_user
+# solo limpia el proceso que escribió, así que un hash o secreto TOTP viejo
+# seguiría autenticando en los demás hasta el TTL. Se leen siempre de MongoDB.
+CREDENTIAL_FIELDS = ('password', 'secret')
+
+
+def without_credentials(user):
+    if user is None:
+        return None
+    return {key: value for key, value in user.items() if key not in CREDENTIAL_FIELDS}
+
+
+class UserCache:
+    """
+    Cache read-through de documentos de usuario compartido por todos los
+    repositorios del proceso (UserRepository, TOTPRepository, read models).
+
+    - Tamaño acotado con desalojo LRU (USER_CACHE_MAX_SIZE emails)
+    - TTL por entrada (USER_CACHE_TTL_SECONDS); acota lo desactualizado que
+      puede quedar un worker cuando otro worker escribe el mismo usuario
+    - Por email se guardan el documento completo y cada read model por separado;
+      cualquier escritura invalida todas las vistas de ese email
+    - Sin credenciales: password y secret se descartan al guardar
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_size=None, ttl_seconds=None, enabled=None):
+        self.max_size = max_size or int(os.getenv('USER_CACHE_MAX_SIZE', '2048'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv('USER_CACHE_TTL_SECONDS', '30')
+        )
+        self.enabled = enabled if enabled is not None else (
+            os.getenv('USER_CACHE_ENABLED', 'true').lower() == 'true'
+        )
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def get_instance():
+        if UserCache._instance is None:
+            with UserCache._instance_lock:
+                if UserCache._instance is None:
+                    UserCache._instance = UserCache()
+        return UserCache._instance
+
+    def get(self, email, view=FULL_DOCUMENT):
+        """Copia del documento cacheado o None si no está / expiró"""
+        if not self.enabled or email is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry['expires_at'] <= time.monotonic():
+                del self._entries[email]
+                entry = None
+
+            user = entry['views'].get(view) if entry is not None else None
+            # Un documento completo sirve para cualquier read model
+            if user is None and entry is not None and view != FULL_DOCUMENT:
+                user = entry['views'].get(FULL_DOCUMENT)
+
+            if user is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(email)
+            self.hits += 1
+            # Copia superficial: el llamador puede modificar su dict sin tocar la cache
+            return dict(user)
+
+    def put(self, email, user, view=FULL_DOCUMENT):
+        if not self.enabled or email is None or user is None:
+            return
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry['expires_at'] <= time.monotonic():
+                entry = {'views': {}, 'expires_at': time.monotonic() + self.ttl_seconds}
+                self._entries[email] = entry
+            entry['views'][view] = without_credentials(user)
+            self._entries.move_to_end(email)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, email):
+        with self._lock:
+            if self._entries.pop(email, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+# ✅ Capas de lectura de usuarios: mapa de identidad del request → cache del proceso → MongoDB
+
+def cached_user(email):
+    """Devuelve (encontrado, documento sin credenciales) sin ir a MongoDB"""
+    found, user = UserIdentityMap.get(email)
+    if found:
+        return True, user
+    user = UserCache.get_instance().get(email)
+    if user is not None:
+        UserIdentityMap.put(email, user)
+        return True, user
+    return False, None
+
+
+def remember_user(email, user):
+    user = without_credentials(user)
+    UserIdentityMap.put(email, user)
+    UserCache.get_instance().put(email, user)
+
+
+def forget_user(email):
+    """Invalidar tras cualquier escritura sobre el usuario"""
+    UserIdentityMap.evict(email)
+    UserCache.get_instance().invalidate(email)
@@ -0,0 +1,125 @@
+import asyncio
+import os
+from datetime import datetime
+from shared.database.async_mongo_connection import AsyncMongoDB
+from shared.database.user_cache import cached_user, remember_user, forget_user, UserCache
+from shared.models.user_read_models import READ_MODELS, WITHOUT_CREDENTIALS, PASSWORD_HASH, TOTP_SECRET
+from shared.security.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+
+class AsyncUserRepository:
+    """
+    Variante asíncrona (motor) de UserRepository para las rutas del entry
+    point ASGI. Comparte UserCache y read models con la versión síncrona;
+    bcrypt sigue corriendo en el pool de PasswordHasher vía asyncio.to_thread
+    para no bloquear el event loop.
+    """
+
+    def __init__(self):
+        self.password_hasher = PasswordHasher.get_instance()
+        self.lazy_password_migration = os.getenv('LAZY_PASSWORD_MIGRATION', 'true').lower() == 'true'
+
+    @property
+    def users(self):
+        # La colección depende del event loop en curso (ver AsyncMongoDB)
+        return AsyncMongoDB.get_db().users
+
+    async def _hash_password(self, password):
+        return await asyncio.to_thread(self.password_hasher.hash_password, password)
+
+    async def _check_password(self, plain_password, hashed_password):
+        if not hashed_password:
+            return False
+        try:
+            return await asyncio.to_thread(self.password_hasher.verify_password, plain_password, hashed_password)
+        except PasswordHasherBusyError:
+            raise
+        except Exception:
+            return False
+
+    async def find_by_email(self, email):
+        """Documento sin password ni secret (cacheable), igual que UserRepository"""
+        found, user = cached_user(email)
+        if found:
+            return user
+
+        user = await self.users.find_one({"email": email}, WITHOUT_CREDENTIALS)
+        remember_user(email, user)
+        return user
+
+    async def _find_password_hash(self, email):
+        """Hash vigente, siempre desde MongoDB"""
+        user = await self.users.find_one({"email": email}, PASSWORD_HASH)
+        if not user or not user.get('password'):
+            return None
+
+        current_password = user['password']
+        if self.lazy_password_migration and not current_password.startswith('$2'):
+            print(f"🔄 Migrando contraseña a bcrypt para: {email}")
+            hashed_password = await self._hash_password(current_password)
+            await self.users.update_one(
+                {"email": email, "password": current_password},
+                {"$set": {"password": hashed_password, "updated_at": datetime.utcnow()}}
+            )
+            return hashed_password
+        return current_password
+
+    async def has_totp_secret(self, email):
+        """Si el usuario ya configuró TOTP (lectura aparte: find_by_email no trae el secreto)"""
+        user = await self.users.find_one({"email": email}, TOTP_SECRET)
+        return bool(user and user.get('secret'))
+
+    async def find_by_phone(self, phone, projection=None):
+        return await self.users.find_one({"phone_number": phone}, projection)
+
+    async def _find_read_model(self, email, name):
+        cache = UserCache.get_instance()
+        user = cache.get(email, view=name)
+        if user is not None:
+            return user
+
+        user = await self.users.find_one({'email': email}, READ_MODELS[name])
+        cache.put(email, user, view=name)
+        return user
+
+    async def find_profile(self, email):
+        return await self._find_read_model(email, 'profile')
+
+    async def find_auth_routing(self, email):
+        return await self._find_read_model(email, 'auth_routing')
+
+    async def mark_verified(self, email):
+        """Equivalente a update_user(email, {'verified': True})"""
+        result = await self.users.update_one(
+            {"email": email},
+            {"$set": {"verified": True, "updated_at": datetime.utcnow()}}
+        )
+        forget_user(email)
+        return result
+
+    async def verify_password_for_login(self, email, plain_password):
+        hashed_password = await self._find_password_hash(email)
+        if not hashed_password:
+            return False
+
+        if hashed_password.startswith('$2b$') or hashed_password.startswith('$2a$'):
+            is_valid = await self._check_password(plain_password, hashed_password)
+            if is_valid:
+                await self._rehash_if_needed(email, plain_password, hashed_password)
+            return is_valid
+        else:
+            return plain_password == hashed_password
+
+    async def _rehash_if_needed(self, email, plain_password, hashed_password):
+        if not self.password_hasher.needs_rehash(hashed_password):
+            return
+        try:
+            new_hash = await self._hash_password(plain_password)
+            await self.users.update_one(
+                {"email": email, "password": hashed_password},
+                {"$set": {"password": new_hash, "updated_at": datetime.utcnow()}}
+            )
+            forget_user(email)
+            print(f"🔄 Rehash bcrypt para {email}: {self.password_hasher.rounds} rounds")
+        except PasswordHasherBusyError:
+            print(f"⚠️ Rehash pospuesto para {email}: pool de bcrypt saturado")
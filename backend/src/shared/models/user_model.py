@@ -1,117 +1,37 @@
-import bcrypt
-import html
-import re
+import os
 from datetime import datetime
 from shared.database.mongo_connection import MongoDB
+from shared.database.user_cache import cached_user, remember_user, forget_user
+from shared.models.user_read_models import find_read_model, WITHOUT_CREDENTIALS, PASSWORD_HASH, TOTP_SECRET
+from shared.security.input_sanitizer import sanitize_input
+from shared.security.password_hasher import PasswordHasher, PasswordHasherBusyError
 
 class UserRepository:
     def __init__(self):
         self.db = MongoDB.get_db()
         self.users = self.db.users
+        self.password_hasher = PasswordHasher.get_instance()
+        # Migración perezosa a bcrypt; se apaga tras correr migrations/hash_legacy_passwords.py
+        self.lazy_password_migration = os.getenv('LAZY_PASSWORD_MIGRATION', 'true').lower() == 'true'
     
     def _hash_password(self, password):
-        """Cifra la contraseña usando bcrypt"""
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        """Cifra la contraseña usando bcrypt (en el pool acotado de PasswordHasher)"""
+        return self.password_hasher.hash_password(password)
     
     def _sanitize_input(self, text):
         """
-        Sanitización CORREGIDA - ahora SÍ bloquea atributos HTML peligrosos
+        Sanitización delegada al motor compartido (reglas precompiladas + memo LRU)
         """
-        if not text:
-            return text
-        
-        print(f"🧹 ANTES de sanitizar: '{text}'")
-        
-        # ✅ DETECCIÓN DE PATRONES PELIGROSOS (MEJORADO)
-        critical_patterns = [
-            # Patrones de ejecución
-            r'javascript\s*:',  
-            r'data\s*:',
-            r'vbscript\s*:',
-            r'on\w+\s*=',
-            
-            # ✅ NUEVO: Atributos HTML peligrosos
-            r'\bhref\b',           # Bloquea href
-            r'\bsrc\b',            # Bloquea src  
-            r'\baction\b',         # Bloquea action
-            r'\bformaction\b',     # Bloquea formaction
-            r'\bposter\b',         # Bloquea poster
-            r'\bbackground\b',     # Bloquea background
-            r'\bstyle\b',          # Bloquea style (puede contener expression())
-            
-            # Palabras peligrosas en cualquier parte
-            r'script',
-            r'alert',
-            r'eval',
-            r'expression',
-            r'onload',
-            r'onerror', 
-            r'onclick',
-            r'oninput',
-            r'onmouseover',
-            r'onchange',
-            r'onsubmit',
-            r'onkeydown',
-            r'onkeyup',
-            r'onfocus',
-            r'onblur',
-            r'onmouseenter',
-            r'onmouseleave',
-            r'ondblclick',
-            r'oncontextmenu',
-            r'onpointerenter',
-            r'onauxclick',
-            r'onbeforeinput',
-            r'oncompositionend',
-        ]
-        
-        text_lower = text.lower()
-        for pattern in critical_patterns:
-            if re.search(pattern, text_lower, flags=re.IGNORECASE):
-                print(f"🚫 PATRÓN PELIGROSO DETECTADO: {pattern}")
-                return "***BLOCKED***"
-        
-        # ✅ DETECCIÓN DE MÚLTIPLES PALABRAS PELIGROSAS
-        suspicious_pattern = r'(script|javascript|alert|eval|onload|onerror|onclick|oninput|href|src|action){2,}'
-        if re.search(suspicious_pattern, text, flags=re.IGNORECASE):
-            print(f"⚠️ PATRÓN SOSPECHOSO DETECTADO: Múltiples palabras peligrosas juntas")
-            return "***BLOCKED***"
-        
-        # ✅ ESCAPE HTML (tu lógica original - SE MANTIENE)
-        text = html.escape(text)
-        
-        # ✅ BLOQUEAR PALABRAS PELIGROSAS COMPLETAS (tu lógica original - SE MANTIENE)
-        dangerous_words = [
-            'script', 'javascript', 'alert', 'eval', 
-            'onload', 'onerror', 'onclick', 'oninput', 'onmouseover',
-            'onchange', 'onsubmit', 'onkeydown', 'onkeyup', 'onfocus',
-            'onblur', 'onmouseout', 'onmousemove', 'onmouseenter',
-            'onmouseleave', 'ondblclick', 'oncontextmenu',
-            # ✅ NUEVO: Atributos HTML peligrosos como palabras completas
-            'href', 'src', 'action', 'formaction', 'poster', 'background', 'style'
-        ]
-        
-        for word in dangerous_words:
-            pattern = r'\b' + re.escape(word) + r'\b'
-            text = re.sub(pattern, '***', text, flags=re.IGNORECASE)
-        
-        text = text.strip()
-        
-        print(f"🧹 DESPUÉS de sanitizar: '{text}'")
-        
-        return text
-    
+        return sanitize_input(text)
+
     def _check_password(self, plain_password, hashed_password):
         """Verifica si la contraseña coincide con el hash"""
         if not hashed_password:
             return False
         try:
-            return bcrypt.checkpw(
-                plain_password.encode('utf-8'), 
-                hashed_password.encode('utf-8')
-            )
+            return self.password_hasher.verify_password(plain_password, hashed_password)
+        except PasswordHasherBusyError:
+            raise
         except Exception:
             return False
     
@@ -151,6 +71,7 @@ class UserRepository:
         print("💾 Guardando en MongoDB...")
         
         result = self.users.insert_one(user_data)
+        forget_user(user_data.get('email'))
         
         print(f"✅ Usuario creado con ID: {result.inserted_id}")
         print("=" * 60)
@@ -159,26 +80,54 @@ class UserRepository:
     
     # 🔁 TODOS LOS DEMÁS MÉTODOS SE MANTIENEN EXACTAMENTE IGUAL
     def find_by_email(self, email):
-        user = self.users.find_one({"email": email})
-        
-        if user and 'password' in user:
-            current_password = user['password']
-            if not current_password.startswith('$2'):
-                print(f"🔄 Migrando contraseña a bcrypt para: {email}")
-                hashed_password = self._hash_password(current_password)
-                self.users.update_one(
-                    {"email": email},
-                    {"$set": {"password": hashed_password, "updated_at": datetime.utcnow()}}
-                )
-                user['password'] = hashed_password
-        
+        """Documento del usuario SIN password ni secret (cacheable); las credenciales van por _find_password_hash"""
+        # ✅ Reutilizar el documento ya cargado en este request
+        found, user = cached_user(email)
+        if found:
+            return user
+        
+        user = self.users.find_one({"email": email}, WITHOUT_CREDENTIALS)
+        remember_user(email, user)
         return user
     
-    def find_by_phone(self, phone):
-        return self.users.find_one({"phone_number": phone})
+    def _find_password_hash(self, email):
+        """Hash vigente, siempre desde MongoDB (un reset en otro worker se ve al instante)"""
+        user = self.users.find_one({"email": email}, PASSWORD_HASH)
+        if not user or not user.get('password'):
+            return None
+        
+        current_password = user['password']
+        if self.lazy_password_migration and not current_password.startswith('$2'):
+            print(f"🔄 Migrando contraseña a bcrypt para: {email}")
+            hashed_password = self._hash_password(current_password)
+            self.users.update_one(
+                {"email": email, "password": current_password},
+                {"$set": {"password": hashed_password, "updated_at": datetime.utcnow()}}
+            )
+            return hashed_password
+        return current_password
+    
+    def has_totp_secret(self, email):
+        """Si el usuario ya configuró TOTP; find_by_email no trae el secreto, así que se lee aparte"""
+        user = self.users.find_one({"email": email}, TOTP_SECRET)
+        return bool(user and user.get('secret'))
+    
+    def find_by_phone(self, phone, projection=None):
+        return self.users.find_one({"phone_number": phone}, projection)
+    
+    def find_profile(self, email):
+        """Perfil público (read model PROFILE), sin hash ni secreto"""
+        return find_read_model(self.users, email, 'profile')
+    
+    def find_auth_routing(self, email):
+        """Método de autenticación y teléfono (read model AUTH_ROUTING)"""
+        return find_read_model(self.users, email, 'auth_routing')
     
     def user_exists(self, email):
-        return self.users.find_one({"email": email}) is not None
+        found, user = cached_user(email)
+        if found:
+            return user is not None
+        return self.users.find_one({"email": email}, {"_id": 1}) is not None
     
     def update_user(self, email, update_data):
         """Actualiza usuario, SANITIZANDO y cifrando automáticamente"""
@@ -206,20 +155,40 @@ class UserRepository:
         
         print("=" * 60)
         
-        return self.users.update_one(
+        result = self.users.update_one(
             {"email": email},
             {"$set": update_data}
         )
+        forget_user(email)
+        return result
     
     def verify_password_for_login(self, email, plain_password):
         """Método especial para verificar contraseñas en el login"""
-        user = self.find_by_email(email)
-        if not user or 'password' not in user:
+        hashed_password = self._find_password_hash(email)
+        if not hashed_password:
             return False
         
-        hashed_password = user['password']
-        
         if hashed_password.startswith('$2b$') or hashed_password.startswith('$2a$'):
-            return self._check_password(plain_password, hashed_password)
+            is_valid = self._check_password(plain_password, hashed_password)
+            if is_valid:
+                self._rehash_if_needed(email, plain_password, hashed_password)
+            return is_valid
         else:
-            return plain_password == hashed_password
\ No newline at end of file
+            return plain_password == hashed_password
+    
+    def _rehash_if_needed(self, email, plain_password, hashed_password):
+        """Sube o baja el costo de bcrypt al vigente tras un login exitoso"""
+        if not self.password_hasher.needs_rehash(hashed_password):
+            return
+        try:
+            old_rounds = self.password_hasher.get_rounds(hashed_password)
+            new_hash = self._hash_password(plain_password)
+            self.users.update_one(
+                {"email": email, "password": hashed_password},
+                {"$set": {"password": new_hash, "updated_at": datetime.utcnow()}}
+            )
+            forget_user(email)
+            print(f"🔄 Rehash bcrypt para {email}: {old_rounds} → {self.password_hasher.rounds} rounds")
+        except PasswordHasherBusyError:
+            # El login ya es válido; el rehash se reintenta en el próximo login
+            print(f"⚠️ Rehash pospuesto para {email}: pool de bcrypt saturado")
\ No newline at end of file
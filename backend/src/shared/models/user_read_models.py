@@ -0,0 +1,70 @@
+from shared.database.identity_map import UserIdentityMap
+from shared.database.user_cache import UserCache
+
+# ✅ READ MODELS: proyecciones con nombre para endpoints de solo lectura.
+# Ninguna incluye el hash de la contraseña ni el secreto TOTP.
+
+# Datos públicos del perfil (endpoints /user-info)
+PROFILE = {
+    '_id': 0,
+    'email': 1,
+    'first_name': 1,
+    'phone_number': 1,
+    'auth_method': 1,
+    'verified': 1
+}
+
+# Lo necesario para decidir por dónde enviar el OTP
+AUTH_ROUTING = {
+    '_id': 0,
+    'email': 1,
+    'auth_method': 1,
+    'phone_number': 1
+}
+
+READ_MODELS = {
+    'profile': PROFILE,
+    'auth_routing': AUTH_ROUTING
+}
+
+# ✅ CREDENCIALES: nunca pasan por UserCache (ver CREDENTIAL_FIELDS); cada
+# login / verificación TOTP las lee de MongoDB con estas proyecciones.
+
+# Documento completo menos credenciales (lo que sí se puede cachear)
+WITHOUT_CREDENTIALS = {
+    'password': 0,
+    'secret': 0
+}
+
+# Solo el hash de la contraseña
+PASSWORD_HASH = {
+    '_id': 0,
+    'password': 1
+}
+
+# Solo el secreto TOTP
+TOTP_SECRET = {
+    '_id': 0,
+    'secret': 1
+}
+
+
+def find_read_model(users, email, name):
+    """
+    Busca un usuario con la proyección del read model `name`.
+    Orden: documento ya cargado en el request → cache del proceso → MongoDB
+    con proyección.
+    """
+    found, user = UserIdentityMap.get(email)
+    if found:
+        return user
+
+    # La cache devuelve la vista pedida o, si existe, el documento completo
+    cache = UserCache.get_instance()
+    user = cache.get(email, view=name)
+    if user is not None:
+        return user
+
+    user = users.find_one({'email': email}, READ_MODELS[name])
+    cache.put(email, user, view=name)
+    return user
@@ -0,0 +1,103 @@
+from shared.database.async_mongo_connection import AsyncMongoDB
+from .factory import get_otp_store, _backend_for
+from .mongo_otp_store import build_filter
+
+
+class AsyncMongoOTPStore:
+    """Variante asíncrona (motor) de MongoOTPStore, mismas colecciones y filtros"""
+
+    def __init__(self, collection_name, key_field, expires_field):
+        self.collection_name = collection_name
+        self.key_field = key_field
+        self.expires_field = expires_field
+
+    @property
+    def collection(self):
+        return AsyncMongoDB.get_db()[self.collection_name]
+
+    def _filter(self, key, match=None, only_valid=False, max_attempts=None):
+        return build_filter(self.key_field, self.expires_field, key, match, only_valid, max_attempts)
+
+    async def put(self, key, record, expires_at):
+        document = dict(record)
+        document[self.key_field] = key
+        document[self.expires_field] = expires_at
+        result = await self.collection.replace_one({self.key_field: key}, document, upsert=True)
+        return result.acknowledged
+
+    async def find(self, key, match=None):
+        return await self.collection.find_one(self._filter(key, match, only_valid=True))
+
+    async def update(self, key, match, set_fields):
+        result = await self.collection.update_one(self._filter(key, match), {'$set': set_fields})
+        return result.modified_count > 0
+
+    async def find_one_and_update(self, key, match, set_fields, max_attempts=None):
+        return await self.collection.find_one_and_update(
+            self._filter(key, match, only_valid=True, max_attempts=max_attempts),
+            {'$set': set_fields}
+        )
+
+    async def find_one_and_delete(self, key, match, max_attempts=None):
+        return await self.collection.find_one_and_delete(
+            self._filter(key, match, only_valid=True, max_attempts=max_attempts)
+        )
+
+    async def increment(self, key, field, match=None):
+        result = await self.collection.update_one(self._filter(key, match), {'$inc': {field: 1}})
+        return result.modified_count > 0
+
+    async def delete(self, key):
+        result = await self.collection.delete_many({self.key_field: key})
+        return result.deleted_count > 0
+
+    def stats(self):
+        return {'backend': 'mongo-async', 'collection': self.collection_name}
+
+
+class AsyncOTPStoreAdapter:
+    """
+    Expone un store síncrono en memoria con la interfaz async. Comparte la
+    instancia con las rutas Flask del mismo proceso (operaciones sin I/O).
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    async def put(self, key, record, expires_at):
+        return self.store.put(key, record, expires_at)
+
+    async def find(self, key, match=None):
+        return self.store.find(key, match)
+
+    async def update(self, key, match, set_fields):
+        return self.store.update(key, match, set_fields)
+
+    async def find_one_and_update(self, key, match, set_fields, max_attempts=None):
+        return self.store.find_one_and_update(key, match, set_fields, max_attempts)
+
+    async def find_one_and_delete(self, key, match, max_attempts=None):
+        return self.store.find_one_and_delete(key, match, max_attempts)
+
+    async def increment(self, key, field, match=None):
+        return self.store.increment(key, field, match)
+
+    async def delete(self, key):
+        return self.store.delete(key)
+
+    def stats(self):
+        return self.store.stats()
+
+
+_async_stores = {}
+
+
+def get_async_otp_store(namespace, key_field, expires_field):
+    store = _async_stores.get(namespace)
+    if store is None:
+        if _backend_for(namespace) == 'memory':
+            store = AsyncOTPStoreAdapter(get_otp_store(namespace, key_field, expires_field))
+        else:
+            store = AsyncMongoOTPStore(namespace, key_field, expires_field)
+        _async_stores[namespace] = store
+    return store
@@ -0,0 +1,54 @@
+import atexit
+import os
+import threading
+from .mongo_otp_store import MongoOTPStore
+from .memory_otp_store import InMemoryOTPStore
+
+# OTP_STORE_BACKEND=mongo|memory elige el backend para todo el despliegue;
+# OTP_STORE_BACKEND_<NAMESPACE> (ej. OTP_STORE_BACKEND_SMS_OTPS) lo cambia por colección.
+# Con memory, OTP_STORE_SNAPSHOT_DIR activa snapshot al salir y restore al arrancar.
+
+_stores = {}
+_lock = threading.Lock()
+
+
+def _backend_for(namespace):
+    specific = os.getenv(f"OTP_STORE_BACKEND_{namespace.upper()}")
+    return (specific or os.getenv('OTP_STORE_BACKEND', 'mongo')).lower()
+
+
+def get_otp_store(namespace, key_field, expires_field, db=None):
+    """Devuelve el store (único por proceso) para la colección/namespace indicado"""
+    store = _stores.get(namespace)
+    if store is not None:
+        return store
+
+    with _lock:
+        store = _stores.get(namespace)
+        if store is not None:
+            return store
+
+        backend = _backend_for(namespace)
+        if backend == 'memory':
+            snapshot_dir = os.getenv('OTP_STORE_SNAPSHOT_DIR')
+            snapshot_path = os.path.join(snapshot_dir, f"{namespace}.otp.pickle") if snapshot_dir else None
+            store = InMemoryOTPStore(
+                namespace,
+                key_field,
+                expires_field,
+                tick_seconds=float(os.getenv('OTP_STORE_TICK_SECONDS', '1')),
+                wheel_size=int(os.getenv('OTP_STORE_WHEEL_SIZE', '512')),
+                snapshot_path=snapshot_path
+            )
+            if snapshot_path:
+                atexit.register(store.snapshot)
+            print(f"⚡ OTP store en memoria para '{namespace}'")
+        else:
+            store = MongoOTPStore(namespace, key_field, expires_field, db=db)
+
+        _stores[namespace] = store
+        return store
+
+
+def otp_store_stats():
+    return {namespace: store.stats() for namespace, store in list(_stores.items())}
@@ -0,0 +1,184 @@
+import itertools
+import os
+import pickle
+import threading
+import time
+from datetime import timezone
+from .otp_store_port import OTPStorePort
+from .timer_wheel import HashedTimerWheel
+
+
+def _epoch(expires_at):
+    # Las fechas de expiración se guardan en UTC sin zona (como las devuelve pymongo)
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.timestamp()
+
+
+class InMemoryOTPStore(OTPStorePort):
+    """
+    Implementación en memoria para un solo nodo (o pruebas de carga).
+    La expiración se resuelve con una HashedTimerWheel que se avanza en cada
+    operación; además cada lectura valida la fecha, así que nunca se devuelve
+    un código vencido aunque la rueda vaya atrasada.
+
+    ⚠️ Los datos viven en el proceso: con varios workers de gunicorn el envío
+    y la verificación pueden caer en procesos distintos. Usar con -w 1.
+    """
+
+    def __init__(self, namespace, key_field, expires_field, tick_seconds=1.0,
+                 wheel_size=512, snapshot_path=None):
+        self.namespace = namespace
+        self.key_field = key_field
+        self.expires_field = expires_field
+        self.snapshot_path = snapshot_path
+
+        self._records = {}
+        self._lock = threading.Lock()
+        self._wheel = HashedTimerWheel(tick_seconds=tick_seconds, wheel_size=wheel_size)
+        self._tokens = itertools.count()
+        self.expired = 0
+
+        if snapshot_path:
+            self.restore(snapshot_path)
+
+    # ---------- internos (llamar con el lock tomado) ----------
+
+    def _expire_due(self, now):
+        for key, token in self._wheel.advance(now):
+            entry = self._records.get(key)
+            if entry is not None and entry['token'] == token:
+                del self._records[key]
+                self.expired += 1
+
+    def _valid_entry(self, key, now):
+        entry = self._records.get(key)
+        if entry is None or entry['expires_ts'] <= now:
+            return None
+        return entry
+
+    @staticmethod
+    def _matches(record, match, max_attempts=None):
+        if match and any(record.get(field) != value for field, value in match.items()):
+            return False
+        if max_attempts is not None and record.get('attempts', 0) >= max_attempts:
+            return False
+        return True
+
+    def _store(self, key, record, expires_ts):
+        token = next(self._tokens)
+        self._records[key] = {'record': record, 'expires_ts': expires_ts, 'token': token}
+        self._wheel.schedule(key, expires_ts, token)
+
+    # ---------- puerto ----------
+
+    def put(self, key, record, expires_at):
+        document = dict(record)
+        document[self.key_field] = key
+        document[self.expires_field] = expires_at
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            self._store(key, document, _epoch(expires_at))
+        return True
+
+    def find(self, key, match=None):
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            entry = self._valid_entry(key, now)
+            if entry is None or not self._matches(entry['record'], match):
+                return None
+            return dict(entry['record'])
+
+    def update(self, key, match, set_fields):
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            entry = self._records.get(key)
+            if entry is None or not self._matches(entry['record'], match):
+                return False
+            entry['record'].update(set_fields)
+            return True
+
+    def find_one_and_update(self, key, match, set_fields, max_attempts=None):
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            entry = self._valid_entry(key, now)
+            if entry is None or not self._matches(entry['record'], match, max_attempts):
+                return None
+            original = dict(entry['record'])
+            entry['record'].update(set_fields)
+            return original
+
+    def find_one_and_delete(self, key, match, max_attempts=None):
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            entry = self._valid_entry(key, now)
+            if entry is None or not self._matches(entry['record'], match, max_attempts):
+                return None
+            del self._records[key]
+            return entry['record']
+
+    def increment(self, key, field, match=None):
+        with self._lock:
+            entry = self._records.get(key)
+            if entry is None or not self._matches(entry['record'], match):
+                return False
+            entry['record'][field] = entry['record'].get(field, 0) + 1
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._records.pop(key, None) is not None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'namespace': self.namespace,
+                'records': len(self._records),
+                'scheduled_timers': self._wheel.scheduled,
+                'expired': self.expired
+            }
+
+    # ---------- snapshot / restore ----------
+
+    def snapshot(self, path=None):
+        """Guarda los registros vigentes en disco (escritura atómica)"""
+        path = path or self.snapshot_path
+        if not path:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._expire_due(now)
+            data = {
+                key: {'record': entry['record'], 'expires_ts': entry['expires_ts']}
+                for key, entry in self._records.items()
+                if entry['expires_ts'] > now
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'namespace': self.namespace, 'records': data}, f)
+        os.replace(tmp_path, path)
+        print(f"💾 Snapshot OTP '{self.namespace}': {len(data)} registros → {path}")
+        return len(data)
+
+    def restore(self, path=None):
+        """Carga un snapshot propio, descartando lo que ya expiró"""
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, entry in data.get('records', {}).items():
+                if entry['expires_ts'] > now:
+                    self._store(key, entry['record'], entry['expires_ts'])
+                    restored += 1
+        print(f"📂 Snapshot OTP '{self.namespace}' restaurado: {restored} registros")
+        return restored
@@ -0,0 +1,66 @@
+from datetime import datetime
+from shared.database.mongo_connection import MongoDB
+from .otp_store_port import OTPStorePort
+
+
+def build_filter(key_field, expires_field, key, match=None, only_valid=False, max_attempts=None):
+    """Filtro de MongoDB con el predicado completo (clave, campos, vigencia, intentos)"""
+    query = {key_field: key}
+    if match:
+        query.update(match)
+    if only_valid:
+        query[expires_field] = {'$gt': datetime.utcnow()}
+    if max_attempts is not None:
+        query['attempts'] = {'$not': {'$gte': max_attempts}}
+    return query
+
+
+class MongoOTPStore(OTPStorePort):
+    """Implementación durable: un documento por clave en la colección indicada"""
+
+    def __init__(self, collection_name, key_field, expires_field, db=None):
+        self.db = db if db is not None else MongoDB.get_db()
+        self.collection = self.db[collection_name]
+        self.collection_name = collection_name
+        self.key_field = key_field
+        self.expires_field = expires_field
+
+    def _filter(self, key, match=None, only_valid=False, max_attempts=None):
+        return build_filter(self.key_field, self.expires_field, key, match, only_valid, max_attempts)
+
+    def put(self, key, record, expires_at):
+        document = dict(record)
+        document[self.key_field] = key
+        document[self.expires_field] = expires_at
+        # replace_one: no arrastra campos del registro anterior (used_at, verified...)
+        result = self.collection.replace_one({self.key_field: key}, document, upsert=True)
+        return result.acknowledged
+
+    def find(self, key, match=None):
+        return self.collection.find_one(self._filter(key, match, only_valid=True))
+
+    def update(self, key, match, set_fields):
+        result = self.collection.update_one(self._filter(key, match), {'$set': set_fields})
+        return result.modified_count > 0
+
+    def find_one_and_update(self, key, match, set_fields, max_attempts=None):
+        return self.collection.find_one_and_update(
+            self._filter(key, match, only_valid=True, max_attempts=max_attempts),
+            {'$set': set_fields}
+        )
+
+    def find_one_and_delete(self, key, match, max_attempts=None):
+        return self.collection.find_one_and_delete(
+            self._filter(key, match, only_valid=True, max_attempts=max_attempts)
+        )
+
+    def increment(self, key, field, match=None):
+        result = self.collection.update_one(self._filter(key, match), {'$inc': {field: 1}})
+        return result.modified_count > 0
+
+    def delete(self, key):
+        result = self.collection.delete_many({self.key_field: key})
+        return result.deleted_count > 0
+
+    def stats(self):
+        return {'backend': 'mongo', 'collection': self.collection_name}
@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+
+
+class OTPStorePort(ABC):
+    """
+    Almacén de códigos de vida corta (SMS, email, recuperación de contraseña).
+    Cada registro se identifica por una clave (teléfono o email) y tiene una
+    fecha de expiración; las operaciones find_one_and_* son atómicas.
+    """
+
+    @abstractmethod
+    def put(self, key, record, expires_at):
+        """Guarda (o reemplaza) el registro de la clave"""
+        pass
+
+    @abstractmethod
+    def find(self, key, match=None):
+        """Registro no expirado que coincide con `match`, o None"""
+        pass
+
+    @abstractmethod
+    def update(self, key, match, set_fields):
+        """Actualiza campos si el registro coincide con `match`; True si modificó"""
+        pass
+
+    @abstractmethod
+    def find_one_and_update(self, key, match, set_fields, max_attempts=None):
+        """Actualiza atómicamente un registro vigente que coincide; devuelve el original o None"""
+        pass
+
+    @abstractmethod
+    def find_one_and_delete(self, key, match, max_attempts=None):
+        """Elimina atómicamente un registro vigente que coincide; devuelve el original o None"""
+        pass
+
+    @abstractmethod
+    def increment(self, key, field, match=None):
+        """Incrementa un contador del registro (ej. intentos fallidos); True si había registro"""
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        """Borra el registro de la clave; True si existía"""
+        pass
+
+    @abstractmethod
+    def stats(self):
+        pass
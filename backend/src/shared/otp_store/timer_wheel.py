@@ -0,0 +1,53 @@
+import math
+
+
+class HashedTimerWheel:
+    """
+    Rueda de temporizadores con hash: cada vencimiento cae en el slot
+    (tick % tamaño). Avanzar la rueda solo revisa los slots de los ticks
+    transcurridos, así que expirar cuesta O(vencidos + ocupación del slot)
+    en lugar de recorrer todas las claves.
+
+    No es thread-safe por sí misma; el llamador la protege con su lock.
+    """
+
+    def __init__(self, tick_seconds=1.0, wheel_size=512):
+        self.tick_seconds = tick_seconds
+        self.wheel_size = wheel_size
+        self.slots = [dict() for _ in range(wheel_size)]
+        self.current_tick = None
+        self.scheduled = 0
+
+    def _tick_for(self, timestamp):
+        return int(math.ceil(timestamp / self.tick_seconds))
+
+    def schedule(self, key, expires_at_ts, token):
+        """Programa la clave; `token` identifica la versión del registro"""
+        tick = self._tick_for(expires_at_ts)
+        slot = self.slots[tick % self.wheel_size]
+        if key not in slot:
+            self.scheduled += 1
+        slot[key] = (tick, token)
+
+    def advance(self, now_ts):
+        """Devuelve [(clave, token)] vencidos hasta `now_ts`"""
+        now_tick = self._tick_for(now_ts)
+        if self.current_tick is None:
+            self.current_tick = now_tick - 1
+
+        if now_tick <= self.current_tick:
+            return []
+
+        # Si pasó más de una vuelta completa basta con revisar cada slot una vez
+        first_tick = max(self.current_tick + 1, now_tick - self.wheel_size + 1)
+        expired = []
+        for tick in range(first_tick, now_tick + 1):
+            slot = self.slots[tick % self.wheel_size]
+            due = [key for key, (expiry_tick, _) in slot.items() if expiry_tick <= now_tick]
+            for key in due:
+                _, token = slot.pop(key)
+                self.scheduled -= 1
+                expired.append((key, token))
+
+        self.current_tick = now_tick
+        return expired
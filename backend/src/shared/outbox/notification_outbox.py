@@ -0,0 +1,205 @@
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from shared.database.mongo_connection import MongoDB
+
+COLLECTION_NAME = 'notification_outbox'
+# Latido de cada notification_worker con el estado de sus circuit breakers:
+# en modo outbox los proveedores solo se llaman desde ahí, así que /health lo lee de aquí
+WORKERS_COLLECTION_NAME = 'notification_workers'
+
+# Estados de un mensaje:
+#   pending    → esperando entrega (o un reintento, según next_attempt_at)
+#   processing → tomado por un worker hasta locked_until (si el worker muere, se re-toma)
+#   sent       → entregado; TTL lo borra en purge_at
+#   dead       → sin más reintentos (dead letter), queda para revisión
+PENDING = 'pending'
+PROCESSING = 'processing'
+SENT = 'sent'
+DEAD = 'dead'
+
+
+def outbox_enabled():
+    """NOTIFICATION_DELIVERY=outbox desacopla la API de Twilio/Brevo (requiere el worker)"""
+    return os.getenv('NOTIFICATION_DELIVERY', 'inline').lower() == 'outbox'
+
+
+def build_message(channel, recipient, otp, max_age_seconds=None, **options):
+    """
+    Documento del outbox para un OTP (compartido con los adaptadores async).
+    max_age_seconds es la vida del código: deliver_before nunca la supera, ni
+    tampoco NOTIFICATION_OUTBOX_MAX_AGE_SECONDS.
+    """
+    now = datetime.utcnow()
+    outbox_max_age = int(os.getenv('NOTIFICATION_OUTBOX_MAX_AGE_SECONDS', '600'))
+    max_age_seconds = min(max_age_seconds, outbox_max_age) if max_age_seconds else outbox_max_age
+    return {
+        'channel': channel,
+        'recipient': recipient,
+        # options: propósito / idioma de la plantilla de email
+        'payload': {'otp': otp, **options},
+        'status': PENDING,
+        'attempts': 0,
+        'created_at': now,
+        'next_attempt_at': now,
+        # Un OTP que no se entrega a tiempo ya no sirve: se manda a dead letter
+        'deliver_before': now + timedelta(seconds=max_age_seconds)
+    }
+
+
+class NotificationOutbox:
+    """
+    Outbox de notificaciones en MongoDB. La API solo inserta (enqueue) y
+    responde; el worker (notification_worker.py) toma lotes con un lease,
+    entrega y marca el resultado con reintentos y backoff exponencial.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else MongoDB.get_db()
+        self.collection = self.db[COLLECTION_NAME]
+        self.max_attempts = int(os.getenv('NOTIFICATION_MAX_ATTEMPTS', '5'))
+        self.backoff_base = float(os.getenv('NOTIFICATION_BACKOFF_BASE_SECONDS', '2'))
+        self.backoff_max = float(os.getenv('NOTIFICATION_BACKOFF_MAX_SECONDS', '60'))
+        self.lease_seconds = int(os.getenv('NOTIFICATION_LEASE_SECONDS', '30'))
+        self.sent_retention_seconds = int(os.getenv('NOTIFICATION_SENT_RETENTION_SECONDS', '86400'))
+        self.workers = self.db[WORKERS_COLLECTION_NAME]
+        # Un worker sin latido en este tiempo (caído o detenido) deja de contar en /health
+        self.worker_status_ttl = int(os.getenv('NOTIFICATION_WORKER_STATUS_TTL_SECONDS', '30'))
+
+    @staticmethod
+    def get_instance():
+        if NotificationOutbox._instance is None:
+            with NotificationOutbox._instance_lock:
+                if NotificationOutbox._instance is None:
+                    NotificationOutbox._instance = NotificationOutbox()
+        return NotificationOutbox._instance
+
+    def enqueue(self, channel, recipient, otp, **options):
+        result = self.collection.insert_one(build_message(channel, recipient, otp, **options))
+        print(f"📥 Notificación {channel} encolada para {recipient}")
+        return result.inserted_id
+
+    def claim(self, worker_id):
+        """Toma el siguiente mensaje vencido (o con lease expirado) de forma atómica"""
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {
+                '$or': [
+                    {'status': PENDING, 'next_attempt_at': {'$lte': now}},
+                    {'status': PROCESSING, 'locked_until': {'$lte': now}}
+                ]
+            },
+            {
+                '$set': {
+                    'status': PROCESSING,
+                    'locked_by': worker_id,
+                    'locked_until': now + timedelta(seconds=self.lease_seconds)
+                }
+            },
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_batch(self, worker_id, limit):
+        messages = []
+        for _ in range(limit):
+            message = self.claim(worker_id)
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    def mark_sent(self, message):
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {'_id': message['_id'], 'status': PROCESSING},
+            {
+                '$set': {
+                    'status': SENT,
+                    'sent_at': now,
+                    'purge_at': now + timedelta(seconds=self.sent_retention_seconds)
+                },
+                '$inc': {'attempts': 1},
+                # El código ya no hace falta una vez entregado
+                '$unset': {'payload.otp': '', 'locked_by': '', 'locked_until': ''}
+            }
+        )
+
+    def mark_failed(self, message, error, retryable=True):
+        """
+        Reprograma con backoff exponencial + jitter o manda a dead letter.
+        retryable=False (destinatario rechazado por el proveedor) va directo a dead letter.
+        """
+        now = datetime.utcnow()
+        attempts = message.get('attempts', 0) + 1
+        expired = message.get('deliver_before') and message['deliver_before'] <= now
+
+        if attempts >= self.max_attempts or expired or not retryable:
+            update = {
+                'status': DEAD,
+                'dead_at': now,
+                'last_error': 'expired before delivery' if expired else error
+            }
+            print(f"💀 Notificación {message['_id']} a dead letter: {update['last_error']}")
+        else:
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+            delay = random.uniform(delay / 2, delay)
+            update = {
+                'status': PENDING,
+                'next_attempt_at': now + timedelta(seconds=delay),
+                'last_error': error
+            }
+
+        unset = {'locked_by': '', 'locked_until': ''}
+        if update['status'] == DEAD:
+            # El dead letter queda para revisión, pero sin un código OTP utilizable
+            unset['payload.otp'] = ''
+        self.collection.update_one(
+            {'_id': message['_id'], 'status': PROCESSING},
+            {'$set': {**update, 'attempts': attempts}, '$unset': unset}
+        )
+        return update['status']
+
+    def publish_worker_status(self, worker_id, circuit_breakers, metrics=None):
+        """Latido del worker: estado de sus breakers para el /health de la API"""
+        now = datetime.utcnow()
+        self.workers.update_one(
+            {'_id': worker_id},
+            {
+                '$set': {
+                    'circuit_breakers': circuit_breakers,
+                    'metrics': metrics or {},
+                    'updated_at': now,
+                    'expires_at': now + timedelta(seconds=self.worker_status_ttl)
+                }
+            },
+            upsert=True
+        )
+
+    def remove_worker_status(self, worker_id):
+        self.workers.delete_one({'_id': worker_id})
+
+    def worker_circuit_breakers(self):
+        """Breakers de los workers con latido vigente: '<breaker>@<worker_id>' → stats"""
+        breakers = {}
+        for worker in self.workers.find({'expires_at': {'$gt': datetime.utcnow()}}, {'circuit_breakers': 1}):
+            for name, stats in (worker.get('circuit_breakers') or {}).items():
+                breakers[f"{name}@{worker['_id']}"] = stats
+        return breakers
+
+    def stats(self):
+        counts = {PENDING: 0, PROCESSING: 0, SENT: 0, DEAD: 0}
+        for row in self.collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+            counts[row['_id']] = row['count']
+
+        oldest = self.collection.find_one(
+            {'status': PENDING}, {'created_at': 1}, sort=[('created_at', 1)]
+        )
+        counts['oldest_pending_seconds'] = (
+            round((datetime.utcnow() - oldest['created_at']).total_seconds(), 1) if oldest else 0
+        )
+        return counts
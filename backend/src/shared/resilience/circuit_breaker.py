@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class ProviderUnavailableError(Exception):
+    """El circuito del proveedor está abierto: responder 503 sin llamarlo"""
+
+    def __init__(self, provider, retry_after):
+        super().__init__(f"{provider} unavailable (circuit open)")
+        self.provider = provider
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class RecipientRejected:
+    """
+    Resultado de un envío que el proveedor rechazó por el destinatario (número
+    o email inválido: 4xx distinto de 429). Para quien llama es un False más;
+    el breaker lo cuenta como llamada exitosa porque el proveedor respondió.
+    Así unos cuantos números falsos no abren el circuito para todos.
+    """
+    __slots__ = ('reason',)
+
+    def __init__(self, reason=''):
+        self.reason = reason
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"<RecipientRejected {self.reason}>"
+
+
+# Destinatario / payload inválido: el proveedor funciona y respondió. 401/403
+# (API key revocada, cuenta suspendida) y 429 sí son fallos del proveedor.
+RECIPIENT_ERROR_STATUSES = frozenset({400, 404, 422})
+
+
+def is_recipient_error(status_code):
+    """Rechazo del destinatario o de la petición, no una caída del proveedor"""
+    return status_code in RECIPIENT_ERROR_STATUSES
+
+
+def _succeeded(result):
+    return bool(result) or isinstance(result, RecipientRejected)
+
+
+def circuit_breaker_enabled():
+    return os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+
+
+def _setting(name, key, default):
+    # CIRCUIT_<NOMBRE>_<AJUSTE> gana sobre CIRCUIT_<AJUSTE>
+    return float(os.getenv(f"CIRCUIT_{name.upper()}_{key}", os.getenv(f"CIRCUIT_{key}", default)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker con ventana deslizante por tiempo.
+
+    - closed: se registran éxito/fallo y duración de cada llamada (fallo =
+      excepción o resultado falsy: timeout, sin conexión, 5xx, 429; un
+      RecipientRejected no es fallo del proveedor); con al menos
+      MIN_CALLS en la ventana, se abre si la tasa de error o la de llamadas
+      lentas supera su umbral
+    - open: se rechaza al instante (ProviderUnavailableError) durante OPEN_SECONDS
+    - half_open: pasan HALF_OPEN_PROBES llamadas de prueba; si todas salen
+      bien se cierra, si una falla vuelve a abrirse
+    """
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name, window_seconds=None, min_calls=None, failure_rate=None,
+                 slow_call_seconds=None, slow_rate=None, open_seconds=None, half_open_probes=None):
+        self.name = name
+        self.window_seconds = window_seconds or _setting(name, 'WINDOW_SECONDS', '30')
+        self.min_calls = int(min_calls or _setting(name, 'MIN_CALLS', '10'))
+        self.failure_rate = failure_rate or _setting(name, 'FAILURE_RATE', '0.5')
+        self.slow_call_seconds = slow_call_seconds or _setting(name, 'SLOW_CALL_MS', '5000') / 1000
+        self.slow_rate = slow_rate or _setting(name, 'SLOW_RATE', '0.8')
+        self.open_seconds = open_seconds or _setting(name, 'OPEN_SECONDS', '15')
+        self.half_open_probes = int(half_open_probes or _setting(name, 'HALF_OPEN_PROBES', '1'))
+
+        self._lock = threading.Lock()
+        self._calls = deque()  # (timestamp, ok, duration)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @staticmethod
+    def get(name):
+        """Breaker compartido por nombre dentro del proceso"""
+        breaker = CircuitBreaker._registry.get(name)
+        if breaker is None:
+            with CircuitBreaker._registry_lock:
+                breaker = CircuitBreaker._registry.get(name)
+                if breaker is None:
+                    breaker = CircuitBreaker._registry[name] = CircuitBreaker(name)
+        return breaker
+
+    @staticmethod
+    def all_stats():
+        return {name: breaker.stats() for name, breaker in list(CircuitBreaker._registry.items())}
+
+    # ---------- internos (con el lock tomado) ----------
+
+    def _trim(self, now):
+        limit = now - self.window_seconds
+        while self._calls and self._calls[0][0] < limit:
+            self._calls.popleft()
+
+    def _open(self, now, reason):
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        print(f"🔴 Circuito '{self.name}' abierto: {reason}")
+
+    def _rates(self):
+        total = len(self._calls)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for _, ok, _ in self._calls if not ok)
+        slow = sum(1 for _, _, duration in self._calls if duration >= self.slow_call_seconds)
+        return failures / total, slow / total
+
+    # ---------- API ----------
+
+    def allows_request(self):
+        """
+        ¿Dejaría pasar una llamada ahora? Sin efectos: un circuito abierto cuyo
+        OPEN_SECONDS ya venció cuenta como disponible, para que el siguiente
+        before_call() lo pase a half-open y lo pruebe.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                return self.opened_at + self.open_seconds <= time.monotonic()
+            if self.state == HALF_OPEN:
+                return self._probes_in_flight < self.half_open_probes
+            return True
+
+    def before_call(self):
+        """Reserva el paso o lanza ProviderUnavailableError"""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.opened_at + self.open_seconds - now
+                if remaining > 0:
+                    self.rejected += 1
+                    raise ProviderUnavailableError(self.name, remaining)
+                self.state = HALF_OPEN
+                print(f"🟡 Circuito '{self.name}' en half-open")
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self.rejected += 1
+                    raise ProviderUnavailableError(self.name, self.open_seconds)
+                self._probes_in_flight += 1
+
+    def after_call(self, ok, duration):
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not ok or duration >= self.slow_call_seconds:
+                    self._open(now, 'falló la llamada de prueba')
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    print(f"🟢 Circuito '{self.name}' cerrado")
+                return
+
+            if self.state == OPEN:
+                # Llamada que empezó antes de abrir: no cambia nada
+                return
+
+            self._calls.append((now, ok, duration))
+            self._trim(now)
+            if len(self._calls) >= self.min_calls:
+                failure_rate, slow_rate = self._rates()
+                if failure_rate >= self.failure_rate:
+                    self._open(now, f"tasa de error {failure_rate:.0%}")
+                elif slow_rate >= self.slow_rate:
+                    self._open(now, f"llamadas lentas {slow_rate:.0%}")
+
+    def call(self, func, *args, **kwargs):
+        """Ejecuta func; una excepción o un resultado falsy (salvo RecipientRejected) cuentan como fallo"""
+        self.before_call()
+        started = time.monotonic()
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = _succeeded(result)
+            return result
+        finally:
+            self.after_call(ok, time.monotonic() - started)
+
+    async def call_async(self, func, *args, **kwargs):
+        """Igual que call() para corutinas (adaptadores async)"""
+        self.before_call()
+        started = time.monotonic()
+        ok = False
+        try:
+            result = await func(*args, **kwargs)
+            ok = _succeeded(result)
+            return result
+        finally:
+            self.after_call(ok, time.monotonic() - started)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            failure_rate, slow_rate = self._rates()
+            durations = sorted(duration for _, _, duration in self._calls)
+            p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))] if durations else 0.0
+            return {
+                'state': self.state,
+                'calls_in_window': len(self._calls),
+                'failure_rate': round(failure_rate, 3),
+                'slow_rate': round(slow_rate, 3),
+                'p95_ms': round(p95 * 1000, 1),
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+                'retry_after_seconds': (
+                    round(max(0.0, self.opened_at + self.open_seconds - now), 1) if self.state == OPEN else 0
+                )
+            }
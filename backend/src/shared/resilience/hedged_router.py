@@ -0,0 +1,197 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .circuit_breaker import CircuitBreaker, ProviderUnavailableError, RecipientRejected
+
+
+def parse_provider_weights(spec, default):
+    """'twilio:3,vonage:1' → [('twilio', 3.0), ('vonage', 1.0)]"""
+    providers = []
+    for part in (spec or default).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition(':')
+        providers.append((name.strip().lower(), float(weight or 1)))
+    return providers
+
+
+class ProviderRoute:
+    """Un proveedor dentro del router: peso, breaker propio y latencias recientes"""
+
+    def __init__(self, name, send, weight, breaker):
+        self.name = name
+        self.send = send
+        self.weight = weight
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=256)
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.backup_wins = 0
+
+    def record_backup_win(self):
+        with self._lock:
+            self.backup_wins += 1
+
+    def record(self, ok, duration):
+        with self._lock:
+            self.attempts += 1
+            if ok:
+                self.successes += 1
+                self._latencies.append(duration)
+            else:
+                self.failures += 1
+
+    def p95(self, min_samples):
+        with self._lock:
+            if len(self._latencies) < min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def stats(self):
+        p95 = self.p95(1)
+        with self._lock:
+            return {
+                'weight': self.weight,
+                'attempts': self.attempts,
+                'successes': self.successes,
+                'failures': self.failures,
+                'backup_wins': self.backup_wins,
+                'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+                'circuit': self.breaker.state
+            }
+
+
+class HedgedRouter:
+    """
+    Reparte envíos entre varios proveedores del mismo canal.
+
+    - El primario se elige por peso entre los que aceptan llamadas (circuito
+      cerrado, o abierto con OPEN_SECONDS vencido para la llamada de prueba)
+    - Si el primario no respondió en su p95 (acotado por HEDGE_MIN_MS /
+      HEDGE_MAX_MS), se lanza un intento de cobertura con el siguiente
+    - Si un intento falla, se pasa al siguiente proveedor (failover); un
+      RecipientRejected se devuelve tal cual (otro gateway tampoco lo aceptaría)
+    - Se devuelve un único resultado en cuanto un intento tiene éxito; el que
+      quede en vuelo termina en segundo plano (mismo código OTP, así que un
+      mensaje duplicado no cambia lo que el usuario debe ingresar)
+    """
+
+    def __init__(self, channel, routes, max_hedges=None):
+        self.channel = channel
+        self.routes = routes
+        self.max_hedges = int(max_hedges if max_hedges is not None else os.getenv('HEDGE_MAX_EXTRA_ATTEMPTS', '1'))
+        self.hedge_min = float(os.getenv('HEDGE_MIN_MS', '200')) / 1000
+        self.hedge_max = float(os.getenv('HEDGE_MAX_MS', '5000')) / 1000
+        self.hedge_default = float(os.getenv('HEDGE_DEFAULT_MS', '1500')) / 1000
+        self.min_samples = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv('HEDGE_MAX_WORKERS', '32')),
+            thread_name_prefix=f'hedge-{channel}'
+        )
+        self._lock = threading.Lock()
+        self.hedges = 0
+        self.failovers = 0
+
+    @staticmethod
+    def build(channel, providers, factories):
+        """providers: [(nombre, peso)]; factories: nombre → callable que crea el adaptador"""
+        routes = []
+        for name, weight in providers:
+            if name not in factories:
+                raise ValueError(f"Proveedor {channel} desconocido: {name}")
+            adapter = factories[name]()
+            send = adapter.send_otp if channel == 'sms' else adapter.send_otp_email
+            routes.append(ProviderRoute(name, send, weight, CircuitBreaker.get(f"{channel}_{name}")))
+        return HedgedRouter(channel, routes)
+
+    def _order(self):
+        # allows_request(): un circuito abierto vuelve a la rotación al vencer OPEN_SECONDS (half-open)
+        healthy = [route for route in self.routes if route.breaker.allows_request()]
+        if not healthy:
+            return []
+        primary = random.choices(healthy, weights=[route.weight for route in healthy])[0]
+        rest = sorted((route for route in healthy if route is not primary), key=lambda route: -route.weight)
+        return [primary] + rest
+
+    def _hedge_delay(self, route):
+        p95 = route.p95(self.min_samples)
+        if p95 is None:
+            return self.hedge_default
+        return min(self.hedge_max, max(self.hedge_min, p95))
+
+    def _attempt(self, route, args):
+        started = time.monotonic()
+        result = False
+        try:
+            result = route.breaker.call(route.send, *args)
+        except ProviderUnavailableError:
+            return False
+        except Exception as e:
+            print(f"❌ Proveedor {self.channel}/{route.name} falló: {e}")
+        route.record(bool(result), time.monotonic() - started)
+        return result
+
+    def send(self, *args):
+        order = self._order()
+        if not order:
+            retry_after = min(route.breaker.open_seconds for route in self.routes)
+            raise ProviderUnavailableError(self.channel, retry_after)
+
+        pending = {}
+        next_index = 0
+        hedges_left = self.max_hedges
+
+        def launch():
+            nonlocal next_index
+            route = order[next_index]
+            next_index += 1
+            pending[self._pool.submit(self._attempt, route, args)] = route
+            return route
+
+        current = launch()
+        while pending:
+            can_hedge = hedges_left > 0 and next_index < len(order)
+            done, _ = wait(
+                pending,
+                timeout=self._hedge_delay(current) if can_hedge else None,
+                return_when=FIRST_COMPLETED
+            )
+
+            if not done:
+                # El intento en curso va más lento que su p95: cobertura con el siguiente
+                hedges_left -= 1
+                with self._lock:
+                    self.hedges += 1
+                current = launch()
+                print(f"🏁 Envío {self.channel} cubierto con {current.name}")
+                continue
+
+            for future in done:
+                route = pending.pop(future)
+                result = future.result()
+                if result:
+                    if route is not order[0]:
+                        route.record_backup_win()
+                    return True
+                if isinstance(result, RecipientRejected):
+                    return result
+
+            if not pending and next_index < len(order):
+                with self._lock:
+                    self.failovers += 1
+                current = launch()
+                print(f"🔀 Failover {self.channel} a {current.name}")
+
+        return False
+
+    def stats(self):
+        with self._lock:
+            totals = {'hedges': self.hedges, 'failovers': self.failovers}
+        return {**totals, 'providers': {route.name: route.stats() for route in self.routes}}
@@ -0,0 +1,125 @@
+import html
+import re
+from functools import lru_cache
+
+# ✅ REGLAS DE SANITIZACIÓN (UNA SOLA FUENTE PARA UserRepository Y TOTPRepository)
+BLOCKED_RESULT = "***BLOCKED***"
+REPLACEMENT = "***"
+CACHE_SIZE = 2048
+
+CRITICAL_PATTERNS = [
+    # Patrones de ejecución
+    r'javascript\s*:',
+    r'data\s*:',
+    r'vbscript\s*:',
+    r'on\w+\s*=',
+
+    # Atributos HTML peligrosos
+    r'\bhref\b',
+    r'\bsrc\b',
+    r'\baction\b',
+    r'\bformaction\b',
+    r'\bposter\b',
+    r'\bbackground\b',
+    r'\bstyle\b',
+
+    # Palabras peligrosas en cualquier parte
+    r'script',
+    r'alert',
+    r'eval',
+    r'expression',
+    r'onload',
+    r'onerror',
+    r'onclick',
+    r'oninput',
+    r'onmouseover',
+    r'onchange',
+    r'onsubmit',
+    r'onkeydown',
+    r'onkeyup',
+    r'onfocus',
+    r'onblur',
+    r'onmouseenter',
+    r'onmouseleave',
+    r'ondblclick',
+    r'oncontextmenu',
+    r'onpointerenter',
+    r'onauxclick',
+    r'onbeforeinput',
+    r'oncompositionend',
+]
+
+SUSPICIOUS_PATTERN = r'(script|javascript|alert|eval|onload|onerror|onclick|oninput|href|src|action){2,}'
+
+DANGEROUS_WORDS = [
+    'script', 'javascript', 'alert', 'eval',
+    'onload', 'onerror', 'onclick', 'oninput', 'onmouseover',
+    'onchange', 'onsubmit', 'onkeydown', 'onkeyup', 'onfocus',
+    'onblur', 'onmouseout', 'onmousemove', 'onmouseenter',
+    'onmouseleave', 'ondblclick', 'oncontextmenu',
+    'href', 'src', 'action', 'formaction', 'poster', 'background', 'style'
+]
+
+# 🔧 COMPILACIÓN ÚNICA: cada patrón crítico es un grupo de la alternancia,
+# así m.lastindex indica qué regla disparó el bloqueo
+_critical_re = re.compile(
+    '|'.join(f'({pattern})' for pattern in CRITICAL_PATTERNS),
+    flags=re.IGNORECASE
+)
+_suspicious_re = re.compile(SUSPICIOUS_PATTERN, flags=re.IGNORECASE)
+_dangerous_words_re = re.compile(
+    r'\b(?:' + '|'.join(re.escape(word) for word in DANGEROUS_WORDS) + r')\b',
+    flags=re.IGNORECASE
+)
+
+
+def _sanitize(text):
+    """
+    Aplica las reglas: un escaneo de bloqueo y un escaneo de reemplazo
+    """
+    # ✅ DETECCIÓN DE PATRONES PELIGROSOS (sobre el texto en minúsculas, igual que antes)
+    match = _critical_re.search(text.lower())
+    if match:
+        print(f"🚫 PATRÓN PELIGROSO DETECTADO: {CRITICAL_PATTERNS[match.lastindex - 1]}")
+        return BLOCKED_RESULT
+
+    # ✅ DETECCIÓN DE MÚLTIPLES PALABRAS PELIGROSAS (sobre el texto original)
+    if _suspicious_re.search(text):
+        print("⚠️ PATRÓN SOSPECHOSO DETECTADO: Múltiples palabras peligrosas juntas")
+        return BLOCKED_RESULT
+
+    # ✅ ESCAPE HTML + BLOQUEO DE PALABRAS COMPLETAS EN UNA SOLA PASADA
+    text = html.escape(text)
+    text = _dangerous_words_re.sub(REPLACEMENT, text)
+
+    return text.strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _sanitize_cached(text):
+    return _sanitize(text)
+
+
+def sanitize_input(text, log_prefix=""):
+    """
+    Sanitiza nombres y campos de texto libre antes de guardarlos en MongoDB
+    """
+    if not text:
+        return text
+
+    print(f"🧹 {log_prefix}ANTES de sanitizar: '{text}'")
+
+    # Solo se memorizan cadenas; cualquier otro tipo sigue el camino normal
+    if isinstance(text, str):
+        text = _sanitize_cached(text)
+    else:
+        text = _sanitize(text)
+
+    print(f"🧹 {log_prefix}DESPUÉS de sanitizar: '{text}'")
+
+    return text
+
+
+def cache_info():
+    """Estadísticas del memo LRU (hits, misses, tamaño)"""
+    return _sanitize_cached.cache_info()
@@ -0,0 +1,211 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import bcrypt
+
+
+class PasswordHasherBusyError(Exception):
+    """El pool de bcrypt está saturado; el endpoint debe responder 503"""
+    pass
+
+
+# Funciones a nivel de módulo para que también funcionen con ProcessPoolExecutor
+def _bcrypt_hash(password_bytes, rounds):
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds))
+
+
+def _bcrypt_check(password_bytes, hashed_bytes):
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasher:
+    """
+    Servicio de hashing con pool acotado de workers, cola limitada y métricas
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers=None, max_queue=None, executor_type=None, acquire_timeout=None):
+        self.workers = workers or int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+        self.max_queue = max_queue if max_queue is not None else int(
+            os.getenv('PASSWORD_HASH_MAX_QUEUE', self.workers * 4)
+        )
+        self.executor_type = executor_type or os.getenv('PASSWORD_HASH_EXECUTOR', 'thread')
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else float(
+            os.getenv('PASSWORD_HASH_ACQUIRE_TIMEOUT', '0')
+        )
+
+        # Costo de bcrypt: fijo por PASSWORD_HASH_ROUNDS o calibrado contra el presupuesto de latencia
+        self.target_ms = float(os.getenv('PASSWORD_HASH_TARGET_MS', '250'))
+        self.min_rounds = int(os.getenv('PASSWORD_HASH_MIN_ROUNDS', '10'))
+        self.max_rounds = int(os.getenv('PASSWORD_HASH_MAX_ROUNDS', '14'))
+        configured_rounds = os.getenv('PASSWORD_HASH_ROUNDS')
+        self._rounds = int(configured_rounds) if configured_rounds else None
+        self._calibration = {'source': 'env' if configured_rounds else 'pending'}
+        self._calibration_lock = threading.Lock()
+
+        # En ejecución + en cola; al agotarse se falla rápido en vez de acumular peticiones
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'hash': self._empty_metrics(),
+            'verify': self._empty_metrics()
+        }
+        self._in_flight = 0
+        self._rejected = 0
+
+    @staticmethod
+    def get_instance():
+        if PasswordHasher._instance is None:
+            with PasswordHasher._instance_lock:
+                if PasswordHasher._instance is None:
+                    PasswordHasher._instance = PasswordHasher()
+        return PasswordHasher._instance
+
+    @staticmethod
+    def _empty_metrics():
+        return {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0}
+
+    def _get_executor(self):
+        # Creación perezosa: el pool nace dentro del worker de gunicorn, no antes del fork
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.executor_type == 'process':
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix='bcrypt'
+                        )
+                    print(f"🔐 Pool de bcrypt iniciado: {self.executor_type} x{self.workers} "
+                          f"(cola máx. {self.max_queue})")
+        return self._executor
+
+    @property
+    def rounds(self):
+        """Work factor vigente (calibra en el primer uso si no viene configurado)"""
+        if self._rounds is None:
+            self.calibrate()
+        return self._rounds
+
+    def calibrate(self):
+        """
+        Mide bcrypt con el costo mínimo y extrapola (cada round duplica el tiempo)
+        el mayor costo que cabe en PASSWORD_HASH_TARGET_MS
+        """
+        with self._calibration_lock:
+            if self._rounds is not None:
+                return self._rounds
+
+            start = time.perf_counter()
+            _bcrypt_hash(b'calibration-probe', self.min_rounds)
+            measured_ms = (time.perf_counter() - start) * 1000
+
+            rounds = self.min_rounds
+            if measured_ms > 0 and self.target_ms > measured_ms:
+                rounds += int(math.floor(math.log2(self.target_ms / measured_ms)))
+            rounds = max(self.min_rounds, min(self.max_rounds, rounds))
+
+            self._calibration = {
+                'source': 'calibrated',
+                'probe_rounds': self.min_rounds,
+                'probe_ms': round(measured_ms, 2),
+                'estimated_ms': round(measured_ms * 2 ** (rounds - self.min_rounds), 2)
+            }
+            self._rounds = rounds
+            print(f"⏱️ bcrypt calibrado: {rounds} rounds (~{self._calibration['estimated_ms']} ms, "
+                  f"objetivo {self.target_ms} ms)")
+            return rounds
+
+    @staticmethod
+    def get_rounds(hashed_password):
+        """Lee el costo guardado dentro del hash ($2b$<rounds>$...)"""
+        try:
+            return int(hashed_password.split('$')[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    def needs_rehash(self, hashed_password):
+        """
+        True si el hash se generó con un costo menor al vigente. Solo hacia
+        arriba: cada worker de gunicorn calibra por su cuenta y pueden quedar
+        en costos distintos; con != cada login que cae en otro worker volvería
+        a hashear y escribir en MongoDB.
+        """
+        rounds = self.get_rounds(hashed_password)
+        return rounds is None or rounds < self.rounds
+
+    def _acquire_slot(self):
+        if self.acquire_timeout > 0:
+            return self._slots.acquire(timeout=self.acquire_timeout)
+        return self._slots.acquire(blocking=False)
+
+    def _run(self, operation, fn, *args):
+        if not self._acquire_slot():
+            with self._metrics_lock:
+                self._rejected += 1
+            print(f"🚨 Pool de bcrypt saturado, rechazando operación '{operation}'")
+            raise PasswordHasherBusyError("Password hashing service is busy")
+
+        with self._metrics_lock:
+            self._in_flight += 1
+        start = time.perf_counter()
+        failed = False
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._slots.release()
+            with self._metrics_lock:
+                self._in_flight -= 1
+                metrics = self._metrics[operation]
+                metrics['count'] += 1
+                metrics['total_ms'] += elapsed_ms
+                metrics['last_ms'] = elapsed_ms
+                metrics['max_ms'] = max(metrics['max_ms'], elapsed_ms)
+                if failed:
+                    metrics['errors'] += 1
+
+    def hash_password(self, password):
+        """Cifra la contraseña con bcrypt en el pool"""
+        hashed = self._run('hash', _bcrypt_hash, password.encode('utf-8'), self.rounds)
+        return hashed.decode('utf-8')
+
+    def verify_password(self, plain_password, hashed_password):
+        """Verifica la contraseña contra el hash en el pool"""
+        return self._run(
+            'verify',
+            _bcrypt_check,
+            plain_password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+
+    def stats(self):
+        """Métricas de latencia y saturación (para /health)"""
+        with self._metrics_lock:
+            operations = {}
+            for name, metrics in self._metrics.items():
+                operations[name] = dict(metrics)
+                operations[name]['avg_ms'] = (
+                    metrics['total_ms'] / metrics['count'] if metrics['count'] else 0.0
+                )
+            return {
+                'executor': self.executor_type,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'rejected': self._rejected,
+                'rounds': self._rounds,
+                'target_ms': self.target_ms,
+                'calibration': dict(self._calibration),
+                'operations': operations
+            }
@@ -0,0 +1,88 @@
+"""
+Simulador local de la API transaccional de Brevo (solo lo que usan los adaptadores).
+
+    POST /v3/smtp/email   (header api-key; to + htmlContent, o messageVersions con params)
+
+Responde 201 con messageId (o messageIds para messageVersions). Un destinatario
+sin formato de email hace fallar toda la petición con 400, igual que Brevo.
+
+Uso (desde backend/src):
+    python -m simulators.brevo_simulator --port 4011 --latency-ms 250 --rate-limit 50
+    BREVO_BASE_URL=http://127.0.0.1:4011 gunicorn ...
+"""
+import os
+import re
+import sys
+import uuid
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES - Path absoluto desde src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from simulators.provider_simulator import ProviderSimulator, build_parser, profile_from_args, serve
+
+EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+PARAM = re.compile(r'\{\{\s*params\.(\w+)\s*\}\}')
+ERROR_CODES = {400: 'invalid_parameter', 401: 'unauthorized', 429: 'too_many_requests'}
+
+
+class BrevoSimulator(ProviderSimulator):
+    name = 'brevo'
+
+    def error_response(self, status_code, message):
+        return JSONResponse({'code': ERROR_CODES.get(status_code, 'internal_error'), 'message': message},
+                            status_code=status_code)
+
+    async def send_email(self, request):
+        if not request.headers.get('api-key'):
+            return self.error_response(401, 'Key not found')
+        try:
+            payload = await request.json()
+        except ValueError:
+            return self.error_response(400, 'Invalid JSON')
+
+        if not (payload.get('sender') or {}).get('email'):
+            return self.error_response(400, 'sender is missing')
+        if not payload.get('subject') or not payload.get('htmlContent'):
+            return self.error_response(400, 'subject and htmlContent are required')
+
+        versions = payload.get('messageVersions') or [{'to': payload.get('to') or [], 'params': payload.get('params') or {}}]
+        for version in versions:
+            if not version.get('to'):
+                return self.error_response(400, 'to is missing')
+            for recipient in version['to']:
+                if not EMAIL.match(recipient.get('email', '')):
+                    return self.error_response(400, f"email is not valid in to: {recipient.get('email')}")
+
+        message_ids = []
+        for version in versions:
+            params = version.get('params') or {}
+            # Brevo reemplaza {{params.x}} por destinatario; se guarda el HTML final
+            html = PARAM.sub(lambda m: str(params.get(m.group(1), '')), payload['htmlContent'])
+            message_id = f'<{uuid.uuid4().hex}@smtp-relay.mailin.fr>'
+            message_ids.append(message_id)
+            for recipient in version['to']:
+                self.record_message(message_id=message_id, to=recipient['email'], subject=payload['subject'],
+                                    params=params, html=html)
+
+        if payload.get('messageVersions'):
+            return JSONResponse({'messageIds': message_ids}, status_code=201)
+        return JSONResponse({'messageId': message_ids[0]}, status_code=201)
+
+    def routes(self):
+        async def handler(request):
+            return await self.simulate(self.send_email, request)
+        return [Route('/v3/smtp/email', handler, methods=['POST'])]
+
+
+def main():
+    parser = build_parser('Simulador local de Brevo (email transaccional)', 'BREVO_SIM', '4011')
+    args = parser.parse_args()
+    serve(BrevoSimulator(profile_from_args(args)), args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+
+
+class SimulatorProfile:
+    """
+    Comportamiento del proveedor simulado:
+    - latencia: fixed (= latency_ms), uniform (0..2×latency_ms) o lognormal
+      (mediana latency_ms, cola según latency_sigma)
+    - error_rate: fracción de respuestas 5xx
+    - hang_rate: fracción de llamadas que se cuelgan hang_seconds (timeouts del cliente)
+    - rate_limit: peticiones/segundo (token bucket con burst); el exceso recibe 429
+    """
+
+    def __init__(self, latency_ms=100.0, latency_dist='lognormal', latency_sigma=0.5,
+                 error_rate=0.0, hang_rate=0.0, hang_seconds=30.0, rate_limit=0.0, burst=None, seed=None):
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Distribución de latencia desconocida: {latency_dist}")
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.rate_limit = rate_limit
+        self.burst = burst or max(1, int(math.ceil(rate_limit)))
+        self.random = random.Random(seed)
+
+    def latency(self):
+        base = self.latency_ms / 1000
+        if self.latency_dist == 'fixed':
+            return base
+        if self.latency_dist == 'uniform':
+            return self.random.uniform(0, 2 * base)
+        return base * math.exp(self.latency_sigma * self.random.gauss(0, 1))
+
+    def to_dict(self):
+        return {
+            'latency_ms': self.latency_ms,
+            'latency_dist': self.latency_dist,
+            'latency_sigma': self.latency_sigma,
+            'error_rate': self.error_rate,
+            'hang_rate': self.hang_rate,
+            'hang_seconds': self.hang_seconds,
+            'rate_limit': self.rate_limit,
+            'burst': self.burst
+        }
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """True si hay cupo; si no, segundos hasta el próximo token"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True, 0.0
+            return False, (1 - self.tokens) / self.rate
+
+
+class ProviderSimulator:
+    """
+    Base de los simuladores: aplica el perfil (rate limit → cuelgue → latencia → error)
+    antes de dar la respuesta del proveedor, y guarda los últimos mensajes aceptados
+    para que el harness de carga pueda leer los OTP (GET /__messages).
+    """
+    name = 'provider'
+
+    def __init__(self, profile: SimulatorProfile, keep_messages=1000):
+        self.profile = profile
+        self.bucket = TokenBucket(profile.rate_limit, profile.burst) if profile.rate_limit > 0 else None
+        self.messages = deque(maxlen=keep_messages)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=10000)
+        self.counters = {'requests': 0, 'accepted': 0, 'rejected': 0, 'errors': 0, 'rate_limited': 0, 'hung': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def error_response(self, status_code, message):
+        """Cuerpo de error con el formato del proveedor"""
+        return JSONResponse({'message': message}, status_code=status_code)
+
+    async def simulate(self, handler, request):
+        self._count('requests')
+        started = time.monotonic()
+
+        if self.bucket is not None:
+            allowed, wait_seconds = self.bucket.take()
+            if not allowed:
+                self._count('rate_limited')
+                response = self.error_response(429, 'Too Many Requests')
+                response.headers['Retry-After'] = str(max(1, math.ceil(wait_seconds)))
+                return response
+
+        if self.profile.hang_rate and self.profile.random.random() < self.profile.hang_rate:
+            self._count('hung')
+            await asyncio.sleep(self.profile.hang_seconds)
+        else:
+            await asyncio.sleep(self.profile.latency())
+
+        if self.profile.error_rate and self.profile.random.random() < self.profile.error_rate:
+            self._count('errors')
+            return self.error_response(self.profile.random.choice((500, 503)), 'Simulated provider error')
+
+        response = await handler(request)
+        self._count('accepted' if response.status_code < 400 else 'rejected')
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    def record_message(self, **message):
+        self.messages.append({**message, 'received_at': time.time()})
+
+    def routes(self):
+        """Rutas propias del proveedor (las subclases las definen)"""
+        return []
+
+    async def stats_endpoint(self, request):
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self._latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(1000 * latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 1)
+
+        return JSONResponse({
+            'provider': self.name,
+            'profile': self.profile.to_dict(),
+            **counters,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99)
+        })
+
+    async def messages_endpoint(self, request):
+        recipient = request.query_params.get('to')
+        messages = [m for m in list(self.messages) if recipient is None or m.get('to') == recipient]
+        return JSONResponse({'messages': messages[-int(request.query_params.get('limit', 50)):]})
+
+    async def reset_endpoint(self, request):
+        with self._lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+            self._latencies.clear()
+        self.messages.clear()
+        return JSONResponse({'reset': True})
+
+    def app(self):
+        return Starlette(routes=self.routes() + [
+            Route('/__stats', self.stats_endpoint, methods=['GET']),
+            Route('/__messages', self.messages_endpoint, methods=['GET']),
+            Route('/__reset', self.reset_endpoint, methods=['POST'])
+        ])
+
+
+def _env(prefix, key, default):
+    return os.getenv(f'{prefix}_{key}', default)
+
+
+def build_parser(description, prefix, default_port):
+    """Opciones comunes; cada una se puede fijar también con <PREFIX>_<OPCIÓN> en el entorno"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--host', default=_env(prefix, 'HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(_env(prefix, 'PORT', default_port)))
+    parser.add_argument('--latency-ms', type=float, default=float(_env(prefix, 'LATENCY_MS', '100')))
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default=_env(prefix, 'LATENCY_DIST', 'lognormal'))
+    parser.add_argument('--latency-sigma', type=float, default=float(_env(prefix, 'LATENCY_SIGMA', '0.5')))
+    parser.add_argument('--error-rate', type=float, default=float(_env(prefix, 'ERROR_RATE', '0')))
+    parser.add_argument('--hang-rate', type=float, default=float(_env(prefix, 'HANG_RATE', '0')))
+    parser.add_argument('--hang-seconds', type=float, default=float(_env(prefix, 'HANG_SECONDS', '30')))
+    parser.add_argument('--rate-limit', type=float, default=float(_env(prefix, 'RATE_LIMIT', '0')),
+                        help='Peticiones por segundo (0 = sin límite)')
+    parser.add_argument('--burst', type=int, default=int(_env(prefix, 'BURST', '0')) or None)
+    parser.add_argument('--seed', type=int, default=None)
+    return parser
+
+
+def profile_from_args(args):
+    return SimulatorProfile(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed
+    )
+
+
+def serve(simulator: ProviderSimulator, host, port):
+    import uvicorn
+    print(f"🧪 Simulador {simulator.name} en http://{host}:{port} ({simulator.profile.to_dict()})")
+    uvicorn.run(simulator.app(), host=host, port=port, log_level='warning')
@@ -0,0 +1,109 @@
+"""
+Simulador local de la API de Twilio Messages (solo lo que usan los adaptadores).
+
+    POST /2010-04-01/Accounts/{AccountSid}/Messages.json   (form: To, From, Body)
+
+Autenticación básica con el AccountSid como usuario. Responde 201 con un
+recurso Message como el real; To vacío o sin formato E.164 → 400 (21211).
+
+Uso (desde backend/src):
+    python -m simulators.twilio_simulator --port 4010 --latency-ms 150 --error-rate 0.01 --rate-limit 100
+    TWILIO_BASE_URL=http://127.0.0.1:4010 gunicorn ...
+"""
+import base64
+import os
+import re
+import sys
+import uuid
+from email.utils import formatdate
+from urllib.parse import parse_qs
+
+# 🔧 SOLUCIÓN DE IMPORTACIONES - Path absoluto desde src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..')
+sys.path.insert(0, src_dir)
+
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from simulators.provider_simulator import ProviderSimulator, build_parser, profile_from_args, serve
+
+E164 = re.compile(r'^\+[1-9]\d{6,14}$')
+DEFAULT_ERROR_CODES = {429: 20429, 500: 20500, 503: 20503}
+
+
+class TwilioSimulator(ProviderSimulator):
+    name = 'twilio'
+
+    def error_response(self, status_code, message, code=None):
+        code = code or DEFAULT_ERROR_CODES.get(status_code, status_code)
+        return JSONResponse({
+            'code': code,
+            'message': message,
+            'more_info': f'https://www.twilio.com/docs/errors/{code}',
+            'status': status_code
+        }, status_code=status_code)
+
+    def _authorized(self, request, account_sid):
+        header = request.headers.get('authorization', '')
+        if not header.startswith('Basic '):
+            return False
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode().partition(':')
+        except Exception:
+            return False
+        return username == account_sid and bool(password)
+
+    async def create_message(self, request):
+        account_sid = request.path_params['account_sid']
+        if not self._authorized(request, account_sid):
+            return self.error_response(401, 'Authenticate', code=20003)
+
+        # Twilio recibe x-www-form-urlencoded; se parsea a mano (sin python-multipart)
+        form = parse_qs((await request.body()).decode())
+        to, from_, body = (form.get(field, [''])[0] for field in ('To', 'From', 'Body'))
+        if not E164.match(to):
+            return self.error_response(400, f"The 'To' number {to} is not a valid phone number.", code=21211)
+        if not from_:
+            return self.error_response(400, "A 'From' phone number is required.", code=21603)
+        if not body:
+            return self.error_response(400, 'Message body is required.', code=21602)
+
+        sid = 'SM' + uuid.uuid4().hex
+        self.record_message(sid=sid, to=to, body=body)
+        now = formatdate(usegmt=True)
+        return JSONResponse({
+            'sid': sid,
+            'account_sid': account_sid,
+            'to': to,
+            'from': from_,
+            'body': body,
+            'status': 'queued',
+            'direction': 'outbound-api',
+            'num_segments': '1',
+            'num_media': '0',
+            'price': None,
+            'price_unit': 'USD',
+            'error_code': None,
+            'error_message': None,
+            'api_version': '2010-04-01',
+            'date_created': now,
+            'date_updated': now,
+            'date_sent': None,
+            'uri': f'/2010-04-01/Accounts/{account_sid}/Messages/{sid}.json',
+            'subresource_uris': {}
+        }, status_code=201)
+
+    def routes(self):
+        async def handler(request):
+            return await self.simulate(self.create_message, request)
+        return [Route('/2010-04-01/Accounts/{account_sid}/Messages.json', handler, methods=['POST'])]
+
+
+def main():
+    parser = build_parser('Simulador local de Twilio Messages', 'TWILIO_SIM', '4010')
+    args = parser.parse_args()
+    serve(TwilioSimulator(profile_from_args(args)), args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
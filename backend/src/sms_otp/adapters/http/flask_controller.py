@@ -1,13 +1,13 @@
 from flask import Blueprint, request, jsonify
-from ...application.sms_otp_usecases import SendOTPUseCase, VerifyOTPUseCase
-from ...infrastructure.twilio_sms_adapter import TwilioSMSAdapter
+from shared.bootstrap.dependencies import container
+from shared.resilience.circuit_breaker import ProviderUnavailableError
 
 sms_bp = Blueprint('sms', __name__)
 
-# Inicializar casos de uso
-sms_service = TwilioSMSAdapter()
-send_otp_uc = SendOTPUseCase(sms_service)
-verify_otp_uc = VerifyOTPUseCase()
+# Casos de uso del contenedor (los mismos que usa main.py), creados en el primer request
+# Con NOTIFICATION_DELIVERY=outbox el SMS lo entrega notification_worker.py
+send_otp_uc = container.provider('send_otp_use_case')
+verify_otp_uc = container.provider('verify_otp_use_case')
 
 @sms_bp.route('/send-otp', methods=['POST'])
 def send_otp():
@@ -28,6 +28,8 @@ def send_otp():
         else:
             return jsonify({'error': 'Failed to send OTP'}), 500
             
+    except ProviderUnavailableError:
+        raise  # 503 + Retry-After en el handler de la app
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
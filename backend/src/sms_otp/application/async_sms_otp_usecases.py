@@ -0,0 +1,59 @@
+import os
+import random
+from datetime import datetime, timedelta
+from shared.otp_store.async_otp_store import get_async_otp_store
+from shared.resilience.circuit_breaker import ProviderUnavailableError
+from ..ports.async_sms_service_port import AsyncSMSServicePort
+from ..ports.sms_service_port import SMS_OTP_EXPIRY_MINUTES
+
+
+class AsyncSMSOTPUseCases:
+    """
+    Envío y verificación de OTP por SMS para el entry point ASGI. Mismo
+    store (sms_otps), mismos campos y misma verificación atómica que
+    SMSOTPGenerator + SMSOTPRepository.
+    """
+
+    def __init__(self, sms_service: AsyncSMSServicePort, length: int = 6, expiry_minutes: int = SMS_OTP_EXPIRY_MINUTES):
+        self.sms_service = sms_service
+        self.length = length
+        self.expiry_minutes = expiry_minutes
+        self.otps = get_async_otp_store('sms_otps', key_field='phone', expires_field='expires')
+        self.max_attempts = int(os.getenv('SMS_OTP_MAX_ATTEMPTS', '5'))
+
+    async def send_otp(self, phone_number: str) -> bool:
+        try:
+            otp = ''.join([str(random.randint(0, 9)) for _ in range(self.length)])
+            expiry_time = datetime.utcnow() + timedelta(minutes=self.expiry_minutes)
+            await self.otps.put(
+                phone_number,
+                {
+                    "code": otp,
+                    "used": False,
+                    "attempts": 0
+                },
+                expiry_time
+            )
+            print(f"🔐 OTP generado para {phone_number}: {otp}")
+            return await self.sms_service.send_otp(phone_number, otp)
+        except ProviderUnavailableError:
+            raise
+        except Exception as e:
+            print(f"❌ Error en AsyncSMSOTPUseCases.send_otp: {e}")
+            return False
+
+    async def verify_otp(self, phone_number: str, otp: str) -> bool:
+        otp_record = await self.otps.find_one_and_update(
+            phone_number,
+            {"code": otp, "used": False},
+            {"used": True},
+            max_attempts=self.max_attempts
+        )
+
+        if otp_record:
+            print(f"✅ OTP válido para {phone_number}")
+            return True
+
+        await self.otps.increment(phone_number, "attempts", {"used": False})
+        print(f"❌ OTP incorrecto o expirado para {phone_number}")
+        return False
@@ -0,0 +1,48 @@
+import os
+import httpx
+from ..ports.async_sms_service_port import AsyncSMSServicePort
+from shared.resilience.circuit_breaker import RecipientRejected, is_recipient_error
+
+class AsyncTwilioSMSAdapter(AsyncSMSServicePort):
+    """
+    Envío de SMS con la API REST de Twilio (Messages) vía httpx.AsyncClient,
+    sin el SDK síncrono.
+    """
+    def __init__(self, client: httpx.AsyncClient = None):
+        self.account_sid = os.getenv('TWILIO_ACCOUNT_SID')
+        self.auth_token = os.getenv('TWILIO_AUTH_TOKEN')
+        self.phone_number = os.getenv('TWILIO_FROM_NUMBER')
+        
+        if not all([self.account_sid, self.auth_token, self.phone_number]):
+            raise ValueError("Missing Twilio credentials")
+        
+        api_base = os.getenv('TWILIO_BASE_URL', 'https://api.twilio.com').rstrip('/')
+        self.base_url = f"{api_base}/2010-04-01/Accounts/{self.account_sid}/Messages.json"
+        self.client = client or httpx.AsyncClient(
+            auth=(self.account_sid, self.auth_token),
+            timeout=httpx.Timeout(
+                float(os.getenv('TWILIO_READ_TIMEOUT', '10')),
+                connect=float(os.getenv('TWILIO_CONNECT_TIMEOUT', '3'))
+            )
+        )
+
+    async def send_otp(self, phone_number: str, otp: str) -> bool:
+        try:
+            response = await self.client.post(self.base_url, data={
+                'Body': f'Tu código de verificación es: {otp}',
+                'From': self.phone_number,
+                'To': phone_number
+            })
+            if response.status_code != 201:
+                print(f"❌ Error enviando SMS: {response.status_code} {response.text}")
+                if is_recipient_error(response.status_code):
+                    return RecipientRejected(f"twilio {response.status_code}")
+                return False
+            print(f"✅ SMS enviado a {phone_number}: {response.json().get('sid')}")
+            return True
+        except Exception as e:
+            print(f"❌ Error enviando SMS: {e}")
+            return False
+    
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,29 @@
+from shared.resilience.circuit_breaker import CircuitBreaker
+from ..ports.sms_service_port import SMSServicePort
+from ..ports.async_sms_service_port import AsyncSMSServicePort
+
+
+class CircuitBreakerSMSAdapter(SMSServicePort):
+    """
+    Envuelve al proveedor de SMS con el breaker 'sms'. Con el circuito
+    abierto lanza ProviderUnavailableError sin esperar al timeout de Twilio.
+    """
+    def __init__(self, inner: SMSServicePort, breaker: CircuitBreaker = None):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker.get('sms')
+
+    def send_otp(self, phone_number: str, otp: str) -> bool:
+        return self.breaker.call(self.inner.send_otp, phone_number, otp)
+
+
+class AsyncCircuitBreakerSMSAdapter(AsyncSMSServicePort):
+    """Misma protección para el adaptador async (comparte el breaker 'sms' del proceso)"""
+    def __init__(self, inner: AsyncSMSServicePort, breaker: CircuitBreaker = None):
+        self.inner = inner
+        self.breaker = breaker or CircuitBreaker.get('sms')
+
+    async def send_otp(self, phone_number: str, otp: str) -> bool:
+        return await self.breaker.call_async(self.inner.send_otp, phone_number, otp)
+
+    async def aclose(self):
+        await self.inner.aclose()
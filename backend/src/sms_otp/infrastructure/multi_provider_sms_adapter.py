@@ -0,0 +1,14 @@
+from shared.resilience.hedged_router import HedgedRouter
+from ..ports.sms_service_port import SMSServicePort
+
+
+class MultiProviderSMSAdapter(SMSServicePort):
+    """SMS por varios gateways (SMS_PROVIDERS) con ruteo por peso, cobertura y failover"""
+    def __init__(self, router: HedgedRouter):
+        self.router = router
+
+    def send_otp(self, phone_number: str, otp: str) -> bool:
+        return self.router.send(phone_number, otp)
+
+    def stats(self):
+        return self.router.stats()
@@ -0,0 +1,37 @@
+from shared.database.async_mongo_connection import AsyncMongoDB
+from shared.outbox.notification_outbox import NotificationOutbox, COLLECTION_NAME, build_message
+from ..ports.sms_service_port import SMSServicePort, SMS_OTP_EXPIRY_MINUTES
+from ..ports.async_sms_service_port import AsyncSMSServicePort
+
+# El worker no entrega un código ya vencido
+OTP_MAX_AGE_SECONDS = SMS_OTP_EXPIRY_MINUTES * 60
+
+
+class OutboxSMSAdapter(SMSServicePort):
+    """
+    Encola el SMS en notification_outbox en lugar de llamar a Twilio; lo
+    entrega notification_worker.py. True = quedó guardado en el outbox.
+    """
+    def __init__(self, outbox: NotificationOutbox = None):
+        self.outbox = outbox or NotificationOutbox.get_instance()
+
+    def send_otp(self, phone_number: str, otp: str) -> bool:
+        try:
+            self.outbox.enqueue('sms', phone_number, otp, max_age_seconds=OTP_MAX_AGE_SECONDS)
+            return True
+        except Exception as e:
+            print(f"❌ Error encolando SMS: {e}")
+            return False
+
+
+class AsyncOutboxSMSAdapter(AsyncSMSServicePort):
+    async def send_otp(self, phone_number: str, otp: str) -> bool:
+        try:
+            await AsyncMongoDB.get_db()[COLLECTION_NAME].insert_one(build_message('sms', phone_number, otp, max_age_seconds=OTP_MAX_AGE_SECONDS))
+            return True
+        except Exception as e:
+            print(f"❌ Error encolando SMS: {e}")
+            return False
+
+    async def aclose(self):
+        pass
@@ -1,32 +1,41 @@
-from shared.database.mongo_connection import MongoDB
-from datetime import datetime 
+from shared.otp_store.factory import get_otp_store
+import os
 
 
 class SMSOTPRepository:
-    def __init__(self):
-        self.db = MongoDB.get_db()
-        self.otps = self.db.sms_otps
+    def __init__(self, store=None):
+        # Backend configurable (OTP_STORE_BACKEND): MongoDB (sms_otps) o memoria
+        self.otps = store or get_otp_store('sms_otps', key_field='phone', expires_field='expires')
+        self.max_attempts = int(os.getenv('SMS_OTP_MAX_ATTEMPTS', '5'))
     
     def save_otp(self, phone, code, expires):
-        return self.otps.update_one(
-            {"phone": phone},
-            {"$set": {
+        return self.otps.put(
+            phone,
+            {
                 "code": code, 
-                "expires": expires,
-                "used": False
-            }},
-            upsert=True
+                "used": False,
+                "attempts": 0
+            },
+            expires
         )
     
     def find_valid_otp(self, phone):
-        return self.otps.find_one({
-            "phone": phone,
-            "used": False,
-            "expires": {"$gt": datetime.now()}
-        })
+        return self.otps.find(phone, {"used": False})
     
     def mark_otp_used(self, phone):
-        return self.otps.update_one(
-            {"phone": phone},
-            {"$set": {"used": True}}
-        )
\ No newline at end of file
+        return self.otps.update(phone, None, {"used": True})
+    
+    def consume_valid_otp(self, phone, code):
+        """
+        Valida y marca como usado en una sola operación atómica: el predicado
+        (código, no usado, no expirado, intentos) va en el filtro
+        """
+        return self.otps.find_one_and_update(
+            phone,
+            {"code": code, "used": False},
+            {"used": True},
+            max_attempts=self.max_attempts
+        )
+    
+    def register_failed_attempt(self, phone):
+        return self.otps.increment(phone, "attempts", {"used": False})
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+from shared.bootstrap.lazy import Lazy
+from shared.outbox.notification_outbox import outbox_enabled
+from shared.resilience.circuit_breaker import circuit_breaker_enabled
+from shared.resilience.hedged_router import HedgedRouter, parse_provider_weights
+from .circuit_breaker_sms_adapter import CircuitBreakerSMSAdapter
+from .multi_provider_sms_adapter import MultiProviderSMSAdapter
+from .outbox_sms_adapter import OutboxSMSAdapter
+
+# Imports dentro de cada fábrica: el SDK de Twilio / requests solo se cargan
+# si el proceso realmente envía SMS (no en el arranque de la API)
+def _twilio():
+    from .twilio_sms_adapter import TwilioSMSAdapter
+    return TwilioSMSAdapter()
+
+
+def _vonage():
+    from .vonage_sms_adapter import VonageSMSAdapter
+    return VonageSMSAdapter()
+
+
+PROVIDER_FACTORIES = {
+    'twilio': _twilio,
+    'vonage': _vonage
+}
+
+
+def _build_provider():
+    providers = parse_provider_weights(os.getenv('SMS_PROVIDERS'), 'twilio')
+    if len(providers) > 1:
+        return MultiProviderSMSAdapter(HedgedRouter.build('sms', providers, PROVIDER_FACTORIES))
+    service = PROVIDER_FACTORIES[providers[0][0]]()
+    return CircuitBreakerSMSAdapter(service) if circuit_breaker_enabled() else service
+
+
+# Uno por proceso worker: el cliente HTTP creado antes del fork no se hereda
+_provider = Lazy(_build_provider, 'sms_provider', per_worker=True)
+
+
+def provider_sms_service():
+    """
+    Quien entrega los SMS (una instancia por proceso worker). Un solo gateway
+    (SMS_PROVIDERS=twilio, por defecto): detrás del circuit breaker 'sms'.
+    Varios ("twilio:3,vonage:1"): router con peso, cobertura y failover.
+    """
+    return _provider.get()
+
+
+def provider_sms_stats():
+    """Estado del router multi-gateway (None con un solo gateway o si aún no se creó)"""
+    if not _provider.built:
+        return None
+    stats = getattr(_provider.get(), 'stats', None)
+    return stats() if stats else None
+
+
+def default_sms_service():
+    """Para los casos de uso: outbox (lo entrega el worker) o directo al proveedor"""
+    return OutboxSMSAdapter() if outbox_enabled() else provider_sms_service()
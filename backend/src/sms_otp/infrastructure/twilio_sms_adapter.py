@@ -1,6 +1,8 @@
 from twilio.rest import Client
+from twilio.base.exceptions import TwilioRestException
 import os
 from ..ports.sms_service_port import SMSServicePort
+from shared.resilience.circuit_breaker import RecipientRejected, is_recipient_error
 
 class TwilioSMSAdapter(SMSServicePort):
     def __init__(self):
@@ -12,6 +14,10 @@ class TwilioSMSAdapter(SMSServicePort):
             raise ValueError("Missing Twilio credentials")
         
         self.client = Client(self.account_sid, self.auth_token)
+        # TWILIO_BASE_URL permite apuntar al simulador local (simulators/twilio_simulator.py)
+        base_url = os.getenv('TWILIO_BASE_URL')
+        if base_url:
+            self.client.api.base_url = base_url.rstrip('/')
 
     def send_otp(self, phone_number: str, otp: str) -> bool:
         try:
@@ -22,6 +28,12 @@ class TwilioSMSAdapter(SMSServicePort):
             )
             print(f"✅ SMS enviado a {phone_number}: {message.sid}")
             return True
+        except TwilioRestException as e:
+            print(f"❌ Error enviando SMS: {e}")
+            if e.status and is_recipient_error(e.status):
+                # Número inválido / no permitido (p. ej. 21211): no es una caída de Twilio
+                return RecipientRejected(f"twilio {e.status} {e.code}")
+            return False
         except Exception as e:
             print(f"❌ Error enviando SMS: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,49 @@
+import os
+import requests
+from ..ports.sms_service_port import SMSServicePort
+from shared.resilience.circuit_breaker import RecipientRejected, is_recipient_error
+
+# Estados de Vonage por mensaje que dependen del destinatario (parámetro inválido,
+# mensaje inválido, número bloqueado / fuera de la lista / desactivado)
+RECIPIENT_STATUSES = {'3', '6', '7', '29', '33'}
+
+class VonageSMSAdapter(SMSServicePort):
+    """Segundo gateway de SMS (API REST de Vonage), usado por el router multi-proveedor"""
+    def __init__(self):
+        self.api_key = os.getenv('VONAGE_API_KEY')
+        self.api_secret = os.getenv('VONAGE_API_SECRET')
+        self.phone_number = os.getenv('VONAGE_FROM_NUMBER')
+        
+        if not all([self.api_key, self.api_secret, self.phone_number]):
+            raise ValueError("Missing Vonage credentials")
+        
+        self.base_url = os.getenv('VONAGE_BASE_URL', 'https://rest.nexmo.com').rstrip('/') + '/sms/json'
+        self.timeout = (
+            float(os.getenv('VONAGE_CONNECT_TIMEOUT', '3')),
+            float(os.getenv('VONAGE_READ_TIMEOUT', '10'))
+        )
+        self.session = requests.Session()
+
+    def send_otp(self, phone_number: str, otp: str) -> bool:
+        try:
+            response = self.session.post(self.base_url, data={
+                'api_key': self.api_key,
+                'api_secret': self.api_secret,
+                'from': self.phone_number,
+                'to': phone_number.lstrip('+'),
+                'text': f'Tu código de verificación es: {otp}'
+            }, timeout=self.timeout)
+            messages = response.json().get('messages', []) if response.status_code == 200 else []
+            # Vonage responde 200 aunque falle; el estado real va por mensaje ("0" = ok)
+            if messages and all(message.get('status') == '0' for message in messages):
+                print(f"✅ SMS (Vonage) enviado a {phone_number}: {messages[0].get('message-id')}")
+                return True
+            print(f"❌ Error enviando SMS (Vonage): {response.status_code} {response.text}")
+            if is_recipient_error(response.status_code) or any(
+                message.get('status') in RECIPIENT_STATUSES for message in messages
+            ):
+                return RecipientRejected(f"vonage {response.status_code}")
+            return False
+        except Exception as e:
+            print(f"❌ Error enviando SMS (Vonage): {e}")
+            return False
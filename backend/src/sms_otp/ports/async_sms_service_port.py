@@ -0,0 +1,6 @@
+from abc import ABC, abstractmethod
+
+class AsyncSMSServicePort(ABC):
+    @abstractmethod
+    async def send_otp(self, phone_number: str, otp: str) -> bool:
+        pass
\ No newline at end of file
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
 
+# Vida de un código SMS: pasado este tiempo el outbox ya no lo entrega
+SMS_OTP_EXPIRY_MINUTES = 5
+
 class SMSServicePort(ABC):
     @abstractmethod
     def send_otp(self, phone_number: str, otp: str) -> bool:
@@ -1,17 +1,49 @@
+import hmac
+import os
 from flask import Blueprint, request, jsonify, session, Response
-from ...application.generate_qr_usecase import GenerateQRUseCase
-from ...application.validate_totp_usecase import ValidateTOTPUseCase
-from ...application.register_user_usecase import RegisterUserUseCase
-from ...adapters.http.qr_generator_adapter import QRGeneratorAdapter
-from ...infrastructure.totp_repository import TOTPRepository
+from ...ports.qr_service_port import QR_FORMAT_PNG, QR_FORMAT_SVG, QR_MIMETYPES
+from shared.bootstrap.dependencies import container
 
 totp_bp = Blueprint('totp', __name__)
 
-# Inicializar dependencias
-user_repo = TOTPRepository()
-qr_adapter = QRGeneratorAdapter()
-generate_qr_usecase = GenerateQRUseCase(qr_adapter)
-register_usecase = RegisterUserUseCase(user_repo)
+# Dependencias del contenedor (en el primer request que las usa)
+user_repo = container.provider('totp_repository')
+generate_qr_usecase = container.provider('generate_qr_usecase')
+register_usecase = container.provider('totp_register_usecase')
+validate_usecase = container.provider('validate_totp_usecase')
+verify_batch_usecase = container.provider('verify_totp_batch_usecase')
+
+# Verificación en lote: solo para servicios internos con TOTP_BATCH_API_KEY
+TOTP_BATCH_MAX_ITEMS = int(os.getenv('TOTP_BATCH_MAX_ITEMS', '500'))
+
+# El QR lleva el secreto: solo cache privada del navegador, revalidada con ETag
+QR_MAX_AGE_SECONDS = int(os.getenv('QR_CACHE_MAX_AGE_SECONDS', '0'))
+QR_ISSUER = 'Auth System'
+# Formato sin preferencia del cliente: png (clásico), png-1bit o svg
+QR_DEFAULT_FORMAT = os.getenv('QR_DEFAULT_FORMAT', QR_FORMAT_PNG)
+if QR_DEFAULT_FORMAT not in QR_MIMETYPES:
+    # Falla al arrancar, no con un 500 en cada GET /qr
+    raise ValueError(f"QR_DEFAULT_FORMAT desconocido: {QR_DEFAULT_FORMAT} (usar {', '.join(QR_MIMETYPES)})")
+
+def _qr_cache_headers(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={QR_MAX_AGE_SECONDS}' if QR_MAX_AGE_SECONDS else 'private, no-cache'
+    response.vary.add('Accept')
+    return response
+
+def _negotiate_qr_format():
+    """?format= manda; si no, Accept (SVG solo si el cliente lo prefiere a PNG); empate → QR_DEFAULT_FORMAT"""
+    requested = request.args.get('format')
+    if requested:
+        return requested if requested in QR_MIMETYPES else None
+    
+    svg_quality = request.accept_mimetypes.quality('image/svg+xml')
+    png_quality = request.accept_mimetypes.quality('image/png')
+    if svg_quality > png_quality:
+        return QR_FORMAT_SVG
+    if png_quality > svg_quality and QR_DEFAULT_FORMAT == QR_FORMAT_SVG:
+        return QR_FORMAT_PNG
+    return QR_DEFAULT_FORMAT
 
 @totp_bp.route('/setup', methods=['POST'])
 def setup_totp():
@@ -43,12 +75,22 @@ def get_qr():
         if not email:
             return jsonify({'error': 'Email parameter is required'}), 400
         
+        fmt = _negotiate_qr_format()
+        if fmt is None:
+            return jsonify({'error': f"format must be one of: {', '.join(QR_MIMETYPES)}"}), 400
+        
+        # El secreto se lee siempre de Mongo (tras una rotación el QR viejo no debe
+        # validarse): el 304 ahorra el render y la transferencia, no esa lectura
         secret = user_repo.get_secret_by_email(email)
         if not secret:
             return jsonify({'error': 'User not found or TOTP not configured'}), 404
         
-        img_bytes = generate_qr_usecase.execute(secret, email, 'Auth System')
-        return Response(img_bytes, mimetype='image/png')
+        etag = generate_qr_usecase.etag(secret, email, QR_ISSUER, fmt)
+        if request.if_none_match.contains_weak(etag):
+            return _qr_cache_headers(Response(status=304), etag)
+        
+        img_bytes = generate_qr_usecase.execute(secret, email, QR_ISSUER, fmt)
+        return _qr_cache_headers(Response(img_bytes, mimetype=QR_MIMETYPES[fmt]), etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -70,8 +112,7 @@ def verify_totp():
         if not secret:
             return jsonify({'error': 'TOTP not configured for this user'}), 404
         
-        validate_usecase = ValidateTOTPUseCase(secret)
-        is_valid = validate_usecase.execute(code)
+        is_valid = validate_usecase.execute(secret, code)
         
         if is_valid:
             return jsonify({
@@ -87,6 +128,43 @@ def verify_totp():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _valid_batch_item(item):
+    # email sin tipo fijo rompería el set de emails del caso de uso (unhashable → 500)
+    if not isinstance(item, dict) or not item.get('email') or not item.get('code'):
+        return False
+    code = item['code']
+    return isinstance(item['email'], str) and isinstance(code, (str, int)) and not isinstance(code, bool)
+
+@totp_bp.route('/verify-batch', methods=['POST'])
+def verify_totp_batch():
+    """Verificar muchos pares (email, código) en una sola petición"""
+    try:
+        api_key = os.getenv('TOTP_BATCH_API_KEY')
+        if not api_key:
+            return jsonify({'error': 'Batch verification is disabled'}), 403
+        if not hmac.compare_digest(request.headers.get('X-Internal-Api-Key', ''), api_key):
+            return jsonify({'error': 'Unauthorized'}), 401
+        
+        data = request.get_json(silent=True) or {}
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        
+        if len(items) > TOTP_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'At most {TOTP_BATCH_MAX_ITEMS} items per request'}), 413
+        
+        if not all(_valid_batch_item(item) for item in items):
+            return jsonify({'error': 'Every item needs email (string) and code (string or number)'}), 400
+        
+        results = verify_batch_usecase.execute(items)
+        return jsonify({
+            'results': results,
+            'valid_count': sum(1 for result in results if result['valid'])
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @totp_bp.route('/user-info', methods=['GET'])
 def user_info():
     """Obtener información del usuario"""
@@ -96,7 +174,7 @@ def user_info():
         if not email:
             return jsonify({'error': 'Email parameter is required'}), 400
         
-        user = user_repo.find_user_by_email(email)
+        user = user_repo.find_profile_by_email(email)
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
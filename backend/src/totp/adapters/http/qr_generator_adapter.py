@@ -1,12 +1,89 @@
+import os
+import struct
+import zlib
 import qrcode
 from qrcode.image.pil import PilImage
 from io import BytesIO
 from ...ports.qr_service_port import QRServicePort
 
 class QRGeneratorAdapter(QRServicePort):
+    def __init__(self, box_size=None, border=None, mask_pattern=None):
+        # Solo para png-1bit / svg; el PNG clásico conserva el tamaño de qrcode
+        self.box_size = int(box_size or os.getenv('QR_PNG_BOX_SIZE', '4'))
+        self.border = int(border if border is not None else os.getenv('QR_BORDER', '4'))
+        # Elegir la mejor máscara (8 pruebas) es ~90% del costo; fijarla (0-7)
+        # da un QR igual de legible para los lectores, aunque no el "óptimo" del estándar
+        mask_pattern = mask_pattern if mask_pattern is not None else os.getenv('QR_MASK_PATTERN')
+        self.mask_pattern = int(mask_pattern) if mask_pattern not in (None, '') else None
+
+    def render_settings(self) -> str:
+        mask = 'auto' if self.mask_pattern is None else self.mask_pattern
+        return f"box={self.box_size};border={self.border};mask={mask}"
+
     def generate_qr_image(self, uri: str) -> bytes:
         buffer = BytesIO()
         img = qrcode.make(uri, image_factory=PilImage)
         img.save(buffer, format="PNG")
         buffer.seek(0)
-        return buffer.getvalue()
\ No newline at end of file
+        return buffer.getvalue()
+
+    def _matrix(self, uri):
+        """Módulos del QR (True = oscuro), con el borde incluido"""
+        qr = qrcode.QRCode(border=self.border, mask_pattern=self.mask_pattern)
+        qr.add_data(uri)
+        qr.make(fit=True)
+        return qr.get_matrix()
+
+    def generate_qr_png_1bit(self, uri: str) -> bytes:
+        """
+        PNG en escala de grises de 1 bit escrito a mano (sin PIL): cada fila es
+        un byte de filtro + los píxeles empaquetados, y zlib comprime las filas
+        repetidas de cada módulo.
+        """
+        matrix = self._matrix(uri)
+        box = self.box_size
+        size = len(matrix) * box
+
+        rows = []
+        for modules in matrix:
+            bits = ''.join(('0' if dark else '1') * box for dark in modules)
+            bits += '0' * (-len(bits) % 8)
+            row = b'\x00' + int(bits, 2).to_bytes(len(bits) // 8, 'big')
+            rows.extend([row] * box)
+
+        def chunk(kind, data):
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+        return b''.join((
+            b'\x89PNG\r\n\x1a\n',
+            chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 1, 0, 0, 0, 0)),
+            chunk(b'IDAT', zlib.compress(b''.join(rows), 9)),
+            chunk(b'IEND', b'')
+        ))
+
+    def iter_qr_svg(self, uri: str):
+        """SVG por partes: cabecera y un trazo por fila (tramos oscuros como rectángulos)"""
+        matrix = self._matrix(uri)
+        size = len(matrix)
+        yield (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" '
+            f'width="{size * self.box_size}" height="{size * self.box_size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#fff"/><path fill="#000" d="'
+        )
+        for y, modules in enumerate(matrix):
+            commands = []
+            x = 0
+            while x < size:
+                if not modules[x]:
+                    x += 1
+                    continue
+                start = x
+                while x < size and modules[x]:
+                    x += 1
+                commands.append(f'M{start} {y}h{x - start}v1h-{x - start}z')
+            if commands:
+                yield ''.join(commands)
+        yield '"/></svg>'
+
+    def generate_qr_svg(self, uri: str) -> str:
+        return ''.join(self.iter_qr_svg(uri))
\ No newline at end of file
@@ -1,10 +1,23 @@
 from ..domain.totp_generator import TOTPGenerator
+from ..ports.qr_service_port import QR_FORMAT_PNG
 
 class GenerateQRUseCase:
-    def __init__(self, qr_service):
+    def __init__(self, qr_service, cache=None):
         self.qr_service = qr_service
+        self.cache = cache
 
-    def execute(self, secret, email, issuer):
-        totp = TOTPGenerator(secret=secret)
-        uri = totp.generate_uri(email, issuer)
-        return self.qr_service.generate_qr_image(uri)
\ No newline at end of file
+    def provisioning_uri(self, secret, email, issuer):
+        return TOTPGenerator(secret=secret).generate_uri(email, issuer)
+
+    def etag(self, secret, email, issuer, fmt=QR_FORMAT_PNG):
+        """ETag de la imagen sin generarla (None sin cache)"""
+        if self.cache is None:
+            return None
+        return self.cache.etag(self.provisioning_uri(secret, email, issuer), fmt, self.qr_service.render_settings())
+
+    def execute(self, secret, email, issuer, fmt=QR_FORMAT_PNG):
+        uri = self.provisioning_uri(secret, email, issuer)
+        if self.cache is None:
+            return self.qr_service.generate(uri, fmt)
+        return self.cache.get_or_render(email, uri, lambda: self.qr_service.generate(uri, fmt), fmt,
+                                        self.qr_service.render_settings())
\ No newline at end of file
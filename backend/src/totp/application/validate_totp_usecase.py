@@ -1,9 +1,8 @@
-from ..domain.totp_generator import TOTPGenerator
+from ..domain.totp_verification_engine import TOTPVerificationEngine
 
 class ValidateTOTPUseCase:
-    def __init__(self, secret):
-        self.secret = secret
+    def __init__(self, engine=None):
+        self.engine = engine or TOTPVerificationEngine.get_instance()
 
-    def execute(self, code: str) -> bool:
-        totp = TOTPGenerator(secret=self.secret)
-        return totp.verify_code(code)
\ No newline at end of file
+    def execute(self, secret, code: str) -> bool:
+        return self.engine.verify(secret, code)
\ No newline at end of file
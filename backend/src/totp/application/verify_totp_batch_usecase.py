@@ -0,0 +1,18 @@
+from ..domain.totp_verification_engine import TOTPVerificationEngine
+
+class VerifyTOTPBatchUseCase:
+    """Verifica muchos pares (email, código) con una sola lectura de secretos"""
+    def __init__(self, user_repository, engine=None):
+        self.user_repository = user_repository
+        self.engine = engine or TOTPVerificationEngine.get_instance()
+
+    def execute(self, items):
+        secrets = self.user_repository.get_secrets_by_emails({item['email'] for item in items})
+        results = []
+        for item in items:
+            secret = secrets.get(item['email'])
+            if not secret:
+                results.append({'email': item['email'], 'valid': False, 'error': 'TOTP not configured'})
+                continue
+            results.append({'email': item['email'], 'valid': self.engine.verify(secret, item['code'])})
+        return results
\ No newline at end of file
@@ -0,0 +1,121 @@
+import base64
+import hashlib
+import hmac
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+
+class _SecretCodes:
+    """Clave ya decodificada de un secreto y la ventana (paso, códigos) vigente"""
+    __slots__ = ('key', 'window')
+
+    def __init__(self, key):
+        self.key = key
+        self.window = (None, ())
+
+
+class TOTPVerificationEngine:
+    """
+    Verificación TOTP (RFC 6238, HMAC-SHA1, compatible con pyotp / Google
+    Authenticator) sin decodificar el secreto ni recalcular HMAC en cada llamada.
+
+    - La clave base32 decodificada se guarda en un LRU por secreto
+    - Los códigos de los pasos actual ± TOTP_VALID_WINDOW se calculan una vez
+      por paso y secreto; al cambiar de paso se reutilizan los que se solapan
+    - La comparación es en tiempo constante contra todos los códigos de la ventana
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, valid_window=None, interval=None, digits=None, max_secrets=None):
+        # 0 = solo el paso actual (lo mismo que pyotp.TOTP.verify por defecto)
+        self.valid_window = int(valid_window if valid_window is not None else os.getenv('TOTP_VALID_WINDOW', '0'))
+        self.interval = int(interval or os.getenv('TOTP_INTERVAL_SECONDS', '30'))
+        self.digits = int(digits or os.getenv('TOTP_DIGITS', '6'))
+        self.max_secrets = int(max_secrets or os.getenv('TOTP_KEY_CACHE_SIZE', '10000'))
+        self._secrets = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'verifications': 0, 'key_hits': 0, 'key_misses': 0, 'windows_computed': 0}
+
+    @staticmethod
+    def get_instance():
+        if TOTPVerificationEngine._instance is None:
+            with TOTPVerificationEngine._instance_lock:
+                if TOTPVerificationEngine._instance is None:
+                    TOTPVerificationEngine._instance = TOTPVerificationEngine()
+        return TOTPVerificationEngine._instance
+
+    @staticmethod
+    def decode_secret(secret):
+        secret = secret.replace(' ', '').upper()
+        return base64.b32decode(secret + '=' * (-len(secret) % 8))
+
+    def code_at(self, key, counter):
+        digest = hmac.new(key, struct.pack('>Q', counter), hashlib.sha1).digest()
+        offset = digest[-1] & 0x0F
+        value = struct.unpack('>I', digest[offset:offset + 4])[0] & 0x7FFFFFFF
+        return str(value % 10 ** self.digits).zfill(self.digits)
+
+    def _entry(self, secret):
+        with self._lock:
+            entry = self._secrets.get(secret)
+            if entry is not None:
+                self._secrets.move_to_end(secret)
+                self._metrics['key_hits'] += 1
+                return entry
+            self._metrics['key_misses'] += 1
+
+        entry = _SecretCodes(self.decode_secret(secret))
+        with self._lock:
+            entry = self._secrets.setdefault(secret, entry)
+            while len(self._secrets) > self.max_secrets:
+                self._secrets.popitem(last=False)
+        return entry
+
+    def _window(self, entry, step):
+        """Códigos (paso, código) de step ± valid_window, recalculados solo al cambiar de paso"""
+        # Paso y códigos viajan en una sola tupla: otro hilo nunca ve una ventana a medias
+        current_step, codes = entry.window
+        if current_step == step:
+            return codes
+
+        previous = dict(codes)
+        codes = tuple(
+            (counter, previous.get(counter) or self.code_at(entry.key, counter))
+            for counter in range(max(0, step - self.valid_window), step + self.valid_window + 1)
+        )
+        entry.window = (step, codes)
+        with self._lock:
+            self._metrics['windows_computed'] += 1
+        return codes
+
+    def verify(self, secret, code, for_time=None):
+        if not secret or not code:
+            return False
+        code = str(code).strip()
+        if len(code) != self.digits or not code.isdigit():
+            return False
+
+        step = int((time.time() if for_time is None else for_time) // self.interval)
+        codes = self._window(self._entry(secret), step)
+        with self._lock:
+            self._metrics['verifications'] += 1
+
+        valid = False
+        for _, expected in codes:
+            # Sin cortocircuito: el tiempo no delata en qué paso coincidió
+            valid |= hmac.compare_digest(expected, code)
+        return valid
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._metrics,
+                'cached_secrets': len(self._secrets),
+                'max_secrets': self.max_secrets,
+                'valid_window': self.valid_window,
+                'interval_seconds': self.interval
+            }
@@ -0,0 +1,155 @@
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class QRImageCache:
+    """
+    Cache de imágenes QR direccionada por contenido, en dos niveles:
+    memoria (LRU, QR_CACHE_MEMORY_ENTRIES) y disco (QR_CACHE_DIR, compartido
+    por los workers del mismo host).
+
+    La clave es hash(email) + formato + hash(URI de aprovisionamiento y ajustes
+    de render): la misma URI con los mismos QR_PNG_BOX_SIZE / QR_BORDER /
+    QR_MASK_PATTERN siempre produce los mismos bytes, así que el hash sirve de
+    ETag fuerte, y cambiar un ajuste no sirve imágenes viejas.
+    Al rotar el secreto se borran todas las imágenes del email (el prefijo).
+    La imagen contiene el secreto TOTP: los archivos se escriben con permisos 0600.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, cache_dir=None, memory_entries=None, disk_enabled=None, disk_max_files=None):
+        self.memory_entries = int(memory_entries or os.getenv('QR_CACHE_MEMORY_ENTRIES', '512'))
+        self.disk_enabled = disk_enabled if disk_enabled is not None else (
+            os.getenv('QR_CACHE_DISK_ENABLED', 'true').lower() == 'true'
+        )
+        self.cache_dir = cache_dir or os.getenv('QR_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'auth-qr-cache')
+        self.disk_max_files = int(disk_max_files or os.getenv('QR_CACHE_DISK_MAX_FILES', '10000'))
+        if self.disk_enabled:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self._metrics = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0, 'invalidations': 0}
+
+    @staticmethod
+    def get_instance():
+        if QRImageCache._instance is None:
+            with QRImageCache._instance_lock:
+                if QRImageCache._instance is None:
+                    QRImageCache._instance = QRImageCache()
+        return QRImageCache._instance
+
+    @staticmethod
+    def etag(uri, fmt='png', settings=''):
+        return f"{fmt}-{_digest(f'{uri}#{settings}')[:40]}"
+
+    @staticmethod
+    def key(email, uri, fmt='png', settings=''):
+        return f"{_digest(email.lower())[:16]}-{QRImageCache.etag(uri, fmt, settings)}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _count(self, metric):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def _remember(self, key, image):
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, image):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image)
+            # Reemplazo atómico: otro worker nunca lee un archivo a medias
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el QR en disco: {e}")
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % 64 == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        files = glob.glob(os.path.join(self.cache_dir, '*.bin'))
+        if len(files) <= self.disk_max_files:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in files[:len(files) - self.disk_max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_or_render(self, email, uri, render, fmt='png', settings=''):
+        """Bytes de la imagen: memoria → disco → render() (y se guarda en ambos niveles)"""
+        key = self.key(email, uri, fmt, settings)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self._metrics['memory_hits'] += 1
+                return image
+
+        image = self._read_disk(key) if self.disk_enabled else None
+        if image is not None:
+            self._count('disk_hits')
+            self._remember(key, image)
+            return image
+
+        image = render()
+        self._count('renders')
+        self._remember(key, image)
+        if self.disk_enabled:
+            self._write_disk(key, image)
+        return image
+
+    def invalidate_email(self, email):
+        """Borra todas las imágenes del email (memoria de este proceso y disco compartido)"""
+        prefix = f"{_digest(email.lower())[:16]}-"
+        with self._lock:
+            for key in [key for key in self._memory if key.startswith(prefix)]:
+                del self._memory[key]
+            self._metrics['invalidations'] += 1
+        if self.disk_enabled:
+            for path in glob.glob(os.path.join(self.cache_dir, f"{prefix}*.bin")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._metrics,
+                'memory_entries': len(self._memory),
+                'max_memory_entries': self.memory_entries,
+                'disk': self.cache_dir if self.disk_enabled else 'disabled'
+            }
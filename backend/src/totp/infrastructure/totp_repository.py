@@ -1,109 +1,31 @@
-import bcrypt
-import html
-import re
+import os
 from datetime import datetime
 from shared.database.mongo_connection import MongoDB
+from shared.database.user_cache import remember_user, forget_user
+from shared.models.user_read_models import find_read_model, TOTP_SECRET
+from shared.security.input_sanitizer import sanitize_input
+from shared.security.password_hasher import PasswordHasher
 from ..ports.user_repository_port import UserRepositoryPort
+from .qr_image_cache import QRImageCache
 
 class TOTPRepository(UserRepositoryPort):
     def __init__(self):
         self.db = MongoDB.get_db()
         self.users = self.db.users
+        self.password_hasher = PasswordHasher.get_instance()
+        # Migración perezosa a bcrypt; se apaga tras correr migrations/hash_legacy_passwords.py
+        self.lazy_password_migration = os.getenv('LAZY_PASSWORD_MIGRATION', 'true').lower() == 'true'
     
     def _hash_password(self, password):
-        """Cifra la contraseña usando bcrypt"""
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        """Cifra la contraseña usando bcrypt (en el pool acotado de PasswordHasher)"""
+        return self.password_hasher.hash_password(password)
     
     def _sanitize_input(self, text):
         """
-        Sanitización CORREGIDA - ahora SÍ bloquea atributos HTML peligrosos
+        Sanitización delegada al motor compartido (reglas precompiladas + memo LRU)
         """
-        if not text:
-            return text
-        
-        print(f"🧹 TOTP - ANTES de sanitizar: '{text}'")
-        
-        # ✅ DETECCIÓN DE PATRONES PELIGROSOS (MEJORADO)
-        critical_patterns = [
-            # Patrones de ejecución
-            r'javascript\s*:',  
-            r'data\s*:',
-            r'vbscript\s*:',
-            r'on\w+\s*=',
-            
-            # ✅ NUEVO: Atributos HTML peligrosos
-            r'\bhref\b',           # Bloquea href
-            r'\bsrc\b',            # Bloquea src  
-            r'\baction\b',         # Bloquea action
-            r'\bformaction\b',     # Bloquea formaction
-            r'\bposter\b',         # Bloquea poster
-            r'\bbackground\b',     # Bloquea background
-            r'\bstyle\b',          # Bloquea style (puede contener expression())
-            
-            # Palabras peligrosas en cualquier parte
-            r'script',
-            r'alert',
-            r'eval',
-            r'expression',
-            r'onload',
-            r'onerror', 
-            r'onclick',
-            r'oninput',
-            r'onmouseover',
-            r'onchange',
-            r'onsubmit',
-            r'onkeydown',
-            r'onkeyup',
-            r'onfocus',
-            r'onblur',
-            r'onmouseenter',
-            r'onmouseleave',
-            r'ondblclick',
-            r'oncontextmenu',
-            r'onpointerenter',
-            r'onauxclick',
-            r'onbeforeinput',
-            r'oncompositionend',
-        ]
-        
-        text_lower = text.lower()
-        for pattern in critical_patterns:
-            if re.search(pattern, text_lower, flags=re.IGNORECASE):
-                print(f"🚫 TOTP - PATRÓN PELIGROSO DETECTADO: {pattern}")
-                return "***BLOCKED***"
-        
-        # ✅ DETECCIÓN DE MÚLTIPLES PALABRAS PELIGROSAS
-        suspicious_pattern = r'(script|javascript|alert|eval|onload|onerror|onclick|oninput|href|src|action){2,}'
-        if re.search(suspicious_pattern, text, flags=re.IGNORECASE):
-            print(f"⚠️ TOTP - PATRÓN SOSPECHOSO DETECTADO: Múltiples palabras peligrosas juntas")
-            return "***BLOCKED***"
-        
-        # ✅ ESCAPE HTML (tu lógica original - SE MANTIENE)
-        text = html.escape(text)
-        
-        # ✅ BLOQUEAR PALABRAS PELIGROSAS COMPLETAS (tu lógica original - SE MANTIENE)
-        dangerous_words = [
-            'script', 'javascript', 'alert', 'eval', 
-            'onload', 'onerror', 'onclick', 'oninput', 'onmouseover',
-            'onchange', 'onsubmit', 'onkeydown', 'onkeyup', 'onfocus',
-            'onblur', 'onmouseout', 'onmousemove', 'onmouseenter',
-            'onmouseleave', 'ondblclick', 'oncontextmenu',
-            # ✅ NUEVO: Atributos HTML peligrosos como palabras completas
-            'href', 'src', 'action', 'formaction', 'poster', 'background', 'style'
-        ]
-        
-        for word in dangerous_words:
-            pattern = r'\b' + re.escape(word) + r'\b'
-            text = re.sub(pattern, '***', text, flags=re.IGNORECASE)
-        
-        text = text.strip()
-        
-        print(f"🧹 TOTP - DESPUÉS de sanitizar: '{text}'")
-        
-        return text
-    
+        return sanitize_input(text, log_prefix="TOTP - ")
+
     def save_user(self, email, secret, password, first_name, auth_method="totp"):
         print("=" * 60)
         print("🔐 TOTP REPOSITORY - SAVE_USER")
@@ -128,6 +50,8 @@ class TOTPRepository(UserRepositoryPort):
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         })
+        forget_user(email)
+        QRImageCache.get_instance().invalidate_email(email)
         
         print(f"✅ TOTP User creado con ID: {result.inserted_id}")
         print("=" * 60)
@@ -136,13 +60,27 @@ class TOTPRepository(UserRepositoryPort):
     
     # 🔁 TODOS LOS DEMÁS MÉTODOS SE MANTIENEN EXACTAMENTE IGUAL
     def get_secret_by_email(self, email):
-        user = self.users.find_one({"email": email})
+        # Siempre MongoDB: tras rotar el secreto, el anterior deja de valer en todos los workers
+        user = self.users.find_one({"email": email}, TOTP_SECRET)
         return user.get("secret") if user else None
     
+    def get_secrets_by_emails(self, emails):
+        """Secretos TOTP de varios usuarios en una sola consulta ($in): email → secreto"""
+        cursor = self.users.find(
+            {"email": {"$in": list(emails)}, "secret": {"$ne": None}},
+            {"_id": 0, "email": 1, "secret": 1}
+        )
+        return {user["email"]: user["secret"] for user in cursor if user.get("secret")}
+    
+    def find_profile_by_email(self, email):
+        """Perfil público (read model PROFILE), sin hash ni secreto"""
+        return find_read_model(self.users, email, 'profile')
+    
     def find_user_by_email(self, email):
+        # Documento completo con credenciales: siempre desde MongoDB (la cache solo guarda la vista sin ellas)
         user = self.users.find_one({"email": email})
         
-        if user and 'password' in user:
+        if self.lazy_password_migration and user and 'password' in user:
             current_password = user['password']
             if not current_password.startswith('$2'):
                 print(f"🔄 TOTP - Migrando contraseña a bcrypt para: {email}")
@@ -153,10 +91,15 @@ class TOTPRepository(UserRepositoryPort):
                 )
                 user['password'] = hashed_password
         
+        remember_user(email, user)
         return user
     
     def update_user_secret(self, email, secret):
-        return self.users.update_one(
+        result = self.users.update_one(
             {"email": email},
             {"$set": {"secret": secret, "updated_at": datetime.utcnow()}}
-        )
\ No newline at end of file
+        )
+        forget_user(email)
+        # El QR del secreto anterior deja de servirse (memoria y disco)
+        QRImageCache.get_instance().invalidate_email(email)
+        return result
\ No newline at end of file
@@ -1,6 +1,36 @@
 from abc import ABC, abstractmethod
 
+# Formatos de imagen QR (negociados en GET /api/auth/totp/qr)
+QR_FORMAT_PNG = 'png'              # PNG de qrcode + PIL (490 px)
+QR_FORMAT_PNG_1BIT = 'png-1bit'    # PNG 1 bit/píxel sin PIL, escalado a QR_PNG_BOX_SIZE
+QR_FORMAT_SVG = 'svg'              # SVG de texto, sin PIL
+
+QR_MIMETYPES = {
+    QR_FORMAT_PNG: 'image/png',
+    QR_FORMAT_PNG_1BIT: 'image/png',
+    QR_FORMAT_SVG: 'image/svg+xml'
+}
+
 class QRServicePort(ABC):
     @abstractmethod
     def generate_qr_image(self, uri: str) -> bytes:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def generate_qr_png_1bit(self, uri: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def generate_qr_svg(self, uri: str) -> str:
+        pass
+
+    def render_settings(self) -> str:
+        """Ajustes que cambian los bytes de la imagen (entran en la clave de cache y el ETag)"""
+        return ''
+
+    def generate(self, uri: str, fmt: str = QR_FORMAT_PNG) -> bytes:
+        if fmt == QR_FORMAT_SVG:
+            return self.generate_qr_svg(uri).encode('utf-8')
+        if fmt == QR_FORMAT_PNG_1BIT:
+            return self.generate_qr_png_1bit(uri)
+        return self.generate_qr_image(uri)
\ No newline at end of file
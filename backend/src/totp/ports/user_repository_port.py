@@ -9,6 +9,14 @@ class UserRepositoryPort(ABC):
     def get_secret_by_email(self, email):
         pass
     
+    @abstractmethod
+    def get_secrets_by_emails(self, emails):
+        pass
+    
     @abstractmethod
     def find_user_by_email(self, email):
+        pass
+    
+    @abstractmethod
+    def find_profile_by_email(self, email):
         pass
\ No newline at end of file
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# Mismo esquema de importaciones que main.py: paquetes absolutos desde src
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+# Sin Mongo ni proveedores reales: stores en memoria y credenciales de prueba
+os.environ.setdefault('OTP_STORE_BACKEND', 'memory')
+os.environ.setdefault('ENSURE_INDEXES_ON_STARTUP', 'false')
+os.environ.setdefault('TWILIO_ACCOUNT_SID', 'ACtest')
+os.environ.setdefault('TWILIO_AUTH_TOKEN', 'test')
+os.environ.setdefault('TWILIO_FROM_NUMBER', '+15550000000')
+os.environ.setdefault('BREVO_API_KEY', 'test')
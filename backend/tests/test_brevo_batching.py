@@ -0,0 +1,82 @@
+import socket
+import threading
+import time
+
+import pytest
+import requests
+import uvicorn
+
+from email_otp.infrastructure.brevo_batch_sender import BrevoBatchSender
+from email_otp.infrastructure.brevo_email_adapter import BrevoEmailAdapter
+from simulators.brevo_simulator import BrevoSimulator
+from simulators.provider_simulator import SimulatorProfile
+
+
+@pytest.fixture(scope='module')
+def brevo_sim():
+    """Simulador de Brevo (user-020) servido por uvicorn en un hilo, en un puerto libre"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    simulator = BrevoSimulator(SimulatorProfile(latency_ms=20, latency_dist='fixed'))
+    server = uvicorn.Server(uvicorn.Config(simulator.app(), host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, 'el simulador no arrancó'
+        time.sleep(0.02)
+    yield f'http://127.0.0.1:{port}'
+    server.should_exit = True
+    thread.join(5)
+
+
+@pytest.fixture
+def sender(brevo_sim, monkeypatch):
+    monkeypatch.setenv('BREVO_BASE_URL', brevo_sim)
+    monkeypatch.setenv('BREVO_SENDER_EMAIL', 'noreply@example.com')
+    monkeypatch.setenv('BREVO_SENDER_NAME', 'OTP')
+    requests.post(f'{brevo_sim}/__reset')
+    return BrevoBatchSender(adapter=BrevoEmailAdapter(), window_ms=200, max_batch_size=25)
+
+
+def _requests(brevo_sim):
+    return requests.get(f'{brevo_sim}/__stats').json()['requests']
+
+
+def _burst(sender, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def send(i):
+        barrier.wait()
+        results[i] = sender.send_otp_email(f'user{i}@example.com', f'{i:06d}')
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_lone_caller_does_not_wait_for_the_window(sender, brevo_sim):
+    # Worker sync de gunicorn: nunca hay otro envío en el proceso
+    started = time.monotonic()
+    assert sender.send_otp_email('solo@example.com', '123456')
+    assert time.monotonic() - started < sender.window
+    assert sender.stats()['batching']['concurrent'] is False
+    assert _requests(brevo_sim) == 1
+
+
+def test_100_concurrent_sends_go_out_in_4_requests(sender, brevo_sim):
+    # La primera ráfaga descubre que el proceso es concurrente
+    assert all(_burst(sender, 10))
+    assert sender.stats()['batching']['concurrent'] is True
+    requests.post(f'{brevo_sim}/__reset')
+
+    assert all(_burst(sender, 100))
+    assert _requests(brevo_sim) == 4
+    messages = requests.get(f'{brevo_sim}/__messages', params={'limit': 200}).json()['messages']
+    assert len(messages) == 100
+    assert {m['params']['otp_code'] for m in messages} == {f'{i:06d}' for i in range(100)}
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import pytest
+from twilio.base.exceptions import TwilioRestException
+
+from shared.resilience.circuit_breaker import CircuitBreaker, ProviderUnavailableError, RecipientRejected, CLOSED, OPEN
+from email_otp.infrastructure.brevo_email_adapter import BrevoEmailAdapter
+from sms_otp.infrastructure.circuit_breaker_sms_adapter import CircuitBreakerSMSAdapter
+from sms_otp.infrastructure.twilio_sms_adapter import TwilioSMSAdapter
+
+
+def _breaker(name):
+    return CircuitBreaker(name, min_calls=5, failure_rate=0.5, open_seconds=30)
+
+
+class _InvalidNumberMessages:
+    def create(self, **kwargs):
+        raise TwilioRestException(400, '/Messages.json', "The 'To' number is not valid", code=21211, method='POST')
+
+
+class _DownMessages:
+    def __init__(self, status=503):
+        self.status = status
+
+    def create(self, **kwargs):
+        raise TwilioRestException(self.status, '/Messages.json', 'Provider error', method='POST')
+
+
+def _twilio(messages):
+    adapter = TwilioSMSAdapter()
+    adapter.client = SimpleNamespace(messages=messages)
+    return adapter
+
+
+def test_invalid_numbers_do_not_open_the_circuit():
+    breaker = _breaker('test_sms_recipients')
+    service = CircuitBreakerSMSAdapter(_twilio(_InvalidNumberMessages()), breaker)
+
+    for _ in range(50):
+        result = service.send_otp('+000', '123456')
+        assert not result
+        assert isinstance(result, RecipientRejected)
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.parametrize('status', [503, 401, 403])
+def test_provider_errors_still_open_the_circuit(status):
+    # 401/403: API key revocada o cuenta suspendida, no un destinatario malo
+    breaker = _breaker(f'test_sms_outage_{status}')
+    service = CircuitBreakerSMSAdapter(_twilio(_DownMessages(status)), breaker)
+
+    for _ in range(5):
+        assert service.send_otp('+15550001', '123456') is False
+    assert breaker.state == OPEN
+
+
+class _FakeSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def post(self, *args, **kwargs):
+        return SimpleNamespace(status_code=self.status_code, text='{}', headers={})
+
+
+@pytest.mark.parametrize('status', [400, 404, 422])
+def test_brevo_classifies_payload_errors_as_recipient(status):
+    rejected = BrevoEmailAdapter(session=_FakeSession(status))
+    assert isinstance(rejected.send_otp_email('no-es-email', '123456'), RecipientRejected)
+
+
+@pytest.mark.parametrize('status', [401, 403, 429])
+def test_brevo_classifies_credential_and_rate_errors_as_failure(status):
+    failing = BrevoEmailAdapter(session=_FakeSession(status))
+    failing.max_retries = 0
+    assert failing.send_otp_email('a@x.com', '123456') is False
+
+
+def test_brevo_batch_does_not_resend_one_by_one_on_401():
+    from email_otp.infrastructure.brevo_batch_sender import BrevoBatchSender, _PendingEmail
+
+    session = _FakeSession(401)
+    session.calls = 0
+    post = session.post
+
+    def counting_post(*args, **kwargs):
+        session.calls += 1
+        return post(*args, **kwargs)
+
+    session.post = counting_post
+    adapter = BrevoEmailAdapter(session=session)
+    adapter.max_retries = 0
+    sender = BrevoBatchSender(adapter=adapter, window_ms=0, max_batch_size=10)
+    items = [_PendingEmail(f'u{i}@x.com', '123456') for i in range(5)]
+
+    sender._send_batch(items, None, None)
+    assert session.calls == 1
+    assert not any(item.success for item in items)
+    assert sender.stats()['batching']['fallbacks'] == 0
+
+
+class _OpenCircuitSMS:
+    def send_otp(self, phone_number, otp):
+        raise ProviderUnavailableError('sms', 7)
+
+
+def test_open_circuit_maps_to_503_with_retry_after():
+    import main
+    from shared.bootstrap.dependencies import container
+
+    client = main.app.test_client()
+    with container.override('sms_service', _OpenCircuitSMS()):
+        response = client.post('/api/auth/sms/send-otp', json={'phone': '+15550001'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+    assert response.get_json()['success'] is False
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from shared.bootstrap import lazy
+from shared.bootstrap.container import Container, DependencyCycleError, PER_WORKER, SINGLETON
+
+
+def test_singleton_is_built_once_and_rebuilt_after_reset():
+    container = Container()
+    container.register('thing', lambda c: object(), SINGLETON)
+
+    first = container.resolve('thing')
+    assert container.resolve('thing') is first
+    container.reset('thing')
+    assert container.resolve('thing') is not first
+
+
+def test_per_worker_is_rebuilt_in_a_forked_process(monkeypatch):
+    container = Container()
+    container.register('client', lambda c: object(), PER_WORKER)
+    container.register('config', lambda c: object(), SINGLETON)
+    client, config = container.resolve('client'), container.resolve('config')
+
+    # Otro pid = proceso worker tras el fork
+    monkeypatch.setattr(lazy.os, 'getpid', lambda: -1)
+    assert container.resolve('client') is not client
+    assert container.resolve('config') is config
+
+
+def test_resolve_never_sees_a_half_reset_registration():
+    container = Container()
+    container.register('thing', lambda c: object(), SINGLETON)
+    stop = threading.Event()
+    seen_none = []
+
+    def reader():
+        while not stop.is_set():
+            if container.resolve('thing') is None:
+                seen_none.append(True)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for _ in range(2000):
+        container.reset()
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert not seen_none
+
+
+def test_cycles_are_reported():
+    container = Container()
+    container.register('a', lambda c: c.resolve('b'))
+    container.register('b', lambda c: c.resolve('a'))
+    with pytest.raises(DependencyCycleError):
+        container.resolve('a')
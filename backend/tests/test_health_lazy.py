@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+PROBE = """
+import sys
+import main
+body = main.app.test_client().get('/health').get_json()
+print(body['email_provider'], 'requests' in sys.modules)
+"""
+
+
+def test_health_does_not_build_the_email_provider():
+    # Proceso nuevo: en este ya se importaron requests y el proveedor en otras pruebas
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=SRC_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == 'not initialized False'
@@ -0,0 +1,55 @@
+import time
+
+from shared.resilience.circuit_breaker import CircuitBreaker, ProviderUnavailableError, CLOSED, OPEN
+from shared.resilience.hedged_router import HedgedRouter, ProviderRoute
+
+
+class FlakyProvider:
+    def __init__(self):
+        self.healthy = True
+        self.calls = 0
+
+    def send(self, phone, otp):
+        self.calls += 1
+        return self.healthy
+
+
+def _route(name, provider, open_seconds=0.2):
+    breaker = CircuitBreaker(f"test_{name}", min_calls=2, failure_rate=0.5, open_seconds=open_seconds)
+    return ProviderRoute(name, provider.send, 1, breaker)
+
+
+def test_provider_recovers_after_open_seconds():
+    first, second = FlakyProvider(), FlakyProvider()
+    router = HedgedRouter('sms', [_route('a', first), _route('b', second)], max_hedges=0)
+
+    first.healthy = second.healthy = False
+    # Cada envío hace failover por ambos proveedores: dos envíos abren los dos circuitos
+    for _ in range(2):
+        assert router.send('+15550001', '123456') is False
+    assert all(route.breaker.state == OPEN for route in router.routes)
+
+    calls_before = first.calls + second.calls
+    try:
+        router.send('+15550001', '123456')
+        raise AssertionError('con todos los circuitos abiertos se espera ProviderUnavailableError')
+    except ProviderUnavailableError:
+        pass
+    assert first.calls + second.calls == calls_before
+
+    first.healthy = second.healthy = True
+    time.sleep(0.25)
+    assert router.send('+15550001', '123456') is True
+    assert first.calls + second.calls > calls_before
+    assert any(route.breaker.state == CLOSED for route in router.routes)
+
+
+def test_allows_request_has_no_side_effects():
+    breaker = CircuitBreaker('test_allows', min_calls=1, failure_rate=0.5, open_seconds=0.1)
+    breaker.before_call()
+    breaker.after_call(False, 0.01)
+    assert breaker.state == OPEN
+    assert breaker.allows_request() is False
+    time.sleep(0.15)
+    assert breaker.allows_request() is True
+    assert breaker.state == OPEN
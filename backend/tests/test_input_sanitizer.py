@@ -0,0 +1,119 @@
+import html
+import itertools
+import re
+
+import pytest
+
+from shared.security import input_sanitizer
+from shared.security.input_sanitizer import sanitize_input
+
+
+def legacy_sanitize_input(text):
+    """
+    Copia congelada de UserRepository._sanitize_input antes del motor compartido
+    (commit baseline), sin los print. La salida de sanitize_input debe ser idéntica.
+    """
+    if not text:
+        return text
+
+    critical_patterns = [
+        r'javascript\s*:',
+        r'data\s*:',
+        r'vbscript\s*:',
+        r'on\w+\s*=',
+        r'\bhref\b',
+        r'\bsrc\b',
+        r'\baction\b',
+        r'\bformaction\b',
+        r'\bposter\b',
+        r'\bbackground\b',
+        r'\bstyle\b',
+        r'script',
+        r'alert',
+        r'eval',
+        r'expression',
+        r'onload',
+        r'onerror',
+        r'onclick',
+        r'oninput',
+        r'onmouseover',
+        r'onchange',
+        r'onsubmit',
+        r'onkeydown',
+        r'onkeyup',
+        r'onfocus',
+        r'onblur',
+        r'onmouseenter',
+        r'onmouseleave',
+        r'ondblclick',
+        r'oncontextmenu',
+        r'onpointerenter',
+        r'onauxclick',
+        r'onbeforeinput',
+        r'oncompositionend',
+    ]
+
+    text_lower = text.lower()
+    for pattern in critical_patterns:
+        if re.search(pattern, text_lower, flags=re.IGNORECASE):
+            return "***BLOCKED***"
+
+    suspicious_pattern = r'(script|javascript|alert|eval|onload|onerror|onclick|oninput|href|src|action){2,}'
+    if re.search(suspicious_pattern, text, flags=re.IGNORECASE):
+        return "***BLOCKED***"
+
+    text = html.escape(text)
+
+    dangerous_words = [
+        'script', 'javascript', 'alert', 'eval',
+        'onload', 'onerror', 'onclick', 'oninput', 'onmouseover',
+        'onchange', 'onsubmit', 'onkeydown', 'onkeyup', 'onfocus',
+        'onblur', 'onmouseout', 'onmousemove', 'onmouseenter',
+        'onmouseleave', 'ondblclick', 'oncontextmenu',
+        'href', 'src', 'action', 'formaction', 'poster', 'background', 'style'
+    ]
+
+    for word in dangerous_words:
+        pattern = r'\b' + re.escape(word) + r'\b'
+        text = re.sub(pattern, '***', text, flags=re.IGNORECASE)
+
+    return text.strip()
+
+
+BENIGN = [
+    'Ana', 'José María', 'O\'Connor', 'Zoë', 'Nguyễn', '李雷', 'Ann-Marie', '  espacios  ',
+    'Dr. Smith Jr.', 'Renée & Co', 'Evaluna', 'Scripps', 'Actionable', 'Stylez', 'Sourcing', 'Datum',
+]
+XSS = [
+    '<script>alert(1)</script>', '<img src=x onerror=alert(1)>', 'javascript:alert(1)',
+    'JaVaScRiPt :void(0)', '<a href="x">clic</a>', '" onmouseover="x"', '<svg onload=x>',
+    'data:text/html;base64,PHNjcmlwdD4=', 'vbscript:msgbox', '<div style="x:expression(1)">',
+    '<body background=x>', '<video poster=x>', '<form action=x>', '<button formaction=x>',
+    'onmouseout', 'ONMOUSEMOVE', 'x onmouseout y', '<b onauxclick =x>', 'eval(atob("x"))',
+]
+SQL = [
+    "' OR '1'='1", "1; DROP TABLE users; --", "admin'--", "\" OR \"\"=\"", "1 UNION SELECT password FROM users",
+    "Robert'); DROP TABLE Students;--",
+]
+MIXED_CASE = [
+    'SCRIPT', 'ScRiPt', 'AlErT', 'OnClick=1', 'HREF', 'Src', 'ActionHero', 'STYLE sheet',
+    'Mouse ONMOUSEOUT', 'onMouseMove here', 'Background check',
+]
+FRAGMENTS = ['Ana', '<b>', 'onmouseout', 'src', '&', '"', "'", ' ', 'ON', 'load', 'Style', '=']
+
+CORPUS = BENIGN + XSS + SQL + MIXED_CASE + [
+    ''.join(parts) for parts in itertools.product(FRAGMENTS, repeat=2)
+] + [' '.join(parts) for parts in itertools.product(FRAGMENTS[:6], repeat=3)]
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_matches_legacy_implementation(text):
+    input_sanitizer._sanitize_cached.cache_clear()
+    assert sanitize_input(text) == legacy_sanitize_input(text)
+    # Segunda llamada: la respuesta memorizada también es idéntica
+    assert sanitize_input(text) == legacy_sanitize_input(text)
+
+
+@pytest.mark.parametrize('text', ['', None])
+def test_empty_values_pass_through(text):
+    assert sanitize_input(text) == legacy_sanitize_input(text)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from notification_worker import NotificationWorker
+from shared.outbox.notification_outbox import NotificationOutbox, DEAD, SENT
+
+
+class RecordingSender:
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = []
+
+    def __call__(self, recipient, otp, **options):
+        self.calls.append((recipient, otp))
+        return self.result
+
+
+@pytest.fixture
+def outbox():
+    return NotificationOutbox(db=mongomock.MongoClient().db)
+
+
+def _worker(outbox, sender):
+    return NotificationWorker(outbox=outbox, senders={'sms': sender})
+
+
+def test_expired_message_is_not_delivered_after_retry(outbox):
+    sender = RecordingSender()
+    message_id = outbox.enqueue('sms', '+15550001', '123456')
+    # Reintento programado cuando el OTP ya venció
+    outbox.collection.update_one({'_id': message_id}, {'$set': {'deliver_before': datetime.utcnow() - timedelta(seconds=1)}})
+
+    status = _worker(outbox, sender).deliver(outbox.claim('w1'))
+
+    assert status == DEAD
+    assert sender.calls == []
+    stored = outbox.collection.find_one({'_id': message_id})
+    assert stored['last_error'] == 'expired before delivery'
+    assert 'otp' not in stored['payload']
+
+
+def test_dead_letter_drops_the_otp(outbox):
+    outbox.max_attempts = 1
+    message_id = outbox.enqueue('sms', '+15550001', '123456')
+
+    status = _worker(outbox, RecordingSender(result=False)).deliver(outbox.claim('w1'))
+
+    assert status == DEAD
+    assert 'otp' not in outbox.collection.find_one({'_id': message_id})['payload']
+
+
+def test_fresh_message_is_delivered(outbox):
+    sender = RecordingSender()
+    message_id = outbox.enqueue('sms', '+15550001', '123456')
+
+    assert _worker(outbox, sender).deliver(outbox.claim('w1')) == 'sent'
+    assert sender.calls == [('+15550001', '123456')]
+    assert outbox.collection.find_one({'_id': message_id})['status'] == SENT
+
+
+def test_sms_older_than_its_ttl_is_not_delivered(outbox):
+    from sms_otp.infrastructure.outbox_sms_adapter import OutboxSMSAdapter
+    from sms_otp.ports.sms_service_port import SMS_OTP_EXPIRY_MINUTES
+
+    assert OutboxSMSAdapter(outbox).send_otp('+15550001', '123456')
+    message = outbox.collection.find_one({'recipient': '+15550001'})
+    # deliver_before = vencimiento del código (5 min), no NOTIFICATION_OUTBOX_MAX_AGE_SECONDS (10 min)
+    assert message['deliver_before'] - message['created_at'] == timedelta(minutes=SMS_OTP_EXPIRY_MINUTES)
+
+    # El worker lo toma 6 minutos después de encolarlo (p. ej. tras una caída)
+    older = datetime.utcnow() - timedelta(minutes=SMS_OTP_EXPIRY_MINUTES + 1)
+    outbox.collection.update_one({'_id': message['_id']}, {'$set': {
+        'created_at': older,
+        'deliver_before': older + (message['deliver_before'] - message['created_at'])
+    }})
+    sender = RecordingSender()
+
+    assert _worker(outbox, sender).deliver(outbox.claim('w1')) == DEAD
+    assert sender.calls == []
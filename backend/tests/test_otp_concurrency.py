@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from email_otp.infrastructure.email_otp_repository import EmailOTPRepository
+from shared.otp_store.memory_otp_store import InMemoryOTPStore
+from sms_otp.infrastructure.sms_otp_repository import SMSOTPRepository
+
+THREADS = 32
+
+
+def _race(func, threads=THREADS):
+    """Lanza `threads` llamadas a la vez (barrera) y devuelve sus resultados"""
+    barrier = threading.Barrier(threads)
+
+    def run():
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [future.result() for future in [pool.submit(run) for _ in range(threads)]]
+
+
+@pytest.fixture
+def email_repo():
+    repo = EmailOTPRepository(store=InMemoryOTPStore('email_otps', 'email', 'expires_at'))
+    repo.max_attempts = 5
+    return repo
+
+
+@pytest.fixture
+def sms_repo():
+    repo = SMSOTPRepository(store=InMemoryOTPStore('sms_otps', 'phone', 'expires'))
+    repo.max_attempts = 5
+    return repo
+
+
+def test_email_otp_is_consumed_exactly_once(email_repo):
+    code = email_repo.generate_otp('a@x.com')
+    results = _race(lambda: email_repo.verify_otp('a@x.com', code))
+    assert results.count(True) == 1
+
+
+def test_sms_otp_is_consumed_exactly_once(sms_repo):
+    sms_repo.save_otp('+15550001', '123456', datetime.now() + timedelta(minutes=5))
+    results = _race(lambda: sms_repo.consume_valid_otp('+15550001', '123456'))
+    assert sum(1 for result in results if result) == 1
+
+
+def test_email_max_attempts_is_enforced_under_concurrency(email_repo):
+    code = email_repo.generate_otp('b@x.com')
+    wrong = '000000' if code != '000000' else '111111'
+
+    assert _race(lambda: email_repo.verify_otp('b@x.com', wrong)).count(True) == 0
+    # Tras max_attempts fallos el código correcto ya no sirve
+    assert email_repo.verify_otp('b@x.com', code) is False
+
+
+def test_sms_max_attempts_is_enforced_under_concurrency(sms_repo):
+    sms_repo.save_otp('+15550002', '123456', datetime.now() + timedelta(minutes=5))
+
+    def wrong_attempt():
+        if not sms_repo.consume_valid_otp('+15550002', '999999'):
+            sms_repo.register_failed_attempt('+15550002')
+
+    _race(wrong_attempt)
+    assert not sms_repo.consume_valid_otp('+15550002', '123456')
+
+
+def test_attempts_below_the_limit_still_allow_the_right_code(email_repo):
+    code = email_repo.generate_otp('c@x.com')
+    wrong = '000000' if code != '000000' else '111111'
+
+    _race(lambda: email_repo.verify_otp('c@x.com', wrong), threads=email_repo.max_attempts - 1)
+    results = _race(lambda: email_repo.verify_otp('c@x.com', code), threads=8)
+    assert results.count(True) == 1
@@ -0,0 +1,35 @@
+import time
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from email_otp.infrastructure.email_otp_repository import EmailOTPRepository
+from email_otp.ports.email_service_port import EMAIL_OTP_EXPIRY_MINUTES
+from shared.otp_store.memory_otp_store import InMemoryOTPStore
+from shared.otp_store.mongo_otp_store import MongoOTPStore
+
+
+@pytest.fixture(params=['America/Bogota', 'Asia/Tokyo'])
+def host_timezone(request, monkeypatch):
+    """Host fuera de UTC: datetime.now() difiere de lo que MongoDB lee como UTC"""
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_expiry_is_written_in_utc_for_the_ttl_index(host_timezone):
+    store = MongoOTPStore('email_otps', 'email', 'expires_at', db=mongomock.MongoClient().db)
+    EmailOTPRepository(store=store).generate_otp('a@x.com')
+
+    expires_at = store.collection.find_one({'email': 'a@x.com'})['expires_at']
+    remaining = expires_at - datetime.utcnow()
+    assert timedelta(minutes=EMAIL_OTP_EXPIRY_MINUTES - 1) < remaining <= timedelta(minutes=EMAIL_OTP_EXPIRY_MINUTES)
+
+
+def test_memory_store_reads_utc_expiry(host_timezone):
+    repo = EmailOTPRepository(store=InMemoryOTPStore('email_otps', 'email', 'expires_at'))
+    code = repo.generate_otp('b@x.com')
+    assert repo.verify_otp('b@x.com', code)
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from shared.otp_store.memory_otp_store import InMemoryOTPStore
+from shared.otp_store.mongo_otp_store import MongoOTPStore
+
+
+@pytest.fixture(params=['memory', 'mongo'])
+def store(request):
+    if request.param == 'memory':
+        return InMemoryOTPStore('contract_otps', 'email', 'expires_at')
+    return MongoOTPStore('contract_otps', 'email', 'expires_at', db=mongomock.MongoClient().db)
+
+
+def test_increment_and_delete_return_bools(store):
+    store.put('a@x.com', {'otp': '123456', 'attempts': 0}, datetime.now() + timedelta(minutes=5))
+
+    assert store.increment('a@x.com', 'attempts') is True
+    assert store.increment('missing@x.com', 'attempts') is False
+    assert store.delete('a@x.com') is True
+    assert store.delete('a@x.com') is False
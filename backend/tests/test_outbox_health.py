@@ -0,0 +1,41 @@
+import mongomock
+import pytest
+
+from shared.outbox.notification_outbox import NotificationOutbox
+from shared.resilience.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    monkeypatch.setenv('NOTIFICATION_DELIVERY', 'outbox')
+    outbox = NotificationOutbox(db=mongomock.MongoClient().db)
+    monkeypatch.setattr(NotificationOutbox, '_instance', outbox)
+    return outbox
+
+
+def test_health_reports_breakers_published_by_the_worker(outbox):
+    import main
+    from notification_worker import NotificationWorker
+
+    breaker = CircuitBreaker('sms')
+    breaker.state = 'open'
+    worker = NotificationWorker(outbox=outbox, senders={'sms': lambda *args: True})
+    worker.worker_id = 'worker-1'
+    outbox.publish_worker_status(worker.worker_id, {'sms': breaker.stats()}, worker.metrics.snapshot())
+
+    client = main.app.test_client()
+    response = client.get('/health?strict=true')
+    body = response.get_json()
+    assert body['circuit_breakers']['sms@worker-1']['state'] == 'open'
+    assert body['status'] == 'degraded'
+    assert response.status_code == 503
+
+    outbox.remove_worker_status('worker-1')
+    body = client.get('/health').get_json()
+    assert 'sms@worker-1' not in body['circuit_breakers']
+
+
+def test_stale_worker_status_is_ignored(outbox):
+    outbox.worker_status_ttl = -1
+    outbox.publish_worker_status('worker-2', {'email': {'state': 'open'}})
+    assert outbox.worker_circuit_breakers() == {}
@@ -0,0 +1,29 @@
+import bcrypt
+
+from shared.security.password_hasher import PasswordHasher
+
+
+def _hash(rounds):
+    return bcrypt.hashpw(b'clave-123', bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def test_rehash_only_upgrades_the_cost(monkeypatch):
+    monkeypatch.setenv('PASSWORD_HASH_ROUNDS', '5')
+    hasher = PasswordHasher(workers=1)
+
+    assert hasher.needs_rehash(_hash(4))
+    assert not hasher.needs_rehash(_hash(5))
+    # Otro worker calibró más alto: este no lo baja (ni escribe en Mongo en cada login)
+    assert not hasher.needs_rehash(_hash(6))
+
+
+def test_workers_with_different_costs_converge(monkeypatch):
+    monkeypatch.setenv('PASSWORD_HASH_ROUNDS', '4')
+    worker_a = PasswordHasher(workers=1)
+    monkeypatch.setenv('PASSWORD_HASH_ROUNDS', '5')
+    worker_b = PasswordHasher(workers=1)
+
+    stored = worker_a.hash_password('clave-123')
+    assert worker_b.needs_rehash(stored)
+    stored = worker_b.hash_password('clave-123')
+    assert not worker_a.needs_rehash(stored) and not worker_b.needs_rehash(stored)
@@ -0,0 +1,15 @@
+from email_otp.infrastructure import email_service_factory
+from shared.bootstrap import lazy
+from sms_otp.infrastructure import sms_service_factory
+
+
+def test_sms_and_email_providers_are_rebuilt_after_fork(monkeypatch):
+    sms = sms_service_factory.provider_sms_service()
+    email = email_service_factory.provider_email_service()
+    assert sms_service_factory.provider_sms_service() is sms
+    assert email_service_factory.provider_email_service() is email
+
+    # Otro pid = proceso worker tras el fork: no hereda los clientes HTTP
+    monkeypatch.setattr(lazy.os, 'getpid', lambda: -1)
+    assert sms_service_factory.provider_sms_service() is not sms
+    assert email_service_factory.provider_email_service() is not email
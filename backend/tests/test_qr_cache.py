@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from totp.adapters.http.qr_generator_adapter import QRGeneratorAdapter
+from totp.application.generate_qr_usecase import GenerateQRUseCase
+from totp.infrastructure.qr_image_cache import QRImageCache
+from totp.ports.qr_service_port import QR_FORMAT_PNG_1BIT
+
+SECRET = 'JBSWY3DPEHPK3PXP'
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def test_render_settings_change_the_etag_and_the_cached_image(tmp_path):
+    cache = QRImageCache(cache_dir=str(tmp_path), disk_enabled=True)
+    small = GenerateQRUseCase(QRGeneratorAdapter(box_size=4, border=4, mask_pattern=0), cache)
+    large = GenerateQRUseCase(QRGeneratorAdapter(box_size=8, border=2, mask_pattern=0), cache)
+
+    assert small.etag(SECRET, 'a@x.com', 'Auth', QR_FORMAT_PNG_1BIT) != large.etag(SECRET, 'a@x.com', 'Auth', QR_FORMAT_PNG_1BIT)
+    small_image = small.execute(SECRET, 'a@x.com', 'Auth', QR_FORMAT_PNG_1BIT)
+    large_image = large.execute(SECRET, 'a@x.com', 'Auth', QR_FORMAT_PNG_1BIT)
+    assert small_image != large_image
+    assert cache.stats()['renders'] == 2
+
+
+def test_invalid_default_format_fails_at_load():
+    env = {**os.environ, 'QR_DEFAULT_FORMAT': 'jpeg'}
+    result = subprocess.run([sys.executable, '-c', 'import totp.adapters.http.flask_controller'],
+                            cwd=SRC_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode != 0
+    assert 'QR_DEFAULT_FORMAT desconocido: jpeg' in result.stderr
@@ -0,0 +1,22 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('TOTP_BATCH_API_KEY', 'internal')
+    return main.app.test_client()
+
+
+@pytest.mark.parametrize('item', [
+    {'email': ['a@x.com'], 'code': '123456'},
+    {'email': {'e': 1}, 'code': '123456'},
+    {'email': 'a@x.com', 'code': ['123456']},
+    {'email': 'a@x.com', 'code': True},
+    'a@x.com',
+])
+def test_malformed_items_are_rejected_with_400(client, item):
+    response = client.post('/api/auth/totp/verify-batch', json={'items': [item]},
+                           headers={'X-Internal-Api-Key': 'internal'})
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import os
+
+os.environ.setdefault('PASSWORD_HASH_ROUNDS', '4')
+os.environ.setdefault('PASSWORD_HASH_MIN_ROUNDS', '4')
+
+import mongomock
+import pytest
+
+from shared.bootstrap.dependencies import container
+from shared.database.user_cache import UserCache
+from shared.models.async_user_repository import AsyncUserRepository
+from shared.models.user_model import UserRepository
+
+TOTP_USER = {'email': 't@x.com', 'password': 'clave-123', 'first_name': 'Tere',
+             'auth_method': 'totp', 'secret': 'JBSWY3DPEHPK3PXP'}
+
+
+class _AsyncCollection:
+    """Colección mongomock con la interfaz async de motor (solo lo que usa el login)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        return self.collection.find_one(*args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+
+@pytest.fixture
+def users():
+    UserCache.get_instance().clear()
+    users = mongomock.MongoClient().db.users
+    repo = UserRepository()
+    repo.users = users
+    repo.create_user(dict(TOTP_USER))
+    yield users
+    UserCache.get_instance().clear()
+
+
+def test_flask_login_of_totp_user_still_requires_the_code(users):
+    import main
+
+    repo = UserRepository()
+    repo.users = users
+    with container.override('user_repository', repo):
+        client = main.app.test_client()
+        response = client.post('/api/auth/login', json={'email': 't@x.com', 'password': 'clave-123'})
+        assert response.status_code == 200
+        assert response.get_json()['requires_otp'] is True
+        with client.session_transaction() as session:
+            assert 'email' not in session
+
+
+def test_asgi_login_of_totp_user_still_requires_the_code(users, monkeypatch):
+    import asgi
+    from starlette.testclient import TestClient
+
+    monkeypatch.setattr(AsyncUserRepository, 'users', property(lambda self: _AsyncCollection(users)))
+    response = TestClient(asgi.app).post('/api/auth/login', json={'email': 't@x.com', 'password': 'clave-123'})
+    assert response.status_code == 200
+    assert response.json()['requires_otp'] is True
@@ -0,0 +1,67 @@
+import os
+
+os.environ.setdefault('PASSWORD_HASH_ROUNDS', '4')
+os.environ.setdefault('PASSWORD_HASH_MIN_ROUNDS', '4')
+
+import mongomock
+import pytest
+
+from shared.database.user_cache import UserCache
+from shared.models.user_model import UserRepository
+from totp.infrastructure.totp_repository import TOTPRepository
+
+
+@pytest.fixture
+def users():
+    UserCache.get_instance().clear()
+    collection = mongomock.MongoClient().db.users
+    yield collection
+    UserCache.get_instance().clear()
+
+
+def _repository(cls, users):
+    repository = cls()
+    repository.users = users
+    return repository
+
+
+def test_cache_never_holds_credentials(users):
+    repo = _repository(UserRepository, users)
+    repo.create_user({'email': 'a@x.com', 'password': 'vieja-123', 'first_name': 'Ana', 'secret': 'JBSWY3DPEHPK3PXP'})
+
+    user = repo.find_by_email('a@x.com')
+    assert user['first_name'] == 'Ana'
+    assert 'password' not in user and 'secret' not in user
+
+    cached = UserCache.get_instance().get('a@x.com')
+    assert cached is not None
+    assert 'password' not in cached and 'secret' not in cached
+
+
+def test_password_reset_in_another_worker_takes_effect_immediately(users):
+    worker_a = _repository(UserRepository, users)
+    worker_b = _repository(UserRepository, users)
+    worker_a.create_user({'email': 'b@x.com', 'password': 'vieja-123', 'first_name': 'Beto'})
+
+    # Login en B: el documento queda en la cache del proceso
+    assert worker_b.find_by_email('b@x.com') is not None
+    assert worker_b.verify_password_for_login('b@x.com', 'vieja-123')
+
+    # Reset en "otro worker": escribe en MongoDB sin invalidar la cache local de B
+    users.update_one({'email': 'b@x.com'}, {'$set': {'password': worker_a._hash_password('nueva-456')}})
+
+    assert UserCache.get_instance().get('b@x.com') is not None
+    assert not worker_b.verify_password_for_login('b@x.com', 'vieja-123')
+    assert worker_b.verify_password_for_login('b@x.com', 'nueva-456')
+
+
+def test_rotated_totp_secret_is_read_from_mongo(users):
+    repo = _repository(TOTPRepository, users)
+    users.insert_one({'email': 'c@x.com', 'secret': 'JBSWY3DPEHPK3PXP', 'first_name': 'Cami'})
+
+    assert repo.get_secret_by_email('c@x.com') == 'JBSWY3DPEHPK3PXP'
+    repo.find_profile_by_email('c@x.com')
+
+    users.update_one({'email': 'c@x.com'}, {'$set': {'secret': 'KRSXG5CTMVRXEZLU'}})
+    assert repo.get_secret_by_email('c@x.com') == 'KRSXG5CTMVRXEZLU'
+    assert repo.get_secrets_by_emails(['c@x.com']) == {'c@x.com': 'KRSXG5CTMVRXEZLU'}